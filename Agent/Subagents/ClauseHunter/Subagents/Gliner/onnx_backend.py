@@ -0,0 +1,229 @@
+"""
+ONNX Runtime backend for GLiNER.
+
+Exports the PyTorch model to ONNX once (optionally with a dynamically quantized int8
+copy), checks that the ONNX model finds the same entities as PyTorch on a fixed set of
+legal sentences, and loads it through GLiNER's own ONNX support so labels, threshold and
+post-processing are unchanged.
+
+Select the backend with GLINER_BACKEND=torch|onnx|onnx-int8 (default torch).
+To export and check parity ahead of time:
+
+    python -m Agent.Subagents.ClauseHunter.Subagents.Gliner.onnx_backend
+"""
+import json
+import os
+from typing import Callable, Dict, List
+
+from gliner import GLiNER
+
+from .....utils.text_cache import CACHE_DIR
+
+GLINER_BACKEND = os.getenv("GLINER_BACKEND", "torch").lower()
+GLINER_ONNX_THREADS = int(os.getenv("GLINER_ONNX_THREADS", "0"))
+# Minimum F1 agreement between ONNX and PyTorch entities for the ONNX model to be used
+GLINER_ONNX_MIN_PARITY = float(os.getenv("GLINER_ONNX_MIN_PARITY", "0.9"))
+
+ONNX_MODEL_FILE = "model.onnx"
+ONNX_INT8_MODEL_FILE = "model_int8.onnx"
+PARITY_REPORT_FILE = "parity.json"
+
+# Representative contract sentences used for the parity check
+PARITY_SAMPLES = [
+    "The Contractor shall pay wages not less than those fixed under the Minimum Wages Act, 1948.",
+    "Nothing in this Agreement shall limit the rights of either party under Section 138 of the Negotiable Instruments Act.",
+    "Personal data shall be processed in accordance with Article 6 of the General Data Protection Regulation.",
+    "The Supplier shall maintain registration under the Employees' State Insurance Act and Rule 10 of the ESI Rules.",
+    "Any dispute shall be referred to arbitration under the Arbitration and Conciliation Act, 1996, as amended in 2019.",
+    "The Company shall comply with Regulation 30 of the SEBI (Listing Obligations and Disclosure Requirements) Regulations, 2015.",
+    "Termination under Clause 14.2 shall not affect accrued rights under the Indian Contract Act, 1872.",
+    "Employees are entitled to gratuity as provided in Section 4 of the Payment of Gratuity Act, 1972.",
+]
+
+
+def onnx_model_dir(model_name: str) -> str:
+    """Directory holding the exported ONNX model, config and tokenizer."""
+    return os.path.join(CACHE_DIR, "gliner_onnx", model_name.replace("/", "__"))
+
+
+def export_onnx(torch_model: GLiNER, out_dir: str, quantize: bool = True) -> None:
+    """
+    Exports a PyTorch GLiNER model to ONNX, following GLiNER's conversion recipe.
+    Writes the config and tokenizer alongside so GLiNER.from_pretrained can load it.
+
+    Args:
+        torch_model: Loaded PyTorch GLiNER model.
+        out_dir: Destination directory.
+        quantize: Also write a dynamically quantized int8 model.
+    """
+    import torch
+
+    os.makedirs(out_dir, exist_ok=True)
+    torch_model.save_pretrained(out_dir)
+
+    inputs, _ = torch_model.prepare_model_inputs([PARITY_SAMPLES[0]], ["act", "section"])
+    if torch_model.config.span_mode == "token_level":
+        input_names = ["input_ids", "attention_mask", "words_mask", "text_lengths"]
+        dynamic_axes = {
+            "input_ids": {0: "batch_size", 1: "sequence_length"},
+            "attention_mask": {0: "batch_size", 1: "sequence_length"},
+            "words_mask": {0: "batch_size", 1: "sequence_length"},
+            "text_lengths": {0: "batch_size", 1: "value"},
+            "logits": {0: "position", 1: "batch_size", 2: "sequence_length", 3: "num_classes"},
+        }
+    else:
+        input_names = ["input_ids", "attention_mask", "words_mask", "text_lengths", "span_idx", "span_mask"]
+        dynamic_axes = {
+            "input_ids": {0: "batch_size", 1: "sequence_length"},
+            "attention_mask": {0: "batch_size", 1: "sequence_length"},
+            "words_mask": {0: "batch_size", 1: "sequence_length"},
+            "text_lengths": {0: "batch_size", 1: "value"},
+            "span_idx": {0: "batch_size", 1: "num_spans", 2: "idx"},
+            "span_mask": {0: "batch_size", 1: "num_spans"},
+            "logits": {0: "batch_size", 1: "sequence_length", 2: "num_spans", 3: "num_classes"},
+        }
+
+    onnx_path = os.path.join(out_dir, ONNX_MODEL_FILE)
+    print(f"Exporting GLiNER to ONNX: {onnx_path}")
+    torch_model.model.eval()
+    with torch.no_grad():
+        torch.onnx.export(
+            torch_model.model,
+            tuple(inputs[name] for name in input_names),
+            f=onnx_path,
+            input_names=input_names,
+            output_names=["logits"],
+            dynamic_axes=dynamic_axes,
+            opset_version=14,
+        )
+
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        int8_path = os.path.join(out_dir, ONNX_INT8_MODEL_FILE)
+        print(f"Quantizing GLiNER ONNX model to int8: {int8_path}")
+        quantize_dynamic(onnx_path, int8_path, weight_type=QuantType.QInt8)
+
+
+def load_onnx_model(model_dir: str, int8: bool = True) -> GLiNER:
+    """
+    Loads an exported GLiNER model on ONNX Runtime (CPU).
+    """
+    import onnxruntime as ort
+
+    session_options = ort.SessionOptions()
+    if GLINER_ONNX_THREADS > 0:
+        session_options.intra_op_num_threads = GLINER_ONNX_THREADS
+    return GLiNER.from_pretrained(
+        model_dir,
+        load_onnx_model=True,
+        load_tokenizer=True,
+        onnx_model_file=ONNX_INT8_MODEL_FILE if int8 else ONNX_MODEL_FILE,
+        session_options=session_options,
+    )
+
+
+def entity_parity(reference: List[List[dict]], candidate: List[List[dict]]) -> float:
+    """
+    F1 agreement between two backends' entities ((text, label) pairs per sample).
+    Returns 1.0 when neither backend finds anything.
+    """
+    matched = 0
+    ref_total = 0
+    cand_total = 0
+    for ref_entities, cand_entities in zip(reference, candidate):
+        ref_set = {(e["text"], e["label"]) for e in ref_entities}
+        cand_set = {(e["text"], e["label"]) for e in cand_entities}
+        matched += len(ref_set & cand_set)
+        ref_total += len(ref_set)
+        cand_total += len(cand_set)
+    if ref_total == 0 and cand_total == 0:
+        return 1.0
+    if matched == 0:
+        return 0.0
+    precision = matched / cand_total
+    recall = matched / ref_total
+    return 2 * precision * recall / (precision + recall)
+
+
+def check_parity(torch_model: GLiNER, onnx_model: GLiNER, labels: List[str], threshold: float) -> Dict:
+    """
+    Runs both backends on PARITY_SAMPLES with the production labels and threshold.
+
+    Returns:
+        Report dict with the agreement score and the labels and threshold it was measured
+        with. Whether it passes is decided on load against the current
+        GLINER_ONNX_MIN_PARITY, so the report stays valid when the minimum changes.
+    """
+    reference = torch_model.batch_predict_entities(PARITY_SAMPLES, labels, threshold=threshold)
+    candidate = onnx_model.batch_predict_entities(PARITY_SAMPLES, labels, threshold=threshold)
+    agreement = entity_parity(reference, candidate)
+    return {
+        "agreement": round(agreement, 4),
+        "labels": labels,
+        "threshold": threshold,
+    }
+
+
+def load_checked_onnx_model(
+    model_name: str,
+    get_torch_model: Callable[[], GLiNER],
+    labels: List[str],
+    threshold: float,
+    int8: bool = True
+) -> GLiNER:
+    """
+    Returns the ONNX GLiNER model, exporting it and running the parity check on first use.
+
+    Args:
+        model_name: HuggingFace model id of the PyTorch model.
+        get_torch_model: Returns the loaded PyTorch model (only called to export/check).
+        labels: Entity labels used in production.
+        threshold: Score threshold used in production.
+        int8: Load the int8-quantized model instead of the fp32 export.
+
+    Raises:
+        RuntimeError: If the ONNX model disagrees with PyTorch beyond the allowed margin.
+    """
+    model_dir = onnx_model_dir(model_name)
+    model_file = ONNX_INT8_MODEL_FILE if int8 else ONNX_MODEL_FILE
+    report_path = os.path.join(model_dir, PARITY_REPORT_FILE)
+
+    if not os.path.exists(os.path.join(model_dir, model_file)):
+        export_onnx(get_torch_model(), model_dir, quantize=True)
+
+    reports = {}
+    if os.path.exists(report_path):
+        with open(report_path, "r", encoding="utf-8") as f:
+            reports = json.load(f)
+
+    report = reports.get(model_file)
+    if not report or report.get("labels") != labels or report.get("threshold") != threshold:
+        onnx_model = load_onnx_model(model_dir, int8=int8)
+        report = check_parity(get_torch_model(), onnx_model, labels, threshold)
+        reports[model_file] = report
+        with open(report_path, "w", encoding="utf-8") as f:
+            json.dump(reports, f, indent=4)
+        print(f"GLiNER ONNX parity ({model_file}): {report['agreement']:.3f}")
+    else:
+        onnx_model = None
+
+    if report["agreement"] < GLINER_ONNX_MIN_PARITY:
+        raise RuntimeError(
+            f"ONNX model {model_file} agrees with PyTorch at {report['agreement']:.3f}, "
+            f"below GLINER_ONNX_MIN_PARITY={GLINER_ONNX_MIN_PARITY}"
+        )
+
+    return onnx_model or load_onnx_model(model_dir, int8=int8)
+
+
+if __name__ == "__main__":
+    from .tools import GLINER_ENTITY_LABELS, GLINER_MODEL_NAME, GLINER_THRESHOLD, _load_gliner_model
+
+    torch_model = _load_gliner_model()
+    for use_int8 in (False, True):
+        try:
+            load_checked_onnx_model(GLINER_MODEL_NAME, lambda: torch_model, GLINER_ENTITY_LABELS, GLINER_THRESHOLD, int8=use_int8)
+            print(f"{'int8' if use_int8 else 'fp32'} ONNX model ready.")
+        except RuntimeError as e:
+            print(e)
@@ -1,13 +1,249 @@
 from gliner import GLiNER
-from PyPDF2 import PdfReader
+from bisect import bisect_left
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Tuple
 import glob
 import os
 
 from google.adk.tools.tool_context import ToolContext
 
+from .....utils.batching import MicroBatcher
+from .....utils.document import Document
+from .....utils.executors import run_in_thread
+from .....utils.manifest import get_cached_result, package_version, store_result
+from .....utils.model_registry import model_registry
+from .....utils.normalize import NORMALIZATION_VERSION, NormalizedText, normalize_with_offsets
+from .....utils.pdf_extract import extract_pdfs
+from .....utils.prefilter import PREFILTER_ENABLED, PREFILTER_VERSION, PrefilterStats, filter_windows
+from .....utils.text_cache import EXTRACTOR_VERSION
+from .onnx_backend import GLINER_BACKEND, load_checked_onnx_model
+
+# Using the medium model for better performance/size balance
+GLINER_MODEL_NAME = "urchade/gliner_medium-v2.1"
+GLINER_THRESHOLD = 0.5
+GLINER_ENTITY_LABELS = [
+    "statute", "act", "provision", "section", 
+    "article", "clause", "regulation", "rule", 
+    "code", "law", "ordinance", "amendment"
+]
+
+# GLiNER truncates input past its context window (384 words), so documents are cut into
+# sentence-aligned windows that stay below it, overlapping by whole sentences
+GLINER_MAX_WORDS = int(os.getenv("GLINER_MAX_WORDS", "250"))
+GLINER_OVERLAP_SENTENCES = int(os.getenv("GLINER_OVERLAP_SENTENCES", "1"))
+# Windows from all documents (and all concurrent sessions) are run through the model this
+# many at a time; a started batch waits up to GLINER_BATCH_WAIT_MS for more windows
+GLINER_BATCH_SIZE = int(os.getenv("GLINER_BATCH_SIZE", "8"))
+GLINER_BATCH_WAIT_MS = float(os.getenv("GLINER_BATCH_WAIT_MS", "10"))
+# Batches a single run keeps queued ahead of the one being processed
+GLINER_MAX_IN_FLIGHT = int(os.getenv("GLINER_MAX_IN_FLIGHT", "2"))
+
+# Identifies cached results in the ingestion manifest; bump the suffix when the output changes
+GLINER_RESULTS_VERSION = (
+    f"{GLINER_MODEL_NAME}|gliner-{package_version('gliner')}|{EXTRACTOR_VERSION}"
+    f"|w{GLINER_MAX_WORDS}-{GLINER_OVERLAP_SENTENCES}|{GLINER_BACKEND}"
+    f"|pf{PREFILTER_VERSION if PREFILTER_ENABLED else 'off'}|n{NORMALIZATION_VERSION}|3"
+)
+
+def _iter_windows(pdf_files: List[str], errors: Dict[str, str], stats: PrefilterStats) -> Iterator[Tuple[str, int, NormalizedText]]:
+    """
+    Yields (filename, offset, normalized_window) for every candidate window of every
+    document, in order. The model sees normalized text (see utils.normalize); its offset
+    map leads back to the original. Windows without a legal reference cue are skipped
+    (see utils.prefilter). A document that fails to read is recorded in `errors` and skipped.
+    """
+    for pdf_file in pdf_files:
+        filename = os.path.basename(pdf_file)
+        print(f"Processing {filename} with GLiNER...")
+        try:
+            windows = Document(pdf_file).sentence_windows(GLINER_MAX_WORDS, GLINER_OVERLAP_SENTENCES)
+            normalized = ((offset, normalize_with_offsets(text)) for offset, text in windows)
+            for offset, norm in filter_windows(normalized, stats, text_of=lambda window: window[1].text):
+                yield filename, offset, norm
+        except Exception as e:
+            errors[filename] = str(e)
+
+def _batched(items: Iterable, batch_size: int) -> Iterator[list]:
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def _predict_batch(model: GLiNER, texts: List[str]) -> List[List[dict]]:
+    """
+    Runs GLiNER on a batch of windows. Returns one entity list per window.
+    """
+    return model.batch_predict_entities(texts, GLINER_ENTITY_LABELS, threshold=GLINER_THRESHOLD)
+
+def _merge_spans(spans: List[dict]) -> List[dict]:
+    """
+    De-duplicates entity spans collected from overlapping windows.
+    Identical spans keep their best score; spans that partially overlap (an entity cut
+    at a window edge) resolve to the higher-scoring one.
+    
+    Args:
+        spans: Dicts with absolute "start"/"end" offsets, "text", "label" and "score".
+        
+    Returns:
+        Non-overlapping entities in document order, as {"text", "label", "score"} dicts.
+    """
+    best = {}
+    for span in spans:
+        key = (span["start"], span["end"], span["label"])
+        if key not in best or span["score"] > best[key]["score"]:
+            best[key] = span
+
+    # Kept spans never overlap, so sorting by start also sorts them by end
+    kept_starts: List[int] = []
+    kept: List[dict] = []
+    for span in sorted(best.values(), key=lambda s: -s["score"]):
+        i = bisect_left(kept_starts, span["start"])
+        if i > 0 and kept[i - 1]["end"] > span["start"]:
+            continue
+        if i < len(kept) and kept[i]["start"] < span["end"]:
+            continue
+        kept_starts.insert(i, span["start"])
+        kept.insert(i, span)
+
+    return [{"text": s["text"], "label": s["label"], "score": s["score"]} for s in kept]
+
+def _load_gliner_model() -> GLiNER:
+    print(f"Loading GLiNER model...")
+    return GLiNER.from_pretrained(GLINER_MODEL_NAME)
+
+def _get_torch_gliner_model() -> GLiNER:
+    return model_registry.get(f"gliner:{GLINER_MODEL_NAME}", _load_gliner_model)
+
+def _load_onnx_gliner_model() -> GLiNER:
+    print(f"Loading GLiNER model on ONNX Runtime ({GLINER_BACKEND})...")
+    return load_checked_onnx_model(
+        GLINER_MODEL_NAME,
+        _get_torch_gliner_model,
+        GLINER_ENTITY_LABELS,
+        GLINER_THRESHOLD,
+        int8=GLINER_BACKEND == "onnx-int8"
+    )
+
+# Set once the ONNX backend has failed, so later batches go straight to PyTorch
+_onnx_unavailable = False
+
+def _get_gliner_model() -> GLiNER:
+    """
+    Returns the process-wide GLiNER model for the configured backend (GLINER_BACKEND),
+    loading it on first use. Falls back to PyTorch if the ONNX model cannot be exported,
+    loaded, or fails the parity check, and keeps using PyTorch for the rest of the process.
+    """
+    global _onnx_unavailable
+    if GLINER_BACKEND in ("onnx", "onnx-int8") and not _onnx_unavailable:
+        try:
+            model = model_registry.get(f"gliner-{GLINER_BACKEND}:{GLINER_MODEL_NAME}", _load_onnx_gliner_model)
+            # The PyTorch model is only needed for export and the parity check
+            model_registry.evict(f"gliner:{GLINER_MODEL_NAME}")
+            return model
+        except Exception as e:
+            _onnx_unavailable = True
+            print(f"GLiNER ONNX backend unavailable, falling back to PyTorch: {e}")
+    elif GLINER_BACKEND not in ("torch", "onnx", "onnx-int8"):
+        print(f"Unknown GLINER_BACKEND '{GLINER_BACKEND}', using PyTorch")
+    return _get_torch_gliner_model()
+
+# Global instance: shared inference queue for every GLiNER caller in the process
+gliner_batcher = MicroBatcher(
+    lambda texts: _predict_batch(_get_gliner_model(), texts),
+    max_batch_size=GLINER_BATCH_SIZE,
+    max_wait_ms=GLINER_BATCH_WAIT_MS,
+    name="gliner"
+)
+
+def _run_gliner(pdf_files: List[str]) -> Dict[str, object]:
+    """
+    Runs GLiNER over the files, reusing cached results. Blocking; called from a worker
+    thread so the event loop stays free (inference releases the GIL).
+
+    Raises:
+        RuntimeError: If the model cannot be loaded.
+    """
+    results = {}
+    stats = PrefilterStats()
+    pending_files = []
+    for pdf_file in pdf_files:
+        cached = get_cached_result(pdf_file, "gliner", GLINER_RESULTS_VERSION)
+        if cached is not None:
+            results[os.path.basename(pdf_file)] = cached
+        else:
+            pending_files.append(pdf_file)
+    print(f"GLiNER: {len(results)} files unchanged (cached), {len(pending_files)} to process")
+
+    if pending_files:
+        try:
+            _get_gliner_model()
+        except Exception as e:
+            raise RuntimeError(f"Error loading GLiNER model: {e}") from e
+
+        # Warm the shared text cache in parallel; documents are then streamed window by window
+        extracted = extract_pdfs(pending_files, return_pages=False)
+        errors = {}
+        readable_files = []
+        for pdf_file, error in zip(pending_files, extracted):
+            if isinstance(error, Exception):
+                errors[os.path.basename(pdf_file)] = str(error)
+            else:
+                readable_files.append(pdf_file)
+        
+        # Windows from all documents go through the shared batcher, where they are combined
+        # with windows from concurrent runs; spans are collected per file
+        spans_by_file = {os.path.basename(p): [] for p in readable_files}
+
+        def collect(batch, future):
+            try:
+                predictions = future.result()
+            except Exception as e:
+                for filename, _, _ in batch:
+                    errors[filename] = str(e)
+                return
+            for (filename, offset, norm), entities in zip(batch, predictions):
+                for entity in entities:
+                    # Spans are merged in original-document coordinates
+                    start, end = norm.to_original(entity["start"], entity["end"])
+                    spans_by_file[filename].append({
+                        "start": offset + start,
+                        "end": offset + end,
+                        "text": entity["text"],
+                        "label": entity["label"],
+                        "score": round(float(entity["score"]), 4),
+                    })
+
+        # Keep the next batch queued while the current one runs so the model never idles
+        in_flight = deque()
+        for batch in _batched(_iter_windows(readable_files, errors, stats), GLINER_BATCH_SIZE):
+            in_flight.append((batch, gliner_batcher.submit([norm.text for _, _, norm in batch])))
+            if len(in_flight) > GLINER_MAX_IN_FLIGHT:
+                collect(*in_flight.popleft())
+        while in_flight:
+            collect(*in_flight.popleft())
+        print(f"GLiNER {stats.summary()}")
+        
+        for pdf_file in pending_files:
+            filename = os.path.basename(pdf_file)
+            if filename in errors:
+                results[filename] = {"error": errors[filename]}
+                continue
+            file_entities = _merge_spans(spans_by_file[filename])
+            results[filename] = file_entities
+            store_result(pdf_file, "gliner", GLINER_RESULTS_VERSION, file_entities)
+
+    # Keep the DB folder order regardless of which files came from the cache
+    return {os.path.basename(p): results[os.path.basename(p)] for p in pdf_files}
+
 async def run_gliner_on_db(tool_context: ToolContext, db_path: str = "DB") -> str:
     """
     Runs GLiNER extraction on all PDF files in the DB directory.
+    Files unchanged since their last extraction reuse the results cached in the manifest.
+    The work runs off the event loop, so other harvester branches proceed concurrently.
     
     Args:
         db_path: Path to the directory containing PDF files. Defaults to "DB".
@@ -15,47 +251,14 @@ async def run_gliner_on_db(tool_context: ToolContext, db_path: str = "DB") -> st
     Returns:
         A JSON string containing extracted entities from all files.
     """
-    print(f"Loading GLiNER model...")
-    # Using the medium model for better performance/size balance
-    try:
-        model = GLiNER.from_pretrained("urchade/gliner_medium-v2.1")
-    except Exception as e:
-        return f"Error loading GLiNER model: {e}"
-
-    entity_labels = [
-        "statute", "act", "provision", "section", 
-        "article", "clause", "regulation", "rule", 
-        "code", "law", "ordinance", "amendment"
-    ]
-    
     pdf_files = glob.glob(os.path.join(db_path, "*.pdf"))
     if not pdf_files:
         return "No PDF files found in DB directory."
 
-    results = {}
-    
-    for pdf_file in pdf_files:
-        filename = os.path.basename(pdf_file)
-        print(f"Processing {filename} with GLiNER...")
-        try:
-            reader = PdfReader(pdf_file)
-            text = ""
-            for page in reader.pages:
-                text += page.extract_text() + "\n"
-            
-            entities = model.predict_entities(text, entity_labels, threshold=0.5)
-            
-            file_entities = []
-            for entity in entities:
-                file_entities.append({
-                    "text": entity["text"],
-                    "label": entity["label"],
-                })
-            
-            results[filename] = file_entities
-            
-        except Exception as e:
-            results[filename] = {"error": str(e)}
+    try:
+        results = await run_in_thread(_run_gliner, pdf_files)
+    except RuntimeError as e:
+        return str(e)
 
     # Save to local file
     try:
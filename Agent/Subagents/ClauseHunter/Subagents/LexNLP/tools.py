@@ -1,13 +1,86 @@
 import lexnlp.extract.en.acts
-from PyPDF2 import PdfReader
 import glob
 import os
+from typing import Dict, List
 
 from google.adk.tools.tool_context import ToolContext
 
+from .....utils.document import Document
+from .....utils.executors import get_process_pool, run_in_thread
+from .....utils.manifest import get_cached_result, package_version, store_result
+from .....utils.normalize import NORMALIZATION_VERSION, normalize_text
+from .....utils.pdf_extract import extract_pdfs
+from .....utils.text_cache import EXTRACTOR_VERSION
+
+# LexNLP is regex-based, so windows can be large; the overlap catches Act names on a boundary
+LEXNLP_WINDOW_CHARS = 20000
+LEXNLP_WINDOW_OVERLAP = 500
+
+# Identifies cached results in the ingestion manifest; bump the suffix when the output changes
+LEXNLP_RESULTS_VERSION = f"lexnlp-{package_version('lexnlp')}|{EXTRACTOR_VERSION}|n{NORMALIZATION_VERSION}|2"
+
+def _extract_acts(pdf_path: str) -> List[str]:
+    """
+    Worker entry point (runs in the shared process pool): extracts Act names from a PDF.
+    """
+    # Only keep the Act Name/Value, ignore location_start/end
+    cleaned_acts = set()
+    for _, window in Document(pdf_path).windows(LEXNLP_WINDOW_CHARS, LEXNLP_WINDOW_OVERLAP):
+        # Normalized text keeps Act names broken across lines in one piece
+        for act in lexnlp.extract.en.acts.get_acts(normalize_text(window)):
+            if isinstance(act, dict):
+                name = act.get("act_name") or act.get("value")
+                if name:
+                    cleaned_acts.add(name)
+    return sorted(cleaned_acts) # Deduplicate
+
+def _run_lexnlp(pdf_files: List[str]) -> Dict[str, dict]:
+    """
+    Runs LexNLP over the files, reusing cached results and fanning the rest out to the
+    process pool (LexNLP is pure-Python regex work that holds the GIL).
+    Blocking; called from a worker thread.
+    """
+    results = {}
+    pending_files = []
+    for pdf_file in pdf_files:
+        cached = get_cached_result(pdf_file, "lexnlp", LEXNLP_RESULTS_VERSION)
+        if cached is not None:
+            results[os.path.basename(pdf_file)] = cached
+        else:
+            pending_files.append(pdf_file)
+    print(f"LexNLP: {len(results)} files unchanged (cached), {len(pending_files)} to process")
+
+    # Warm the shared text cache in parallel; workers then stream documents window by window
+    extracted = extract_pdfs(pending_files, return_pages=False)
+    
+    pool = get_process_pool()
+    futures = {}
+    for pdf_file, error in zip(pending_files, extracted):
+        filename = os.path.basename(pdf_file)
+        if isinstance(error, Exception):
+            results[filename] = {"error": str(error)}
+        else:
+            print(f"Processing {filename} with LexNLP...")
+            futures[pdf_file] = pool.submit(_extract_acts, pdf_file)
+
+    for pdf_file, future in futures.items():
+        filename = os.path.basename(pdf_file)
+        try:
+            file_data = {'acts': future.result()}
+            store_result(pdf_file, "lexnlp", LEXNLP_RESULTS_VERSION, file_data)
+        except Exception as e:
+            print(f"LexNLP failed on {filename}: {e}")
+            file_data = {'acts': []}
+        results[filename] = file_data
+
+    # Keep the DB folder order regardless of which files came from the cache
+    return {os.path.basename(p): results[os.path.basename(p)] for p in pdf_files}
+
 async def run_lexnlp_on_db(tool_context: ToolContext, db_path: str = "DB") -> str:
     """
     Runs LexNLP extraction on all PDF files in the DB directory.
+    Files unchanged since their last extraction reuse the results cached in the manifest.
+    The work runs off the event loop, so other harvester branches proceed concurrently.
     
     Args:
         db_path: Path to the directory containing PDF files. Defaults to "DB".
@@ -19,36 +92,7 @@ async def run_lexnlp_on_db(tool_context: ToolContext, db_path: str = "DB") -> st
     if not pdf_files:
         return "No PDF files found in DB directory."
 
-    results = {}
-    
-    for pdf_file in pdf_files:
-        filename = os.path.basename(pdf_file)
-        print(f"Processing {filename} with LexNLP...")
-        try:
-            reader = PdfReader(pdf_file)
-            text = ""
-            for page in reader.pages:
-                text += page.extract_text() + "\n"
-            
-            file_data = {}
-            
-            # Extract Acts
-            try:
-                acts_list = list(lexnlp.extract.en.acts.get_acts(text))
-                # Only keep the Act Name/Value, ignore location_start/end
-                cleaned_acts = []
-                for act in acts_list:
-                    if isinstance(act, dict):
-                        name = act.get("act_name") or act.get("value")
-                        if name:
-                            cleaned_acts.append(name)
-                file_data['acts'] = sorted(list(set(cleaned_acts))) # Deduplicate
-            except: file_data['acts'] = []                
-
-            results[filename] = file_data
-            
-        except Exception as e:
-            results[filename] = {"error": str(e)}
+    results = await run_in_thread(_run_lexnlp, pdf_files)
 
     # Save to local file
     try:
@@ -1,17 +1,32 @@
 import spacy
-from PyPDF2 import PdfReader
 import glob
 import os
 import sys
+from typing import Dict, Iterator, List, Tuple
 from dotenv import load_dotenv
 
 from google.adk.tools.tool_context import ToolContext
 
+from .....utils.document import Document
+from .....utils.executors import run_in_thread
+from .....utils.model_registry import model_registry
+from .....utils.normalize import normalize_text
+from .....utils.pdf_extract import extract_pdfs
+from .....utils.prefilter import PrefilterStats, filter_windows
+
 load_dotenv()
 
 # HuggingFace model repository for OpenNyAI
 OPENNYAI_MODEL_REPO = "opennyaiorg/en_legal_ner_trf"
 
+# Documents are cut into paragraph chunks of at most this many characters and streamed
+# through nlp.pipe in batches (override via environment)
+OPENNYAI_CHUNK_CHARS = int(os.getenv("OPENNYAI_CHUNK_CHARS", "2000"))
+OPENNYAI_BATCH_SIZE = int(os.getenv("OPENNYAI_BATCH_SIZE", "16"))
+OPENNYAI_N_PROCESS = int(os.getenv("OPENNYAI_N_PROCESS", "1"))
+# Pipeline components NER depends on; everything else is disabled while extracting
+OPENNYAI_NER_COMPONENTS = ("transformer", "tok2vec", "ner")
+
 def _download_opennyai_model() -> str:
     """
     Downloads the OpenNyAI model from HuggingFace (similar to GLiNER's from_pretrained).
@@ -119,83 +134,145 @@ def _get_opennyai_model_path() -> str:
     
     return None
 
-async def run_opennyai_on_db(tool_context: ToolContext, db_path: str = "DB") -> str:
+def _load_opennyai_model():
     """
-    Runs OpenNyAI extraction on all PDF files in the DB directory.
-    Automatically downloads the model from HuggingFace if not found locally (like GLiNER).
+    Loads the OpenNyAI Spacy pipeline by name, or from a detected/downloaded path.
     
-    Args:
-        db_path: Path to the directory containing PDF files. Defaults to "DB".
-        
     Returns:
-        A formatted string of extracted statutes and provisions.
+        The loaded Spacy Language object.
+        
+    Raises:
+        RuntimeError: If the model cannot be found, downloaded or loaded.
     """
     print("Loading OpenNyAI model...")
-    nlp = None
     
     # Try loading by name first (works if installed via 'spacy link' or opennyai package)
     try:
         nlp = spacy.load("en_legal_ner_trf")
         print("Found OpenNyAI model by name in Spacy cache")
+        return nlp
     except:
         pass
     
     # If name loading failed, try auto-detection/download (like GLiNER)
-    if nlp is None:
-        model_path = _get_opennyai_model_path()
-        if not model_path:
-            error_msg = (
-                "Error: OpenNyAI model not found and download failed.\n\n"
-                "The model will be automatically downloaded from HuggingFace on first use.\n"
-                "If download fails, you can:\n\n"
-                "1. Set OPENNYAI_MODEL_PATH environment variable:\n"
-                "   OPENNYAI_MODEL_PATH=/path/to/en_legal_ner_trf\n\n"
-                "2. Install huggingface_hub: pip install huggingface_hub\n\n"
-                "3. Or install opennyai package: pip install opennyai\n"
-                "   Then use: spacy.load('en_legal_ner_trf')"
-            )
-            return error_msg
-        
-        try:
-            print(f"Loading OpenNyAI model from: {model_path}")
-            nlp = spacy.load(model_path)
-            print("OpenNyAI model loaded successfully")
-        except Exception as e:
-            return f"Error loading OpenNyAI model from {model_path}: {e}"
-
-    pdf_files = glob.glob(os.path.join(db_path, "*.pdf"))
-    if not pdf_files:
-        return "No PDF files found in DB directory."
-
-    results = {}
+    model_path = _get_opennyai_model_path()
+    if not model_path:
+        raise RuntimeError(
+            "Error: OpenNyAI model not found and download failed.\n\n"
+            "The model will be automatically downloaded from HuggingFace on first use.\n"
+            "If download fails, you can:\n\n"
+            "1. Set OPENNYAI_MODEL_PATH environment variable:\n"
+            "   OPENNYAI_MODEL_PATH=/path/to/en_legal_ner_trf\n\n"
+            "2. Install huggingface_hub: pip install huggingface_hub\n\n"
+            "3. Or install opennyai package: pip install opennyai\n"
+            "   Then use: spacy.load('en_legal_ner_trf')"
+        )
     
+    try:
+        print(f"Loading OpenNyAI model from: {model_path}")
+        nlp = spacy.load(model_path)
+        print("OpenNyAI model loaded successfully")
+        return nlp
+    except Exception as e:
+        raise RuntimeError(f"Error loading OpenNyAI model from {model_path}: {e}")
+
+def _iter_chunks(pdf_files: List[str], errors: Dict[str, str], stats: PrefilterStats) -> Iterator[Tuple[str, str]]:
+    """
+    Yields (chunk_text, filename) for every candidate paragraph chunk of every document,
+    in the (text, context) form nlp.pipe(as_tuples=True) expects.
+    A document that fails to read is recorded in `errors` and skipped.
+    """
     for pdf_file in pdf_files:
         filename = os.path.basename(pdf_file)
         print(f"Processing {filename} with OpenNyAI...")
         try:
-            reader = PdfReader(pdf_file)
-            text = ""
-            for page in reader.pages:
-                text += page.extract_text() + "\n"
-            
-            doc = nlp(text)
-            
-            statutes = []
-            provisions = []
-            
+            chunks = Document(pdf_file).paragraphs(OPENNYAI_CHUNK_CHARS)
+            # Normalized text keeps names broken across lines in one piece; only chunks
+            # with a legal reference cue go through the transformer
+            normalized = ((offset, normalize_text(chunk)) for offset, chunk in chunks)
+            for _, chunk in filter_windows(normalized, stats):
+                yield chunk, filename
+        except Exception as e:
+            errors[filename] = str(e)
+
+def _run_opennyai(pdf_files: List[str]) -> Dict[str, dict]:
+    """
+    Runs the OpenNyAI pipeline over the files. Blocking; called from a worker thread so
+    the event loop stays free (spaCy/torch inference releases the GIL).
+
+    Raises:
+        RuntimeError: If the model cannot be loaded.
+    """
+    nlp = model_registry.get("opennyai:en_legal_ner_trf", _load_opennyai_model)
+
+    # Warm the shared text cache in parallel; documents are then streamed chunk by chunk
+    extracted = extract_pdfs(pdf_files, return_pages=False)
+    errors = {}
+    readable_files = []
+    for pdf_file, error in zip(pdf_files, extracted):
+        if isinstance(error, Exception):
+            errors[os.path.basename(pdf_file)] = str(error)
+        else:
+            readable_files.append(pdf_file)
+
+    stats = PrefilterStats()
+    statutes = {os.path.basename(p): set() for p in readable_files}
+    provisions = {os.path.basename(p): set() for p in readable_files}
+    disabled = [name for name in nlp.pipe_names if name not in OPENNYAI_NER_COMPONENTS]
+
+    try:
+        docs = nlp.pipe(
+            _iter_chunks(readable_files, errors, stats),
+            as_tuples=True,
+            batch_size=OPENNYAI_BATCH_SIZE,
+            n_process=OPENNYAI_N_PROCESS,
+            disable=disabled
+        )
+        for doc, filename in docs:
             for ent in doc.ents:
                 if ent.label_ == 'STATUTE':
-                    statutes.append(ent.text)
+                    statutes[filename].add(ent.text)
                 elif ent.label_ == 'PROVISION':
-                    provisions.append(ent.text)
-            
+                    provisions[filename].add(ent.text)
+    except Exception as e:
+        for pdf_file in readable_files:
+            errors.setdefault(os.path.basename(pdf_file), str(e))
+
+    results = {}
+    for pdf_file in pdf_files:
+        filename = os.path.basename(pdf_file)
+        if filename in errors:
+            results[filename] = {"error": errors[filename]}
+        else:
             results[filename] = {
-                "statutes": sorted(list(set(statutes))),
-                "provisions": sorted(list(set(provisions)))
+                "statutes": sorted(statutes[filename]),
+                "provisions": sorted(provisions[filename])
             }
-            
-        except Exception as e:
-            results[filename] = {"error": str(e)}
+
+    print(f"OpenNyAI {stats.summary()}")
+    return results
+
+async def run_opennyai_on_db(tool_context: ToolContext, db_path: str = "DB") -> str:
+    """
+    Runs OpenNyAI extraction on all PDF files in the DB directory.
+    Automatically downloads the model from HuggingFace if not found locally (like GLiNER).
+    The model is loaded once per process and shared through the model registry.
+    The work runs off the event loop, so other harvester branches proceed concurrently.
+    
+    Args:
+        db_path: Path to the directory containing PDF files. Defaults to "DB".
+        
+    Returns:
+        A formatted string of extracted statutes and provisions.
+    """
+    pdf_files = glob.glob(os.path.join(db_path, "*.pdf"))
+    if not pdf_files:
+        return "No PDF files found in DB directory."
+
+    try:
+        results = await run_in_thread(_run_opennyai, pdf_files)
+    except RuntimeError as e:
+        return str(e)
 
     tool_context.state["clausehunter:opennyai"] = results
     return f"OpenNyAI extraction complete. Processed {len(pdf_files)} files. Raw results saved to session state."
@@ -9,8 +9,11 @@ import litellm
 
 from .Subagents.Gliner.agent import root_agent as gliner_agent
 from .Subagents.LexNLP.agent import root_agent as lexnlp_agent
+from .Subagents.OpenNyAI.agent import root_agent as opennyai_agent
 # from .Subagents.RAG.agent import root_agent as rag_agent  # RAG disabled for now
 from .tools import fetch_raw_extraction_results, save_curated_playbook, export_playbook_to_disk
+from .playbook import PLAYBOOK_CURATION, PlaybookBuilderAgent
+from .curation import MapReduceCurationAgent
 
 load_dotenv()
 
@@ -23,11 +26,12 @@ lite_llm_model = LiteLlm(
 )
 
 # 1. Parallel Execution Group (The Harvester)
-# This agent runs the specialized tools concurrently.
+# This agent runs the specialized tools concurrently. Each extractor tool offloads its
+# work to the shared executors, so the branches overlap instead of taking turns.
 clause_harvester = ParallelAgent(
     name="ClauseDataHarvester",
-    sub_agents=[gliner_agent, lexnlp_agent],
-    description="Harvests raw legal data (clauses, entities, risks) from documents by running gliner_agent and lexnlp_agent."
+    sub_agents=[gliner_agent, lexnlp_agent, opennyai_agent],
+    description="Harvests raw legal data (clauses, entities, risks) from documents by running gliner_agent, lexnlp_agent and opennyai_agent."
 )
 
 # 2. Aggregator Agent (The Builder)
@@ -96,12 +100,28 @@ Step 4: Call `export_playbook_to_disk()` to write the playbook file.
 
 )
 
+# 2b. Deterministic Builder (The Fast Path)
+# Merges, de-duplicates and filters the raw data with fixed rules instead of an LLM turn.
+# With PLAYBOOK_CURATION=map-reduce, each file's result is then curated by its own
+# concurrent LLM call and merged back deterministically.
+if PLAYBOOK_CURATION == "map-reduce":
+    playbook_builder = MapReduceCurationAgent(
+        name="PlaybookBuilder",
+        description="Builds the Dynamic Playbook by rules, curates each file with a parallel LLM call, and saves it."
+    )
+else:
+    playbook_builder = PlaybookBuilderAgent(
+        name="PlaybookBuilder",
+        description="Builds the Dynamic Playbook from the raw extraction data with deterministic rules and saves it."
+    )
+
 # 3. Sequential Orchestrator (The Pipeline)
-# This agent ensures the Harvester runs FIRST, and THEN the ClauseFinder runs.
+# This agent ensures the Harvester runs FIRST, and THEN the playbook is built.
+# PLAYBOOK_CURATION=llm curates with ClauseFinderAgent; otherwise PlaybookBuilder is used.
 playbook_pipeline = SequentialAgent(
     name="PlaybookPipeline",
-    sub_agents=[clause_harvester, clause_finder_agent],
-    description="Agent that execute two subagents in sequence: Firstly call clause_harvester, then call clause_finder_agent."
+    sub_agents=[clause_harvester, clause_finder_agent if PLAYBOOK_CURATION == "llm" else playbook_builder],
+    description="Agent that execute two subagents in sequence: Firstly call clause_harvester, then build the playbook."
 )
 
 # 4. Root Orchestrator (The Interface)
@@ -0,0 +1,115 @@
+"""
+Map-reduce playbook curation.
+
+The single ClauseFinderAgent turn sees every file in one prompt, capped at 20 entities
+per file, so large corpora either lose entities or overflow the context. Here each file
+is curated in its own LLM call (map), with at most PLAYBOOK_CURATION_CONCURRENCY calls
+in flight, and the answers are merged deterministically (reduce):
+
+- Each call sees the file's full candidate list from the rule-based builder (playbook.py).
+- An answer can only keep or drop candidates. Names it returns are matched back to
+  candidates by canonical key, so spellings stay as in the document and nothing new
+  is introduced.
+- A file whose call fails, times out or returns unusable JSON keeps its rule-based list.
+- Files and entities are sorted, so the playbook does not depend on completion order.
+
+Curation time is bounded by the slowest file rather than the size of the corpus.
+"""
+import asyncio
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+from ...utils.law_names import canonical_law_key
+from ...utils.llm_json import complete_json
+from .playbook import PlaybookBuilderAgent, build_playbook_from_state
+
+# Per-file LLM calls in flight at once, and the time allowed for each (override via environment)
+PLAYBOOK_CURATION_CONCURRENCY = int(os.getenv("PLAYBOOK_CURATION_CONCURRENCY", "4"))
+PLAYBOOK_CURATION_TIMEOUT = float(os.getenv("PLAYBOOK_CURATION_TIMEOUT", "60"))
+
+CURATION_PROMPT = """You curate legal entities extracted automatically from ONE contract file.
+
+Return a JSON object: {"legal_entities": [...]} listing the candidates to keep.
+
+Keep:
+- Laws, Acts, Codes, Rules, Regulations, Ordinances and Directives
+- Specific provisions (e.g. "Section 7", "Article 6", "Clause 3.2")
+
+Drop:
+- Fragments and partial names (e.g. "Frank Act" when "Dodd-Frank Act" is meant but not listed)
+- Names of parties, organizations, places or documents that are not laws
+- Duplicates: keep one spelling of each law
+
+Copy kept candidates EXACTLY as written. Do NOT add anything that is not in the list."""
+
+
+def _entities_from(data: Any) -> Optional[List[str]]:
+    """Reads {"legal_entities": [...]} (or a bare list) from a parsed reply; None if unusable."""
+    if isinstance(data, dict):
+        data = data.get("legal_entities")
+    if not isinstance(data, list):
+        return None
+    return [item for item in data if isinstance(item, str)]
+
+
+def reconcile(candidates: List[str], proposed: List[str]) -> List[str]:
+    """
+    Keeps the candidates the model chose, matched by exact text or canonical key, in
+    document spelling. Anything the model invented is ignored.
+    """
+    chosen = set(proposed)
+    chosen_keys = {canonical_law_key(name) for name in proposed}
+    kept = [c for c in candidates if c in chosen or canonical_law_key(c) in chosen_keys]
+    return sorted(set(kept), key=lambda name: (name.lower(), name))
+
+
+async def _curate_file(filename: str, candidates: List[str], semaphore: asyncio.Semaphore) -> List[str]:
+    """Map step: one LLM call for one file; falls back to the candidates on any failure."""
+    reply = await complete_json(
+        CURATION_PROMPT,
+        f"File: {filename}\nCandidates:\n{json.dumps(candidates, ensure_ascii=False)}",
+        semaphore,
+        PLAYBOOK_CURATION_TIMEOUT
+    )
+    proposed = None if reply.error else _entities_from(reply.data)
+    if proposed is None:
+        error = reply.error or "returned an unusable reply"
+        print(f"Curation {error} for {filename}" + (f": {reply.detail}" if reply.detail else "") + "; keeping rule-based entities")
+        return candidates
+    return reconcile(candidates, proposed)
+
+
+async def curate_playbook(playbook: Dict[str, List[Dict[str, Any]]]) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Curates every file of a rule-built playbook concurrently and merges the results.
+
+    Args:
+        playbook: {"playbook": [{"filename", "legal_entities"}]} from build_playbook.
+
+    Returns:
+        The curated playbook in the same schema and file order.
+    """
+    semaphore = asyncio.Semaphore(max(1, PLAYBOOK_CURATION_CONCURRENCY))
+    entries = playbook.get("playbook", [])
+
+    async def curate(entry: Dict[str, Any]) -> List[str]:
+        # Nothing to decide for files without candidates
+        if not entry["legal_entities"]:
+            return []
+        return await _curate_file(entry["filename"], entry["legal_entities"], semaphore)
+
+    curated = await asyncio.gather(*(curate(entry) for entry in entries))
+    return {
+        "playbook": [
+            {"filename": entry["filename"], "legal_entities": entities}
+            for entry, entities in zip(entries, curated)
+        ]
+    }
+
+
+class MapReduceCurationAgent(PlaybookBuilderAgent):
+    """Pipeline step that builds the playbook by rules, then curates each file with the LLM in parallel."""
+
+    async def build(self, state: Any) -> Dict[str, List[Dict[str, Any]]]:
+        return await curate_playbook(build_playbook_from_state(state))
@@ -0,0 +1,213 @@
+"""
+Deterministic playbook builder.
+
+Builds the {"playbook": [{"filename", "legal_entities"}]} JSON straight from the
+extractor results in session state, without an LLM turn:
+
+1. Entities from GLiNER, LexNLP and OpenNyAI are collected per file with a label
+   (GLiNER's own; "act" for LexNLP; "statute"/"provision" for OpenNyAI) and, for
+   GLiNER, a score.
+2. Entities below PLAYBOOK_MIN_SCORE or with a label outside PLAYBOOK_LABELS are dropped.
+3. Text is normalized (broken line wraps, quotes, stray punctuation, leading "the"/"and"),
+   and fragments that are just a generic word ("Act", "Section") are dropped.
+4. Spelling variants within a file are merged with utils.law_names (abbreviations,
+   years, Jaro-Winkler), keeping a spelling that occurs in the document.
+
+PlaybookBuilderAgent runs this as a pipeline step in place of the LLM curator. Choose
+it with PLAYBOOK_CURATION=rules (the default). PLAYBOOK_CURATION=llm keeps the single
+LLM pass, and PLAYBOOK_CURATION=map-reduce adds per-file LLM curation (see curation.py).
+"""
+import json
+import os
+import re
+from typing import Any, AsyncGenerator, Dict, Iterable, List, Optional
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+from google.genai import types
+
+from ...utils.law_names import group_law_names
+from ...utils.normalize import normalize_text
+
+PLAYBOOK_CURATION = os.getenv("PLAYBOOK_CURATION", "rules").lower()
+PLAYBOOK_FILE = "dynamic_playbook.json"
+# Entity labels kept in the playbook (comma separated; override via environment)
+PLAYBOOK_LABELS = {
+    label.strip().lower()
+    for label in os.getenv(
+        "PLAYBOOK_LABELS",
+        "statute,act,provision,section,article,clause,regulation,rule,code,law,ordinance,amendment"
+    ).split(",")
+    if label.strip()
+}
+# Minimum extractor score (GLiNER only; unscored entities always pass). 0 disables the filter
+PLAYBOOK_MIN_SCORE = float(os.getenv("PLAYBOOK_MIN_SCORE", "0"))
+
+# Entities that are nothing but one of these words carry no information
+_GENERIC_ENTITIES = {
+    "act", "acts", "law", "laws", "statute", "statutes", "code", "rule", "rules",
+    "regulation", "regulations", "section", "sections", "article", "articles",
+    "clause", "clauses", "provision", "provisions", "ordinance", "amendment",
+    "amendments", "schedule", "sub-section", "subsection",
+}
+_LEADING_WORDS = re.compile(r"^(?:(?:the|and|or|of|under|per|in|with)\s+)+", re.IGNORECASE)
+_EDGE_PUNCTUATION = " ,;:-'\""
+
+
+def normalize_entity(text: str) -> str:
+    """
+    Cleans an extracted entity: normalized text ("Section\\n \\n7" -> "Section 7"), no
+    leading connectives ("and Exchange Act" -> "Exchange Act") or stray punctuation.
+    Returns "" for fragments that are only a generic word.
+    """
+    cleaned = normalize_text(text).strip(_EDGE_PUNCTUATION)
+    cleaned = _LEADING_WORDS.sub("", cleaned).strip(_EDGE_PUNCTUATION)
+    if cleaned.endswith(".") and cleaned.count(".") == 1:
+        cleaned = cleaned[:-1]
+    # Drop a dangling bracket left by a cut ("Section 7 (Warranties" -> "Section 7")
+    if cleaned.count("(") > cleaned.count(")"):
+        cleaned = cleaned[:cleaned.rfind("(")].rstrip(_EDGE_PUNCTUATION)
+    if len(cleaned) < 3 or not any(c.isalpha() for c in cleaned) or cleaned.lower() in _GENERIC_ENTITIES:
+        return ""
+    return cleaned
+
+
+def collect_entities(
+    gliner_res: Optional[Dict[str, Any]],
+    lexnlp_res: Optional[Dict[str, Any]],
+    opennyai_res: Optional[Dict[str, Any]]
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Gathers every extractor's entities per file as {"text", "label", "score"} dicts
+    (score None when the extractor has none). Every file seen by any extractor is listed.
+    """
+    entities: Dict[str, List[Dict[str, Any]]] = {}
+    for results in (gliner_res, lexnlp_res, opennyai_res):
+        for filename in (results or {}):
+            entities.setdefault(filename, [])
+
+    for filename, items in (gliner_res or {}).items():
+        if isinstance(items, list):
+            for item in items:
+                if isinstance(item, dict) and item.get("text"):
+                    entities[filename].append({
+                        "text": item["text"],
+                        "label": str(item.get("label", "")).lower(),
+                        "score": item.get("score"),
+                    })
+
+    for filename, result in (lexnlp_res or {}).items():
+        if isinstance(result, dict) and isinstance(result.get("acts"), list):
+            entities[filename].extend({"text": act, "label": "act", "score": None} for act in result["acts"] if act)
+
+    for filename, result in (opennyai_res or {}).items():
+        if isinstance(result, dict):
+            for key, label in (("statutes", "statute"), ("provisions", "provision")):
+                values = result.get(key)
+                if isinstance(values, list):
+                    entities[filename].extend({"text": v, "label": label, "score": None} for v in values if v)
+
+    return entities
+
+
+def curate_entities(
+    entities: Iterable[Dict[str, Any]],
+    labels: Optional[Iterable[str]] = None,
+    min_score: float = PLAYBOOK_MIN_SCORE
+) -> List[str]:
+    """
+    Filters, normalizes and merges one file's entities.
+
+    Args:
+        entities: {"text", "label", "score"} dicts.
+        labels: Labels to keep (PLAYBOOK_LABELS by default).
+        min_score: Minimum score for scored entities.
+
+    Returns:
+        Distinct entity names, sorted case-insensitively.
+    """
+    allowed = PLAYBOOK_LABELS if labels is None else {label.lower() for label in labels}
+    names = []
+    for entity in entities:
+        if entity.get("label") and entity["label"] not in allowed:
+            continue
+        score = entity.get("score")
+        if score is not None and min_score > 0 and float(score) < min_score:
+            continue
+        name = normalize_entity(str(entity.get("text", "")))
+        if name:
+            names.append(name)
+
+    curated = set()
+    for group in group_law_names(names):
+        # Keep a spelling found in the document, not an expanded abbreviation
+        curated.add(group.name if group.name in group.variants else group.variants[0])
+    return sorted(curated, key=lambda name: (name.lower(), name))
+
+
+def build_playbook(
+    gliner_res: Optional[Dict[str, Any]],
+    lexnlp_res: Optional[Dict[str, Any]],
+    opennyai_res: Optional[Dict[str, Any]],
+    labels: Optional[Iterable[str]] = None,
+    min_score: float = PLAYBOOK_MIN_SCORE
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Builds the playbook from raw extractor results.
+
+    Returns:
+        {"playbook": [{"filename", "legal_entities"}]}, files in name order.
+    """
+    entities = collect_entities(gliner_res, lexnlp_res, opennyai_res)
+    return {
+        "playbook": [
+            {"filename": filename, "legal_entities": curate_entities(entities[filename], labels, min_score)}
+            for filename in sorted(entities)
+        ]
+    }
+
+
+def build_playbook_from_state(state: Any) -> Dict[str, List[Dict[str, Any]]]:
+    """Builds the playbook from the ClauseHunter extractor results in session state."""
+    return build_playbook(
+        state.get("clausehunter:gliner"),
+        state.get("clausehunter:lexnlp"),
+        state.get("clausehunter:opennyai")
+    )
+
+
+def write_playbook(playbook: Dict[str, Any], output_filename: str = PLAYBOOK_FILE) -> None:
+    with open(output_filename, "w", encoding="utf-8") as f:
+        json.dump(playbook, f, indent=4, default=str)
+
+
+def summarize_playbook(playbook: Dict[str, Any]) -> str:
+    entries = playbook.get("playbook", [])
+    total = sum(len(entry["legal_entities"]) for entry in entries)
+    return f"Dynamic Playbook built with {total} legal entities across {len(entries)} files."
+
+
+class PlaybookBuilderAgent(BaseAgent):
+    """Pipeline step that builds and saves the playbook without an LLM call."""
+
+    async def build(self, state: Any) -> Dict[str, List[Dict[str, Any]]]:
+        """Builds the playbook from session state; subclasses may refine it."""
+        return build_playbook_from_state(state)
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        playbook = await self.build(ctx.session.state)
+        message = summarize_playbook(playbook)
+        try:
+            write_playbook(playbook)
+            message += f" Exported to {PLAYBOOK_FILE}."
+        except Exception as e:
+            message += f" Error exporting file: {str(e)}"
+        print(message)
+
+        yield Event(
+            author=self.name,
+            invocation_id=ctx.invocation_id,
+            content=types.Content(role="model", parts=[types.Part(text=message)]),
+            actions=EventActions(state_delta={"clausehunter:playbook": playbook})
+        )
@@ -1,9 +1,11 @@
 from google.adk.tools.tool_context import ToolContext
 import json
 
+from .playbook import build_playbook_from_state, summarize_playbook
+
 async def fetch_raw_extraction_results(tool_context: ToolContext) -> str:
     """
-    Fetches the raw results from ClauseHunter subagents (GLiNER, LexNLP)
+    Fetches the raw results from ClauseHunter subagents (GLiNER, LexNLP, OpenNyAI)
     and returns them as a human-readable summary organized by filename.
     
     Args:
@@ -14,18 +16,21 @@ async def fetch_raw_extraction_results(tool_context: ToolContext) -> str:
     """
     gliner_res = tool_context.state.get("clausehunter:gliner", {})
     lexnlp_res = tool_context.state.get("clausehunter:lexnlp", {})
+    opennyai_res = tool_context.state.get("clausehunter:opennyai", {})
     # rag_res = tool_context.state.get("clausehunter:rag", "")  # RAG disabled for now
     
     # Build a readable summary organized by filename
     summary = "## Document Extraction Results\n\n"
     summary += "**IMPORTANT**: Use the EXACT filenames shown below in your playbook JSON.\n\n"
     
-    # Get all unique filenames from both sources
+    # Get all unique filenames from all sources
     all_filenames = set()
     if gliner_res:
         all_filenames.update(gliner_res.keys())
     if lexnlp_res:
         all_filenames.update(lexnlp_res.keys())
+    if opennyai_res:
+        all_filenames.update(opennyai_res.keys())
     
     if not all_filenames:
         summary += "No extraction results available.\n"
@@ -48,6 +53,13 @@ async def fetch_raw_extraction_results(tool_context: ToolContext) -> str:
             if isinstance(acts, list):
                 file_entities.extend(acts)
         
+        # OpenNyAI statutes and provisions for this file
+        if filename in opennyai_res and isinstance(opennyai_res[filename], dict):
+            for key in ('statutes', 'provisions'):
+                values = opennyai_res[filename].get(key, [])
+                if isinstance(values, list):
+                    file_entities.extend(values)
+        
         # Deduplicate and display
         unique_entities = sorted(list(set(file_entities)))
         if unique_entities:
@@ -94,6 +106,23 @@ async def save_curated_playbook(tool_context: ToolContext, curated_playbook_json
     except json.JSONDecodeError:
         return "Error: Invalid JSON format provided."
 
+async def create_fallback_playbook(tool_context: ToolContext) -> str:
+    """
+    Builds the playbook from the raw extraction results with the deterministic rules in
+    playbook.py and saves it to the 'clausehunter:playbook' session state.
+    
+    Args:
+        tool_context: The execution context.
+        
+    Returns:
+        Status message.
+    """
+    playbook = build_playbook_from_state(tool_context.state)
+    if not playbook["playbook"]:
+        return "No extraction results available"
+    tool_context.state["clausehunter:playbook"] = playbook
+    return summarize_playbook(playbook)
+
 async def export_playbook_to_disk(tool_context: ToolContext, output_filename: str = "dynamic_playbook.json") -> str:
     """
     Reads the 'clausehunter:playbook' from session state and writes it to a local JSON file.
@@ -5,11 +5,27 @@ import glob
 import os
 from dotenv import load_dotenv
 
+from ...utils.manifest import forget_files, get_store_document, load_manifest, set_store_document
+from ...utils.text_cache import file_sha256
+
 load_dotenv()
 
+def _delete_store_document(client, document_name: str) -> None:
+    """
+    Removes a previously uploaded document from the File Search store (best effort).
+    """
+    try:
+        client.file_search_stores.documents.delete(name=document_name, config={'force': True})
+        print(f"Deleted stale store document {document_name}")
+    except Exception as e:
+        print(f"Failed to delete store document {document_name}: {e}")
+
 def ingest_documents(folder_path: str = "DB") -> str:
     """
     Ingests PDF documents from the specified folder into a Google File Search Store.
+    Files whose content is already in the store (per the ingestion manifest) are skipped,
+    changed files replace their previous store document, and documents for files that
+    left the folder are removed.
     
     Args:
         folder_path: The path to the folder containing PDF files. Defaults to "Docs".
@@ -46,7 +62,29 @@ def ingest_documents(folder_path: str = "DB") -> str:
     if not pdf_files:
         return "No PDF files found in the specified directory."
 
+    # Remove store documents for files that are no longer in the folder
+    current_names = {os.path.basename(p) for p in pdf_files}
+    removed = []
+    for filename, entry in load_manifest()["files"].items():
+        if filename in current_names:
+            continue
+        record = entry.get("file_search") or {}
+        if record.get("store") == file_search_store.name and record.get("document"):
+            _delete_store_document(client, record["document"])
+        removed.append(filename)
+    if removed:
+        forget_files(removed)
+
+    uploaded = 0
+    skipped = 0
     for pdf_file in pdf_files:
+        # Skip files whose current content is already in the store
+        record = get_store_document(pdf_file, file_search_store.name)
+        if record and record.get("sha256") == file_sha256(pdf_file):
+            print(f"Unchanged, skipping upload: {pdf_file}")
+            skipped += 1
+            continue
+
         print(f"Uploading {pdf_file}...")
         try:
             operation = client.file_search_stores.upload_to_file_search_store(
@@ -58,9 +96,19 @@ def ingest_documents(folder_path: str = "DB") -> str:
             while not operation.done:
                 time.sleep(2)
                 operation = client.operations.get(operation)
-                
+            
+            # Replace the previous version of a changed file
+            if record and record.get("document"):
+                _delete_store_document(client, record["document"])
+            
+            document_name = getattr(getattr(operation, "response", None), "document_name", None)
+            set_store_document(pdf_file, file_search_store.name, document_name)
+            uploaded += 1
             print(f"Uploaded {pdf_file}")
         except Exception as e:
             print(f"Failed to upload {pdf_file}: {e}")
 
-    return f"Successfully created store: {file_search_store.name} and uploaded {len(pdf_files)} documents."
+    return (
+        f"Successfully updated store: {file_search_store.name}. "
+        f"Uploaded {uploaded} new or changed documents, skipped {skipped} unchanged."
+    )
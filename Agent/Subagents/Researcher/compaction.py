@@ -0,0 +1,310 @@
+"""
+Compaction of research results before they reach the LLM.
+
+Every law brings up to five full snippets, and the same gazette page or summary often
+comes back for several laws. Before the results are formatted:
+
+1. Near-duplicate snippets are found across all laws and sources with word shingles and
+   MinHash (with LSH banding, so only likely pairs are compared). The copy most relevant
+   to its law is kept. Copies under other laws shrink to a one-line reference, and extra
+   copies under the same law are dropped.
+2. Each law's snippets are ranked by relevance to the law name: how much of the name
+   they contain, whether the full name appears, and whether they mention an amendment.
+3. A global token budget is shared fairly across laws. Laws that need less than their
+   share keep everything, and the remainder is split among the others. The snippet at
+   a law's cut-off is trimmed to fit, and lower-ranked ones are left out. When the kept
+   copy of a duplicate is left out, the best surviving reference to it gets the text.
+"""
+import os
+import re
+import zlib
+from typing import Dict, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from ...utils.budget import fair_shares
+from ...utils.law_names import canonical_law_key
+from ...utils.normalize import normalize_text
+from ...utils.sentence_index import estimate_tokens
+
+# Token budget for all search results of one batch (override via environment)
+RESEARCH_TOKEN_BUDGET = int(os.getenv("DOCUSCOUT_RESEARCH_TOKENS", "12000"))
+# Estimated Jaccard similarity above which two snippets count as duplicates
+RESEARCH_DEDUP_THRESHOLD = float(os.getenv("DOCUSCOUT_RESEARCH_DEDUP", "0.8"))
+
+_SHINGLE_WORDS = 5
+_MINHASH_PERMUTATIONS = 64
+_LSH_BANDS = 16
+_MERSENNE_PRIME = (1 << 31) - 1
+# A snippet cut shorter than this is left out rather than trimmed
+_MIN_SNIPPET_TOKENS = 40
+# Formatting overhead per result ("SOURCE: ... SNIPPET: ..."), in tokens
+_RESULT_OVERHEAD_TOKENS = 8
+
+# Words that say nothing about which law a snippet is about
+_GENERIC_WORDS = {"act", "acts", "rules", "code", "regulations", "regulation", "of", "and", "the", "for", "in", "on"}
+_UPDATE_CUE = re.compile(r"\b(?:amend\w*|notif\w*|substitut\w*|omitted|inserted|2024|2025)\b")
+_NON_WORD = re.compile(r"[^\w\s]")
+
+_rng = np.random.RandomState(20240601)
+_PERM_A = _rng.randint(1, _MERSENNE_PRIME, size=_MINHASH_PERMUTATIONS).astype(np.uint64)
+_PERM_B = _rng.randint(0, _MERSENNE_PRIME, size=_MINHASH_PERMUTATIONS).astype(np.uint64)
+
+
+class CompactionStats(NamedTuple):
+    tokens_before: int
+    tokens_after: int
+    duplicates: int
+    dropped: int
+
+    def summary(self) -> str:
+        return (
+            f"Research compacted from ~{self.tokens_before} to ~{self.tokens_after} tokens "
+            f"({self.duplicates} duplicate snippets, {self.dropped} dropped for budget)"
+        )
+
+
+def _fold(text: str) -> str:
+    return " ".join(_NON_WORD.sub(" ", normalize_text(text).lower()).split())
+
+
+def shingles(text: str, size: int = _SHINGLE_WORDS) -> Set[int]:
+    """Hashed word shingles of a text (the whole text as one shingle when it is shorter)."""
+    words = _fold(text).split()
+    if len(words) <= size:
+        return {zlib.crc32(" ".join(words).encode("utf-8"))} if words else set()
+    return {zlib.crc32(" ".join(words[i:i + size]).encode("utf-8")) for i in range(len(words) - size + 1)}
+
+
+def minhash_signature(hashes: Set[int]) -> np.ndarray:
+    """MinHash signature of a set of shingle hashes."""
+    if not hashes:
+        return np.full(_MINHASH_PERMUTATIONS, _MERSENNE_PRIME, dtype=np.uint64)
+    values = np.fromiter(hashes, dtype=np.uint64, count=len(hashes)) % np.uint64(_MERSENNE_PRIME)
+    return ((np.outer(_PERM_A, values) + _PERM_B[:, None]) % np.uint64(_MERSENNE_PRIME)).min(axis=1)
+
+
+def near_duplicate_pairs(signatures: Sequence[np.ndarray], threshold: float = RESEARCH_DEDUP_THRESHOLD) -> List[Tuple[int, int]]:
+    """
+    Returns index pairs whose estimated Jaccard similarity is at least `threshold`.
+    Candidates come from LSH bands, so only signatures sharing a band are compared.
+    """
+    rows = _MINHASH_PERMUTATIONS // _LSH_BANDS
+    buckets: Dict[Tuple[int, bytes], List[int]] = {}
+    for i, signature in enumerate(signatures):
+        for band in range(_LSH_BANDS):
+            buckets.setdefault((band, signature[band * rows:(band + 1) * rows].tobytes()), []).append(i)
+
+    candidates = set()
+    for members in buckets.values():
+        for x in range(len(members)):
+            for y in range(x + 1, len(members)):
+                candidates.add((members[x], members[y]))
+    return sorted(
+        (i, j) for i, j in candidates
+        if np.mean(signatures[i] == signatures[j]) >= threshold
+    )
+
+
+def relevance(law_name: str, result: Dict[str, str]) -> float:
+    """
+    Scores how well a search result covers a law: share of the law's distinctive words
+    in the snippet and title, a bonus for the full name, and one for amendment cues.
+    """
+    name = canonical_law_key(law_name)
+    name_words = set(name.split()) - _GENERIC_WORDS or set(name.split())
+    if not name_words:
+        return 0.0
+    title = _fold(result.get("title", ""))
+    text = f"{title} {_fold(result.get('content', ''))}"
+    words = set(text.split())
+    score = len(name_words & words) / len(name_words)
+    score += 0.25 * len(name_words & set(title.split())) / len(name_words)
+    if f" {name} " in f" {text} ":
+        score += 0.5
+    if _UPDATE_CUE.search(text):
+        score += 0.25
+    return score
+
+
+def _result_tokens(result: Dict[str, str]) -> int:
+    return _RESULT_OVERHEAD_TOKENS + estimate_tokens(
+        f"{result.get('title', '')} {result.get('url', '')} {result.get('content', '')}"
+    )
+
+
+def _trim(content: str, tokens: int) -> str:
+    max_chars = tokens * 4
+    if len(content) <= max_chars:
+        return content
+    cut = content.rfind(" ", 0, max_chars)
+    return content[:cut if cut > 0 else max_chars].rstrip() + " ..."
+
+
+def _fit(result: Dict[str, str], left: int) -> Optional[Dict[str, str]]:
+    """
+    Returns the result if it fits in `left` tokens, else a copy with its content trimmed
+    until the whole result (title and URL included) fits; None when less than
+    _MIN_SNIPPET_TOKENS of content would remain, or for a reference that does not fit.
+    """
+    if _result_tokens(result) <= left:
+        return result
+    if not result["content"]:
+        return None
+    # Room for content once the source line is paid for
+    room = left - _result_tokens(dict(result, content=""))
+    while room >= _MIN_SNIPPET_TOKENS:
+        trimmed = dict(result, content=_trim(result["content"], room))
+        # Estimates of the parts do not add up exactly, and trimming appends " ..."
+        excess = _result_tokens(trimmed) - left
+        if excess <= 0:
+            return trimmed
+        room -= excess
+    return None
+
+
+def compact_results(
+    results_by_law: List[Tuple[str, List[Dict[str, str]]]],
+    token_budget: int = RESEARCH_TOKEN_BUDGET,
+    threshold: float = RESEARCH_DEDUP_THRESHOLD
+) -> Tuple[List[Tuple[str, List[Dict[str, str]]]], CompactionStats]:
+    """
+    De-duplicates, ranks and budgets search results across laws.
+
+    Args:
+        results_by_law: (law_name, results) pairs; results are {title, url, content} dicts.
+        token_budget: Estimated tokens allowed for all results together.
+        threshold: Estimated Jaccard similarity at which snippets are duplicates.
+
+    Returns:
+        (law_name, results) pairs in the same order, each law's results ranked by
+        relevance. A duplicate kept only as a reference has empty content and a
+        "duplicate_of" key naming the law whose results hold the text. Also returns
+        CompactionStats.
+    """
+    flat: List[Tuple[int, int, Dict[str, str]]] = [
+        (law_index, rank, result)
+        for law_index, (_, results) in enumerate(results_by_law)
+        for rank, result in enumerate(results)
+    ]
+    tokens_before = sum(_result_tokens(result) for _, _, result in flat)
+    scores = [relevance(results_by_law[law_index][0], result) for law_index, _, result in flat]
+
+    # Union near-duplicates (and repeated URLs) into clusters
+    parent = list(range(len(flat)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    signatures = [minhash_signature(shingles(result.get("content", ""))) for _, _, result in flat]
+    pairs = near_duplicate_pairs(signatures, threshold)
+    by_url: Dict[str, int] = {}
+    for i, (_, _, result) in enumerate(flat):
+        url = result.get("url")
+        if url and url in by_url:
+            pairs.append((by_url[url], i))
+        elif url:
+            by_url[url] = i
+    for i, j in pairs:
+        parent[find(i)] = find(j)
+
+    clusters: Dict[int, List[int]] = {}
+    for i in range(len(flat)):
+        clusters.setdefault(find(i), []).append(i)
+
+    keep: Dict[int, Dict[str, str]] = {}
+    # Reference index -> index of the copy holding the text
+    references: Dict[int, int] = {}
+    duplicates = 0
+    for members in clusters.values():
+        # Keep the copy most relevant to its law; earlier laws and ranks win ties
+        keeper = max(members, key=lambda i: (scores[i], -flat[i][0], -flat[i][1]))
+        keep[keeper] = flat[keeper][2]
+        keeper_law = flat[keeper][0]
+        seen_laws = {keeper_law}
+        for i in members:
+            if i == keeper:
+                continue
+            duplicates += 1
+            law_index, _, result = flat[i]
+            if law_index in seen_laws:
+                continue
+            seen_laws.add(law_index)
+            keep[i] = {
+                "title": result.get("title", "No Title"),
+                "url": result.get("url", "No URL"),
+                "content": "",
+                "duplicate_of": results_by_law[keeper_law][0],
+            }
+            references[i] = keeper
+
+    ranked: List[List[int]] = [[] for _ in results_by_law]
+    for i in sorted(keep, key=lambda i: (-scores[i], flat[i][1])):
+        ranked[flat[i][0]].append(i)
+
+    demands = [sum(_result_tokens(keep[i]) for i in indices) for indices in ranked]
+    shares = fair_shares(demands, token_budget)
+
+    # Per law: result index -> result as kept, in rank order; and the tokens left
+    selected: List[Dict[int, Dict[str, str]]] = []
+    lefts: List[int] = []
+    dropped = 0
+    for indices, share in zip(ranked, shares):
+        kept: Dict[int, Dict[str, str]] = {}
+        left = share
+        for i in indices:
+            fitted = _fit(keep[i], left)
+            if fitted is None:
+                dropped += 1
+                continue
+            kept[i] = fitted
+            left -= _result_tokens(fitted)
+        selected.append(kept)
+        lefts.append(left)
+
+    # A reference is only useful while the copy it points to made it into the budget.
+    # When the keeper was cut, the best-ranked surviving reference is promoted to carry
+    # its own copy of the text, and the cluster's other references point to it.
+    references_by_keeper: Dict[int, List[int]] = {}
+    for i, keeper in references.items():
+        references_by_keeper.setdefault(keeper, []).append(i)
+    for keeper, members in references_by_keeper.items():
+        if keeper in selected[flat[keeper][0]]:
+            continue
+        survivors = sorted(
+            (i for i in members if i in selected[flat[i][0]]),
+            key=lambda i: (-scores[i], flat[i][0], flat[i][1])
+        )
+        holder = None
+        for i in survivors:
+            law_index = flat[i][0]
+            # The reference's tokens are freed whether or not the promotion fits
+            lefts[law_index] += _result_tokens(selected[law_index][i])
+            promoted = _fit(flat[i][2], lefts[law_index])
+            if promoted is not None:
+                selected[law_index][i] = promoted
+                lefts[law_index] -= _result_tokens(promoted)
+                holder = i
+                break
+            del selected[law_index][i]
+            dropped += 1
+        for i in survivors:
+            law_index = flat[i][0]
+            if i == holder or i not in selected[law_index]:
+                continue
+            if holder is None:
+                lefts[law_index] += _result_tokens(selected[law_index].pop(i))
+                dropped += 1
+            else:
+                selected[law_index][i] = dict(selected[law_index][i], duplicate_of=results_by_law[flat[holder][0]][0])
+
+    tokens_after = sum(share - left for share, left in zip(shares, lefts))
+    compacted = [
+        (law_name, list(kept.values()))
+        for (law_name, _), kept in zip(results_by_law, selected)
+    ]
+
+    return compacted, CompactionStats(tokens_before, tokens_after, duplicates, dropped)
@@ -0,0 +1,252 @@
+"""
+Local statute index: an offline stand-in for Tavily.
+
+Builds a BM25 index (scikit-learn CountVectorizer over unigrams and bigrams, weighted
+with numpy/scipy) from a folder of statute texts and amendment notes (.txt, .md, .pdf).
+The index is persisted with joblib and rebuilt only when the folder's contents change.
+LocalStatuteIndex.search has the arguments and response shape of TavilyClient.search,
+so the Researcher's formatting is unchanged.
+
+Select it with DOCUSCOUT_RESEARCH_BACKEND=local. To build the index ahead of time and
+time a few lookups:
+
+    python -m Agent.Subagents.Researcher.local_index [statute_dir]
+"""
+import os
+import re
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import joblib
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import CountVectorizer
+
+from ...utils.document import Document
+from ...utils.normalize import normalize_text
+from ...utils.sentences import split_by_words
+from ...utils.text_cache import CACHE_DIR
+
+STATUTE_DIR = os.getenv("DOCUSCOUT_STATUTE_DIR", os.path.join("DB", "statutes"))
+STATUTE_INDEX_PATH = os.getenv("DOCUSCOUT_STATUTE_INDEX", os.path.join(CACHE_DIR, "statute_index.joblib"))
+# Passage size for indexing and for returned snippets (override via environment)
+STATUTE_PASSAGE_CHARS = int(os.getenv("DOCUSCOUT_STATUTE_PASSAGE_CHARS", "1500"))
+# Share of the query's words a passage must contain, so "Unknown Widgets Act" does not
+# return every passage that mentions "Act"
+STATUTE_MIN_COVERAGE = float(os.getenv("DOCUSCOUT_STATUTE_MIN_COVERAGE", "0.6"))
+
+# Bump when the passage splitting or scoring changes so persisted indexes are rebuilt
+LOCAL_INDEX_VERSION = "1"
+STATUTE_EXTENSIONS = (".txt", ".md", ".pdf")
+
+# BM25 parameters
+_BM25_K1 = 1.5
+_BM25_B = 0.75
+
+_BLANK_LINE = re.compile(r"\n\s*\n")
+
+
+def _fingerprint(statute_dir: str) -> List[Tuple[str, int, int]]:
+    """(relative path, size, mtime) of every statute file; a change triggers a rebuild."""
+    entries = []
+    for root, _, files in os.walk(statute_dir):
+        for name in files:
+            if name.lower().endswith(STATUTE_EXTENSIONS):
+                path = os.path.join(root, name)
+                stat = os.stat(path)
+                entries.append((os.path.relpath(path, statute_dir), stat.st_size, stat.st_mtime_ns))
+    return sorted(entries)
+
+
+def _text_passages(text: str, max_chars: int) -> Iterator[str]:
+    """Merges blank-line separated paragraphs up to `max_chars`; longer paragraphs are split by words."""
+    chunk = ""
+    for paragraph in _BLANK_LINE.split(text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if len(paragraph) > max_chars:
+            if chunk:
+                yield chunk
+                chunk = ""
+            # Roughly six characters per word in statute text
+            for start, end in split_by_words(paragraph, max(1, max_chars // 6)):
+                yield paragraph[start:end]
+            continue
+        if chunk and len(chunk) + len(paragraph) + 2 > max_chars:
+            yield chunk
+            chunk = ""
+        chunk = f"{chunk}\n\n{paragraph}" if chunk else paragraph
+    if chunk:
+        yield chunk
+
+
+def _file_passages(path: str, max_chars: int) -> Tuple[str, List[str]]:
+    """Returns (title, passages) of one statute file."""
+    stem = os.path.splitext(os.path.basename(path))[0]
+    if path.lower().endswith(".pdf"):
+        return stem, [text for _, text in Document(path).paragraphs(max_chars) if text.strip()]
+
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        text = f.read()
+    first_line = next((line.strip().lstrip("#").strip() for line in text.splitlines() if line.strip()), "")
+    return (first_line[:120] or stem), list(_text_passages(text, max_chars))
+
+
+def _bm25_weights(counts: sparse.csr_matrix) -> sparse.csr_matrix:
+    """
+    Turns a passage-term count matrix into BM25 term weights, so a query's score is the
+    sum of the weights of its terms: one sparse matrix-vector product per search.
+    """
+    counts = counts.tocsr().astype(np.float32)
+    n_docs = counts.shape[0]
+    doc_freq = np.bincount(counts.indices, minlength=counts.shape[1])
+    idf = np.log1p((n_docs - doc_freq + 0.5) / (doc_freq + 0.5)).astype(np.float32)
+
+    doc_len = np.asarray(counts.sum(axis=1)).ravel()
+    avg_len = doc_len.mean() if n_docs else 0.0
+    norm = _BM25_K1 * (1 - _BM25_B + _BM25_B * doc_len / (avg_len or 1.0))
+
+    weights = counts.copy()
+    rows = np.repeat(np.arange(n_docs), np.diff(counts.indptr))
+    tf = weights.data
+    weights.data = idf[counts.indices] * tf * (_BM25_K1 + 1) / (tf + norm[rows])
+    return weights
+
+
+class LocalStatuteIndex:
+    """BM25 index over statute passages with a TavilyClient-compatible search()."""
+
+    # Local results are cheaper than the search cache and must not be mixed into it
+    is_local = True
+    # Query by law name alone; the web query's extra words would match every passage
+    query_template = "{law_name}"
+
+    def __init__(self, passages: List[Dict[str, str]], vectorizer: CountVectorizer, weights: sparse.csr_matrix):
+        self.passages = passages
+        self.vectorizer = vectorizer
+        self.weights = weights
+
+    @classmethod
+    def build(cls, statute_dir: str = STATUTE_DIR, max_chars: int = STATUTE_PASSAGE_CHARS) -> "LocalStatuteIndex":
+        """Indexes every statute file under `statute_dir`."""
+        passages = []
+        for relpath, _, _ in _fingerprint(statute_dir):
+            path = os.path.join(statute_dir, relpath)
+            try:
+                title, texts = _file_passages(path, max_chars)
+            except Exception as e:
+                print(f"Error indexing {relpath}: {e}")
+                continue
+            for number, text in enumerate(texts, 1):
+                passages.append({
+                    "title": title,
+                    "url": f"local://{relpath.replace(os.sep, '/')}#{number}",
+                    "content": normalize_text(text),
+                })
+        if not passages:
+            raise ValueError(f"No statute texts found in '{statute_dir}'.")
+
+        vectorizer = CountVectorizer(
+            stop_words="english",
+            ngram_range=(1, 2),
+            token_pattern=r"(?u)\b\w+\b",
+            dtype=np.float32
+        )
+        counts = vectorizer.fit_transform(p["content"] for p in passages)
+        return cls(passages, vectorizer, _bm25_weights(counts))
+
+    def search(
+        self,
+        query: str,
+        search_depth: str = "basic",
+        include_domains: Optional[List[str]] = None,
+        max_results: int = 5
+    ) -> Dict[str, Any]:
+        """
+        Returns the best-scoring passages in TavilyClient.search's response shape.
+        Passages containing less than STATUTE_MIN_COVERAGE of the query's words are
+        dropped. `search_depth` and `include_domains` are accepted for compatibility;
+        local sources are curated, so there is nothing to filter.
+        """
+        vocabulary = self.vectorizer.vocabulary_
+        terms = set(self.vectorizer.build_analyzer()(normalize_text(query)))
+        columns = [vocabulary[t] for t in terms if t in vocabulary]
+        words = [t for t in terms if " " not in t]
+        word_columns = [vocabulary[w] for w in words if w in vocabulary]
+        if not word_columns:
+            return {"query": query, "results": []}
+
+        # Sum of the BM25 weights of the query's terms (unigrams and bigrams)
+        scores = np.asarray(self.weights[:, columns].sum(axis=1)).ravel()
+        coverage = np.diff(self.weights[:, word_columns].tocsr().indptr) / len(words)
+
+        candidates = np.flatnonzero((scores > 0) & (coverage >= STATUTE_MIN_COVERAGE))
+        if len(candidates) > max_results:
+            candidates = candidates[np.argpartition(-scores[candidates], max_results - 1)[:max_results]]
+        ranked = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return {
+            "query": query,
+            "results": [dict(self.passages[i], score=float(scores[i])) for i in ranked],
+        }
+
+
+def load_statute_index(statute_dir: str = STATUTE_DIR, index_path: str = STATUTE_INDEX_PATH) -> LocalStatuteIndex:
+    """
+    Loads the persisted index, rebuilding and saving it when the statute folder changed.
+    """
+    fingerprint = _fingerprint(statute_dir)
+    if os.path.exists(index_path):
+        try:
+            saved = joblib.load(index_path)
+            if saved.get("version") == LOCAL_INDEX_VERSION and saved.get("fingerprint") == fingerprint:
+                return LocalStatuteIndex(saved["passages"], saved["vectorizer"], saved["weights"])
+        except Exception as e:
+            print(f"Rebuilding statute index ({e})")
+
+    index = LocalStatuteIndex.build(statute_dir)
+    os.makedirs(os.path.dirname(index_path) or ".", exist_ok=True)
+    tmp_path = f"{index_path}.tmp"
+    joblib.dump({
+        "version": LOCAL_INDEX_VERSION,
+        "fingerprint": fingerprint,
+        "passages": index.passages,
+        "vectorizer": index.vectorizer,
+        "weights": index.weights,
+    }, tmp_path, compress=3)
+    os.replace(tmp_path, index_path)
+    print(f"Statute index built: {len(index.passages)} passages from {len(fingerprint)} files")
+    return index
+
+
+_index: Optional[LocalStatuteIndex] = None
+_index_fingerprint: Optional[List[Tuple[str, int, int]]] = None
+_index_lock = threading.Lock()
+
+
+def get_statute_index() -> LocalStatuteIndex:
+    """
+    Returns the process-wide statute index, loading it on first use and again whenever
+    the statute folder changes (a directory walk and stat per file, so cheap per call).
+    """
+    global _index, _index_fingerprint
+    with _index_lock:
+        fingerprint = _fingerprint(STATUTE_DIR)
+        if _index is None or fingerprint != _index_fingerprint:
+            _index = load_statute_index(STATUTE_DIR, STATUTE_INDEX_PATH)
+            _index_fingerprint = fingerprint
+        return _index
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    statute_dir = sys.argv[1] if len(sys.argv) > 1 else STATUTE_DIR
+    index = load_statute_index(statute_dir)
+    queries = [p["title"] for p in index.passages[:: max(1, len(index.passages) // 20)]]
+    start = time.perf_counter()
+    for query in queries:
+        index.search(query)
+    elapsed = (time.perf_counter() - start) / max(1, len(queries))
+    print(f"{len(index.passages)} passages, {elapsed * 1000:.2f} ms per lookup")
@@ -0,0 +1,131 @@
+"""
+Disk-backed cache of Tavily search results.
+
+The same statutes show up in almost every contract, so results are stored in SQLite
+and keyed by the canonical law key (see utils.law_names), jurisdiction, whitelist
+domains and query template; spelling variants of one statute share an entry. Fresh
+entries are served directly. Entries past their TTL are served at once while a
+background refresh replaces them ("stale-while-revalidate"). In offline mode the cache
+is the only source and Tavily is never called.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from ...utils.text_cache import CACHE_DIR
+
+TAVILY_CACHE_PATH = os.getenv("TAVILY_CACHE_PATH", os.path.join(CACHE_DIR, "tavily_cache.sqlite"))
+# Entries older than this are refreshed in the background (override via environment)
+TAVILY_CACHE_TTL_HOURS = float(os.getenv("TAVILY_CACHE_TTL_HOURS", "168"))
+# Serve only cached results and never call Tavily
+TAVILY_OFFLINE = os.getenv("TAVILY_OFFLINE", "0").lower() in ("1", "true", "yes")
+
+
+def search_cache_key(law_key: str, jurisdiction: str, domains: List[str], query_template: str) -> str:
+    """
+    Builds the cache key for one law search.
+
+    Args:
+        law_key: Canonical law key (utils.law_names.canonical_law_key or LawNameGroup.key).
+    """
+    payload = json.dumps({
+        "law": law_key,
+        "jurisdiction": jurisdiction.strip().lower(),
+        "domains": sorted(d.strip().lower() for d in domains),
+        "template": query_template,
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SearchCache:
+    """
+    SQLite store of structured search results with TTL and background refresh bookkeeping.
+    get() and put() block on disk I/O; async callers run them with run_in_thread.
+    """
+
+    def __init__(self, path: str = TAVILY_CACHE_PATH, ttl_hours: float = TAVILY_CACHE_TTL_HOURS):
+        self.path = path
+        self.ttl_seconds = ttl_hours * 3600
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        # One short-lived connection per call keeps this safe across worker threads
+        if not self._initialized:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        if not self._initialized:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS search_cache ("
+                " key TEXT PRIMARY KEY,"
+                " law_name TEXT,"
+                " jurisdiction TEXT,"
+                " query TEXT,"
+                " results TEXT NOT NULL,"
+                " fetched_at REAL NOT NULL)"
+            )
+            conn.commit()
+            self._initialized = True
+        return conn
+
+    def get(self, key: str) -> Optional[Tuple[List[Dict[str, Any]], bool]]:
+        """
+        Returns (results, is_fresh) for a key, or None on a miss.
+        """
+        try:
+            conn = self._connect()
+            try:
+                row = conn.execute(
+                    "SELECT results, fetched_at FROM search_cache WHERE key = ?", (key,)
+                ).fetchone()
+            finally:
+                conn.close()
+        except (sqlite3.Error, OSError) as e:
+            print(f"Tavily cache unavailable: {e}")
+            return None
+        if row is None:
+            return None
+        results, fetched_at = row
+        return json.loads(results), (time.time() - fetched_at) < self.ttl_seconds
+
+    def put(self, key: str, law_name: str, jurisdiction: str, query: str, results: List[Dict[str, Any]]) -> None:
+        """
+        Stores the structured results of a search.
+        """
+        try:
+            conn = self._connect()
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO search_cache (key, law_name, jurisdiction, query, results, fetched_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, law_name, jurisdiction, query, json.dumps(results), time.time())
+                )
+                conn.commit()
+            finally:
+                conn.close()
+        except (sqlite3.Error, OSError) as e:
+            print(f"Error writing Tavily cache: {e}")
+
+    def claim_refresh(self, key: str) -> bool:
+        """
+        Marks a key as being refreshed. Returns False if a refresh is already running.
+        """
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+            return True
+
+    def release_refresh(self, key: str) -> None:
+        with self._lock:
+            self._refreshing.discard(key)
+
+
+# Global instance
+search_cache = SearchCache()
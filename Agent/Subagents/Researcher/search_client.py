@@ -0,0 +1,157 @@
+"""
+Async Tavily search client.
+
+Replaces one blocking TavilyClient call per law on the default thread pool with:
+pooled HTTP connections (httpx), a token-bucket rate limiter, a semaphore that bounds
+in-flight requests, and retries with jittered exponential backoff on 429/5xx and
+transport errors. Each search has a deadline that starts once it gets its first
+request slot, so time spent queued behind the rate limiter does not count: a large
+batch slows down, and only a search that is itself slow times out.
+"""
+import asyncio
+import os
+import random
+import time
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+TAVILY_SEARCH_URL = os.getenv("TAVILY_SEARCH_URL", "https://api.tavily.com/search")
+# Requests in flight at once, and sustained request rate / burst size (override via environment)
+TAVILY_MAX_CONCURRENCY = int(os.getenv("TAVILY_MAX_CONCURRENCY", "4"))
+TAVILY_RATE_PER_SEC = float(os.getenv("TAVILY_RATE_PER_SEC", "2"))
+TAVILY_BURST = int(os.getenv("TAVILY_BURST", "4"))
+TAVILY_MAX_RETRIES = int(os.getenv("TAVILY_MAX_RETRIES", "4"))
+TAVILY_REQUEST_TIMEOUT = float(os.getenv("TAVILY_REQUEST_TIMEOUT", "30"))
+# Upper bound for one law's search once it has started, retries included
+TAVILY_LAW_DEADLINE = float(os.getenv("TAVILY_LAW_DEADLINE", "60"))
+
+_RETRY_BASE_SECONDS = 1.0
+_RETRY_MAX_SECONDS = 20.0
+_RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class SearchError(Exception):
+    """A search failed after all retries, or with a non-retryable status."""
+
+
+class TokenBucket:
+    """Async token bucket: `rate` tokens per second, holding at most `capacity`."""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Waits until a token is available and takes it."""
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+def _retry_delay(attempt: int, retry_after: Optional[str]) -> float:
+    """Full-jitter exponential backoff, never shorter than the server's Retry-After."""
+    delay = random.uniform(0, min(_RETRY_MAX_SECONDS, _RETRY_BASE_SECONDS * (2 ** attempt)))
+    if retry_after:
+        try:
+            delay = max(delay, float(retry_after))
+        except ValueError:
+            pass
+    return delay
+
+
+class AsyncSearchClient:
+    """Rate-limited, retrying Tavily client over a pooled httpx connection."""
+
+    def __init__(
+        self,
+        api_key: str,
+        max_concurrency: int = TAVILY_MAX_CONCURRENCY,
+        rate_per_sec: float = TAVILY_RATE_PER_SEC,
+        burst: int = TAVILY_BURST,
+        max_retries: int = TAVILY_MAX_RETRIES,
+        deadline: Optional[float] = TAVILY_LAW_DEADLINE
+    ):
+        self.api_key = api_key
+        self.max_retries = max_retries
+        self.deadline = deadline
+        self._semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        self._bucket = TokenBucket(rate_per_sec, burst)
+        self._http = httpx.AsyncClient(
+            timeout=TAVILY_REQUEST_TIMEOUT,
+            limits=httpx.Limits(max_connections=max(1, max_concurrency), max_keepalive_connections=max(1, max_concurrency)),
+            headers={"Authorization": f"Bearer {api_key}"}
+        )
+
+    async def __aenter__(self) -> "AsyncSearchClient":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await self._http.aclose()
+
+    async def search(
+        self,
+        query: str,
+        search_depth: str = "basic",
+        include_domains: Optional[List[str]] = None,
+        max_results: int = 5
+    ) -> Dict[str, Any]:
+        """
+        Runs a Tavily search. Same arguments and response shape as TavilyClient.search.
+
+        Raises:
+            SearchError: If the request keeps failing or is rejected.
+            asyncio.TimeoutError: If the deadline passes before a response arrives.
+        """
+        payload = {
+            "query": query,
+            "search_depth": search_depth,
+            "include_domains": include_domains or [],
+            "max_results": max_results,
+        }
+        loop = asyncio.get_running_loop()
+        expires = None
+        last_error = "no attempt made"
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
+            async with self._semaphore:
+                await self._bucket.acquire()
+                if expires is None and self.deadline is not None:
+                    expires = loop.time() + self.deadline
+                remaining = None if expires is None else expires - loop.time()
+                if remaining is not None and remaining <= 0:
+                    raise asyncio.TimeoutError()
+                try:
+                    response = await asyncio.wait_for(self._http.post(TAVILY_SEARCH_URL, json=payload), remaining)
+                except httpx.TransportError as e:
+                    last_error = f"{type(e).__name__}: {e}"
+                else:
+                    if response.status_code == 200:
+                        return response.json()
+                    last_error = f"HTTP {response.status_code}: {response.text[:200]}"
+                    if response.status_code not in _RETRYABLE_STATUS:
+                        raise SearchError(last_error)
+                    retry_after = response.headers.get("Retry-After")
+
+            if attempt < self.max_retries:
+                delay = _retry_delay(attempt, retry_after)
+                if expires is not None and loop.time() + delay >= expires:
+                    raise asyncio.TimeoutError()
+                # Back off outside the semaphore so other laws keep going
+                await asyncio.sleep(delay)
+
+        raise SearchError(f"Giving up after {self.max_retries + 1} attempts ({last_error})")
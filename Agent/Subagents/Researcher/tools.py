@@ -1,39 +1,166 @@
 import os
 import json
 import asyncio
-from typing import List
+import inspect
+from typing import List, Optional, Tuple
 from google.adk.tools.tool_context import ToolContext
-from tavily import TavilyClient
 
-# Helper function for a single blocking search (run in thread)
-def _execute_single_search(client, law_name: str, jurisdiction: str, whitelist_domains: List[str]) -> str:
+from ...utils.executors import run_in_thread
+from ...utils.law_names import LawNameGroup, canonical_law_key, group_law_names
+from .compaction import compact_results
+from .search_cache import TAVILY_OFFLINE, search_cache, search_cache_key
+from .search_client import TAVILY_LAW_DEADLINE, AsyncSearchClient
+
+# Query sent to Tavily for each law; part of the cache key, so changing it starts a fresh cache
+QUERY_TEMPLATE = "what is {law_name} official summary and latest amendments {jurisdiction} 2024 2025"
+SEARCH_DEPTH = "advanced"
+SEARCH_MAX_RESULTS = 5
+# "tavily" (web search over the whitelist) or "local" (statute index, see local_index.py)
+RESEARCH_BACKEND = os.getenv("DOCUSCOUT_RESEARCH_BACKEND", "tavily").lower()
+
+# Background refreshes still running; held so they are not garbage collected mid-flight
+_refresh_tasks = set()
+
+def _build_query(law_name: str, jurisdiction: str, template: str = QUERY_TEMPLATE) -> str:
+    # Construct specific query for recent updates AND summary
+    return template.format(law_name=law_name, jurisdiction=jurisdiction)
+
+async def _fetch_results(client, law_name: str, jurisdiction: str, whitelist_domains: List[str]) -> List[dict]:
+    """
+    Runs one search and returns its structured results. `client` is anything with
+    TavilyClient's search() signature, sync or async, and may set its own query_template.
+    """
+    query = _build_query(law_name, jurisdiction, getattr(client, "query_template", QUERY_TEMPLATE))
+    
+    # Execute Search
+    response = client.search(
+        query=query,
+        search_depth=SEARCH_DEPTH,
+        include_domains=whitelist_domains,
+        max_results=SEARCH_MAX_RESULTS
+    )
+    if inspect.isawaitable(response):
+        response = await response
+    return [
+        {
+            "title": result.get("title", "No Title"),
+            "url": result.get("url", "No URL"),
+            "content": result.get("content", "No content snippet"),
+        }
+        for result in response.get("results") or []
+    ]
+
+def _format_results(law_name: str, results: List[dict]) -> str:
+    """
+    Formats structured results for the LLM; used for both fresh and cached results.
+    """
+    results_text = f"--- Search Results for '{law_name}' (2024-2025 Updates) ---\n"
+    if not results:
+        results_text += f"No recent official updates found on allowed domains.\n"
+    else:
+        for result in results:
+            if result.get("duplicate_of"):
+                # Compacted away: the same text is listed under another law
+                results_text += f"SOURCE: {result['title']} ({result['url']})\nSNIPPET: (same text as under '{result['duplicate_of']}')\n\n"
+            else:
+                results_text += f"SOURCE: {result['title']} ({result['url']})\nSNIPPET: {result['content']}\n\n"
+    return results_text
+
+def _refresh_in_background(api_key: str, key: str, law_name: str, jurisdiction: str, whitelist_domains: List[str]) -> None:
+    """
+    Re-runs a stale search as a background task and replaces the cached entry.
+    Uses its own client, since the batch's client is closed when the batch returns.
+    """
+    if not search_cache.claim_refresh(key):
+        return
+
+    async def refresh():
+        try:
+            async with AsyncSearchClient(api_key) as client:
+                results = await _fetch_results(client, law_name, jurisdiction, whitelist_domains)
+            await run_in_thread(search_cache.put, key, law_name, jurisdiction, _build_query(law_name, jurisdiction), results)
+        except Exception as e:
+            print(f"Background refresh failed for {law_name}: {e}")
+        finally:
+            search_cache.release_refresh(key)
+
+    task = asyncio.get_running_loop().create_task(refresh())
+    _refresh_tasks.add(task)
+    task.add_done_callback(_refresh_tasks.discard)
+
+async def _search_results(client, law_name: str, jurisdiction: str, whitelist_domains: List[str], law_key: Optional[str] = None) -> Tuple[Optional[List[dict]], str]:
+    """
+    Searches one law: cache first, then the async client (which enforces the per-law deadline).
+    The cache is keyed by `law_key` (the canonical key of `law_name` when omitted).
+
+    Returns:
+        (results, "") on success, or (None, message) when there are no results to show;
+        failures and timeouts are reported per law, so the batch still returns.
+    """
+    if getattr(client, "is_local", False):
+        # Local index: faster than the cache, and its results must not be cached as web results
+        try:
+            return await _fetch_results(client, law_name, jurisdiction, whitelist_domains), ""
+        except Exception as e:
+            return None, f"Error searching for {law_name}: {str(e)}\n"
+
+    key = search_cache_key(law_key or canonical_law_key(law_name), jurisdiction, whitelist_domains, QUERY_TEMPLATE)
+    # SQLite calls block, so they run on the thread pool, not on the loop shared with the searches
+    cached = await run_in_thread(search_cache.get, key)
+    
+    if cached is not None:
+        results, is_fresh = cached
+        if not is_fresh and not TAVILY_OFFLINE and client is not None:
+            # Serve the stale entry now; the refreshed one is used next time
+            _refresh_in_background(client.api_key, key, law_name, jurisdiction, whitelist_domains)
+        return results, ""
+    
+    if TAVILY_OFFLINE or client is None:
+        return None, f"--- Search Results for '{law_name}' ---\nNo cached results available (offline mode).\n"
+    
     try:
-        # Construct specific query for recent updates AND summary
-        query = f"what is {law_name} official summary and latest amendments {jurisdiction} 2024 2025"
-        
-        # Execute Search
-        response = client.search(
-            query=query,
-            search_depth="advanced",
-            include_domains=whitelist_domains,
-            max_results=5
-        )
-        
-        # Format results
-        results_text = f"--- Search Results for '{law_name}' (2024-2025 Updates) ---\n"
-        if not response.get("results"):
-            results_text += f"No recent official updates found on allowed domains.\n"
-        else:
-            for result in response["results"]:
-                title = result.get("title", "No Title")
-                url = result.get("url", "No URL")
-                content = result.get("content", "No content snippet")
-                results_text += f"SOURCE: {title} ({url})\nSNIPPET: {content}\n\n"
-        
-        return results_text
+        results = await _fetch_results(client, law_name, jurisdiction, whitelist_domains)
+        await run_in_thread(search_cache.put, key, law_name, jurisdiction, _build_query(law_name, jurisdiction), results)
+        return results, ""
 
+    except asyncio.TimeoutError:
+        return None, f"--- Search Results for '{law_name}' ---\nSearch timed out after {TAVILY_LAW_DEADLINE:.0f}s; no results.\n"
     except Exception as e:
-        return f"Error searching for {law_name}: {str(e)}\n"
+        return None, f"Error searching for {law_name}: {str(e)}\n"
+
+async def _execute_single_search(client, law_name: str, jurisdiction: str, whitelist_domains: List[str], law_key: Optional[str] = None) -> str:
+    """
+    Searches one law and returns its formatted results (see _search_results).
+    """
+    results, message = await _search_results(client, law_name, jurisdiction, whitelist_domains, law_key)
+    return message if results is None else _format_results(law_name, results)
+
+async def _search_group(client, group: LawNameGroup, jurisdiction: str, whitelist_domains: List[str]) -> Tuple[LawNameGroup, Optional[List[dict]], str]:
+    """
+    Searches one statute once for all of its spellings.
+    """
+    results, message = await _search_results(client, group.name, jurisdiction, whitelist_domains, law_key=group.key)
+    return group, results, message
+
+def _combine_results(outcomes: List[Tuple[LawNameGroup, Optional[List[dict]], str]]) -> str:
+    """
+    Compacts the results of all laws together (duplicates, relevance, token budget) and
+    formats them. Each law lists its other spellings, so the results can be matched back
+    to the names in the playbook.
+    """
+    found = [(group.name, results) for group, results, _ in outcomes if results is not None]
+    compacted, stats = compact_results(found)
+    print(stats.summary())
+
+    compacted_results = iter(results for _, results in compacted)
+    texts = []
+    for group, results, message in outcomes:
+        text = message if results is None else _format_results(group.name, next(compacted_results))
+        aliases = [variant for variant in group.variants if variant != group.name]
+        if aliases:
+            text += f"(Also referred to as: {', '.join(aliases)})\n"
+        texts.append(text)
+    return "\n\n".join(texts)
 
 async def batch_search_legal_updates(tool_context: ToolContext, law_names: List[str], jurisdiction: str = "India") -> str:
     """
@@ -60,30 +187,43 @@ async def batch_search_legal_updates(tool_context: ToolContext, law_names: List[
         "clc.gov.in"             # Chief Labour Commissioner
     ]
     
-    # Check for Tavily API Key
+    # Spelling variants of one statute ("MW Act", "Minimum Wages Act, 1948") are searched once
+    groups = group_law_names(law_names)
+    if len(groups) < len(law_names):
+        print(f"Canonicalized {len(law_names)} law names to {len(groups)} searches")
+
+    if RESEARCH_BACKEND == "local":
+        try:
+            # Imported here so scikit-learn is only loaded when the local backend is used
+            from .local_index import get_statute_index
+            index = await run_in_thread(get_statute_index)
+            outcomes = await asyncio.gather(
+                *(_search_group(index, group, jurisdiction, whitelist_domains) for group in groups)
+            )
+            return _combine_results(outcomes)
+        except Exception as e:
+            return f"Error performing local legal search: {str(e)}"
+
+    # Check for Tavily API Key (not needed when serving from the cache only)
     api_key = os.getenv("TAVILY_API_KEY")
-    if not api_key:
+    if not api_key and not TAVILY_OFFLINE:
         return "Error: TAVILY_API_KEY not found in environment variables."
 
     try:
-        # Initialize Client
-        client = TavilyClient(api_key=api_key)
-        
-        # Create Loop for Parallel Execution
-        # We use asyncio.to_thread because the Tavily Python client is blocking (synchronous)
-        loop = asyncio.get_running_loop()
-        tasks = []
-        
-        for law in law_names:
-            tasks.append(
-                loop.run_in_executor(None, _execute_single_search, client, law, jurisdiction, whitelist_domains)
+        if TAVILY_OFFLINE:
+            outcomes = await asyncio.gather(
+                *(_search_group(None, group, jurisdiction, whitelist_domains) for group in groups)
             )
+        else:
+            # One pooled, rate-limited client for the whole batch; the semaphore and token
+            # bucket inside it bound the fan-out, so large portfolios slow down instead of failing
+            async with AsyncSearchClient(api_key) as client:
+                outcomes = await asyncio.gather(
+                    *(_search_group(client, group, jurisdiction, whitelist_domains) for group in groups)
+                )
         
-        # Run all searches concurrently
-        results = await asyncio.gather(*tasks)
-        
-        # Combine all results into one massive string
-        return "\n\n".join(results)
+        # Combine all results into one compact, budgeted string
+        return _combine_results(outcomes)
 
     except Exception as e:
         return f"Error performing batch legal search: {str(e)}"
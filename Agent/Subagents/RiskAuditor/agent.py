@@ -16,12 +16,15 @@ lite_llm_model = LiteLlm(
     api_key=os.getenv("LITELLM_PROXY_GEMINI_API_KEY")
 )
 
-from .tools import fetch_audit_context, fetch_all_laws_from_file, save_audit_report
+from .tools import fetch_audit_context, fetch_laws_across_files, fetch_all_laws_from_file, save_audit_report
+from .parallel_audit import AUDIT_MODE, ParallelAuditAgent
 
-root_agent = LlmAgent(
+# AUDIT_MODE=llm audits the whole corpus in one conversation; otherwise each file is
+# audited in its own parallel LLM call and the report is assembled by rules.
+llm_risk_auditor = LlmAgent(
     name="RiskAuditor",
     model=lite_llm_model,
-    tools=[fetch_audit_context, fetch_all_laws_from_file, save_audit_report],
+    tools=[fetch_audit_context, fetch_laws_across_files, fetch_all_laws_from_file, save_audit_report],
     description="You cross-reference the Contract Playbook against Legal Updates to find compliance risks in different files.",
     instruction="""
     You are the 'Legal Risk Auditor'. Your job is to compare the Contract Playbook against Legal Compliance Updates to identify risks in different files.
@@ -31,13 +34,13 @@ root_agent = LlmAgent(
        - dynamic_playbook.json (what legal entities are in each contract file)
        - compliance_updates.json (research findings for each law in each file)
     
-    2. **Per-File Batch Analysis** (IMPORTANT - Use Batch Tool):
-       For EACH file in the compliance updates:
-         a) Extract ALL law names from that file's laws array into a list
-         b) Call `fetch_all_laws_from_file(filename, law_names_list)` ONCE per file
-            - This will search for ALL laws in that file in a single call
-            - Much more efficient than individual calls
-         c) Analyze the batch results and compare with compliance update information:
+    2. **Corpus-Wide Context Search** (IMPORTANT - Use Corpus Tool):
+         a) Call `fetch_laws_across_files()` ONCE
+            - It searches ALL laws in ALL files (from the loaded compliance updates) in one call
+            - Results are grouped by file; each law shows its mention count and context snippets
+         b) Only if a specific file's context was truncated or is insufficient, call
+            `fetch_all_laws_from_file(filename, law_names_list)` for that file
+         c) For EACH file, analyze the results and compare with compliance update information:
             - **description**: What the law governs
             - **status**: "Update identified", "No recent amendments", or "Not found"
             - **latest_change**: What changed in 2024-2025
@@ -70,7 +73,7 @@ root_agent = LlmAgent(
     **Law Description**: [from compliance_updates.json]
     **Status**: Update identified
     **Latest Change (2024-2025)**: [from compliance_updates.json]
-    **Contract Text**: [from fetch_all_laws_from_file]
+    **Contract Text**: [from fetch_laws_across_files]
     **Issue**: The contract specifies ₹300/day but the 2025 amendment requires ₹500/day minimum.
     **Source**: [from compliance_updates.json]
     
@@ -98,7 +101,8 @@ root_agent = LlmAgent(
     5. **Inform**: Tell the user "Risk audit complete. Report saved to risk_audit_report.md"
     
     IMPORTANT:
-    - Use fetch_all_laws_from_file for batch processing (one call per file)
+    - Use fetch_laws_across_files once for the whole corpus
+    - Do NOT call fetch_all_laws_from_file for every file; only for files that need more context
     - Do NOT call fetch_law_context_from_document multiple times
     - Analyze EVERY law in EVERY file from compliance_updates.json
     - Be specific about violations - cite exact contract language vs. law requirements
@@ -106,3 +110,10 @@ root_agent = LlmAgent(
     """
 )
 
+if AUDIT_MODE == "llm":
+    root_agent = llm_risk_auditor
+else:
+    root_agent = ParallelAuditAgent(
+        name="RiskAuditor",
+        description="You cross-reference the Contract Playbook against Legal Updates to find compliance risks in different files, auditing each file in parallel."
+    )
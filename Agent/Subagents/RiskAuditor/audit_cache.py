@@ -0,0 +1,153 @@
+"""
+Disk-backed cache of per-law audit verdicts.
+
+A nightly re-audit usually sees the same contracts and playbook with a few changed
+law updates, yet every ambiguous law went back to the model. Each model verdict is now
+stored in SQLite per (file, law) together with the hashes of the inputs it was derived
+from:
+
+- the document text (the text cache key: PDF content hash plus extractor version),
+- the file's playbook entities,
+- the law's compliance entry,
+- the audit prompt version (prompt, snippet count, snippet size and model).
+
+A verdict is reused only while all four hashes match; otherwise the pair is
+re-audited and its row replaced, so the cache holds one row per pair. Rule and
+fallback verdicts are not stored: rules are cheap to re-run, and failed calls should
+be retried.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from typing import Any, Dict, Iterable, List, NamedTuple, Tuple
+
+from ...utils.text_cache import CACHE_DIR
+
+AUDIT_CACHE_PATH = os.getenv("AUDIT_CACHE_PATH", os.path.join(CACHE_DIR, "audit_cache.sqlite"))
+# Reuse verdicts whose inputs are unchanged (set to 0 to re-audit everything)
+AUDIT_CACHE = os.getenv("AUDIT_CACHE", "1").lower() in ("1", "true", "yes")
+
+
+def _digest(data: Any) -> str:
+    payload = json.dumps(data, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class AuditInputs(NamedTuple):
+    """Hashes of everything a (file, law) verdict depends on."""
+    document: str
+    entities: str
+    law: str
+    prompt: str
+
+    @classmethod
+    def of(cls, document_key: str, entities: Iterable[str], law: Dict[str, Any], prompt_version: str) -> "AuditInputs":
+        return cls(document_key, _digest(sorted(entities)), _digest(law), prompt_version)
+
+    def changed(self, other: "AuditInputs") -> List[str]:
+        """Names of the inputs that differ from `other`."""
+        return [field for field in self._fields if getattr(self, field) != getattr(other, field)]
+
+
+class AuditCache:
+    """SQLite store of audit verdicts, one row per (file, law)."""
+
+    def __init__(self, path: str = AUDIT_CACHE_PATH):
+        self.path = path
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        # One short-lived connection per call keeps this safe across worker threads
+        if not self._initialized:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        if not self._initialized:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS audit_cache ("
+                " filename TEXT NOT NULL,"
+                " law_name TEXT NOT NULL,"
+                " document_hash TEXT NOT NULL,"
+                " entities_hash TEXT NOT NULL,"
+                " law_hash TEXT NOT NULL,"
+                " prompt_version TEXT NOT NULL,"
+                " finding TEXT NOT NULL,"
+                " audited_at REAL NOT NULL,"
+                " PRIMARY KEY (filename, law_name))"
+            )
+            conn.commit()
+            self._initialized = True
+        return conn
+
+    def get_many(
+        self,
+        filename: str,
+        inputs: Dict[str, AuditInputs]
+    ) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, List[str]]]:
+        """
+        Looks up the verdicts of one file's laws.
+
+        Args:
+            inputs: {law_name: current input hashes}.
+
+        Returns:
+            ({law_name: finding} for laws whose inputs are unchanged,
+             {law_name: changed input names} for laws audited before with other inputs).
+        """
+        if not inputs:
+            return {}, {}
+        try:
+            conn = self._connect()
+            try:
+                placeholders = ",".join("?" * len(inputs))
+                rows = conn.execute(
+                    "SELECT law_name, document_hash, entities_hash, law_hash, prompt_version, finding"
+                    f" FROM audit_cache WHERE filename = ? AND law_name IN ({placeholders})",
+                    (filename, *inputs)
+                ).fetchall()
+            finally:
+                conn.close()
+        except (sqlite3.Error, OSError) as e:
+            print(f"Audit cache unavailable: {e}")
+            return {}, {}
+
+        hits: Dict[str, Dict[str, Any]] = {}
+        stale: Dict[str, List[str]] = {}
+        for law_name, *hashes, finding in rows:
+            changed = inputs[law_name].changed(AuditInputs(*hashes))
+            if changed:
+                stale[law_name] = changed
+            else:
+                hits[law_name] = json.loads(finding)
+        return hits, stale
+
+    def put_many(self, filename: str, entries: Iterable[Tuple[AuditInputs, Dict[str, Any]]]) -> None:
+        """
+        Stores (input hashes, finding) pairs of one file, replacing older verdicts.
+        """
+        now = time.time()
+        rows = [
+            (filename, finding["law_name"], *inputs, json.dumps(finding, ensure_ascii=False), now)
+            for inputs, finding in entries
+        ]
+        if not rows:
+            return
+        try:
+            conn = self._connect()
+            try:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO audit_cache (filename, law_name, document_hash, entities_hash,"
+                    " law_hash, prompt_version, finding, audited_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    rows
+                )
+                conn.commit()
+            finally:
+                conn.close()
+        except (sqlite3.Error, OSError) as e:
+            print(f"Error writing audit cache: {e}")
+
+
+# Global instance
+audit_cache = AuditCache()
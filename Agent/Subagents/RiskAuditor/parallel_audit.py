@@ -0,0 +1,561 @@
+"""
+Parallel per-file risk audit.
+
+The conversational auditor reviews every file in one LLM conversation, so its time and
+prompt grow with the corpus. Here each file is audited in its own LLM call, with at
+most AUDIT_CONCURRENCY calls in flight:
+
+- A call sees only its file: the playbook entities, the compliance entries of the
+  file's laws and the law locator's snippets for each law.
+- It returns one verdict per law (VIOLATION, WARNING, COMPLIANT, NOT FOUND) with the
+  contract text, the issue or assessment and, for risks, a recommendation.
+- Verdicts are matched back to the file's laws by exact name or canonical key. A law
+  missing from the reply, or every law of a file whose call fails or times out, gets a
+  fallback verdict: NOT FOUND when the locator found no mention, WARNING otherwise.
+
+Each law is searched under its researched name and its other spellings (without the
+year, abbreviated, spelled out; see law_name_spellings). Before any call, a rule stage
+decides the mechanical verdicts from the locator results (classify_by_rules): a law
+with no mention under any spelling is NOT FOUND, and a law with no recent amendments
+that the contract mentions by name is COMPLIANT, citing the mention. Only the
+remaining laws go to the model, including those found under another spelling only; a
+file with none makes no call at all.
+
+Model verdicts are cached per (file, law) with hashes of their inputs (see
+audit_cache.py), so a re-run only sends the laws whose document text, playbook
+entities, compliance entry or prompt version changed.
+
+render_report then assembles the executive summary, the per-file sections and the
+recommendations from the verdicts, in compliance_updates.json's file order, so the
+report does not depend on which call finishes first. ParallelAuditAgent runs this as
+the RiskAuditor when AUDIT_MODE=parallel (the default); AUDIT_MODE=llm keeps the
+conversational auditor.
+"""
+import asyncio
+import os
+import re
+from collections import Counter
+from typing import Any, AsyncGenerator, Dict, List, Optional, Tuple
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+from google.genai import types
+
+from ...utils.executors import run_in_thread
+from ...utils.law_names import canonical_law_key, law_name_spellings, law_year
+from ...utils.llm_json import complete_json
+from ...utils.sentence_index import SNIPPET_TOKEN_BUDGET
+from ...utils.text_cache import cache_key
+from .audit_cache import AUDIT_CACHE, AuditInputs, audit_cache
+from .tools import law_names_by_file, load_audit_inputs, locate_laws_across_files, resolve_document_path
+
+AUDIT_MODE = os.getenv("AUDIT_MODE", "parallel").lower()
+AUDIT_REPORT_FILE = "risk_audit_report.md"
+# Per-file LLM calls in flight at once, and the time allowed for each (override via environment)
+AUDIT_CONCURRENCY = int(os.getenv("AUDIT_CONCURRENCY", "4"))
+AUDIT_TIMEOUT = float(os.getenv("AUDIT_TIMEOUT", "120"))
+# Locator snippets shown per law in a file's prompt; the mention count is always given
+AUDIT_SNIPPETS_PER_LAW = int(os.getenv("AUDIT_SNIPPETS_PER_LAW", "3"))
+
+# Verdicts in report order, most severe first
+VERDICTS = ("VIOLATION", "WARNING", "COMPLIANT", "NOT FOUND")
+_VERDICT_ICONS = {"VIOLATION": "🔴", "WARNING": "🟡", "COMPLIANT": "🟢", "NOT FOUND": "⚪"}
+NO_AMENDMENTS = "No recent amendments"
+# Bump when AUDIT_PROMPT or the finding schema changes so cached verdicts are re-audited
+AUDIT_PROMPT_VERSION = "1"
+
+AUDIT_PROMPT = """You are a Legal Risk Auditor. You audit ONE contract file against legal compliance updates.
+
+For each law listed, compare what the contract says (the quoted mentions) with the law's
+description, status and latest change, and choose a verdict:
+- "VIOLATION": the contract contradicts the law or does not meet its new requirements
+- "WARNING": the law is mentioned but the specific requirements are unclear or missing
+- "COMPLIANT": the contract aligns with the current requirements of the law
+- "NOT FOUND": the law is not mentioned in the contract
+
+Return a JSON object:
+{"findings": [{"law_name": "...", "verdict": "...", "contract_text": "...", "explanation": "...", "recommendation": "..."}]}
+
+- One finding per listed law, with law_name copied exactly.
+- contract_text: the most relevant excerpt, copied from the mentions; "" for NOT FOUND.
+- explanation: the issue (VIOLATION, WARNING) or the assessment (COMPLIANT, NOT FOUND). Be
+  specific: cite the contract language against the law's requirements.
+- recommendation: one concrete action for VIOLATION and WARNING; "" otherwise."""
+
+_NON_LETTER = re.compile(r"[^A-Z ]")
+
+
+def _audit_laws(laws: List[Any]) -> List[Dict[str, Any]]:
+    """A file's compliance entries with a law name, first entry per name."""
+    entries: Dict[str, Dict[str, Any]] = {}
+    for law in laws:
+        if isinstance(law, dict) and law.get("law_name"):
+            entries.setdefault(law["law_name"], law)
+    return list(entries.values())
+
+
+def _file_prompt(
+    filename: str,
+    entities: List[str],
+    laws: List[Dict[str, Any]],
+    hits: Dict[str, List[Tuple[int, str]]]
+) -> str:
+    """The user message of one file's audit call."""
+    lines = [f"File: {filename}"]
+    if entities:
+        lines.append(f"Legal entities referenced in the contract: {', '.join(entities)}")
+    lines.append("\nLaws to audit:")
+    for law in laws:
+        law_name = law["law_name"]
+        lines.append(f"\n### {law_name}")
+        for key, label in (("description", "Description"), ("status", "Status"),
+                           ("latest_change", "Latest change"), ("source", "Source")):
+            if law.get(key):
+                lines.append(f"{label}: {law[key]}")
+        mentions = hits.get(law_name, [])
+        if not mentions:
+            lines.append("Contract mentions: none found by text search.")
+            continue
+        lines.append(f"Contract mentions ({len(mentions)}):")
+        for page, snippet in mentions[:AUDIT_SNIPPETS_PER_LAW]:
+            lines.append(f"- Page {page}: ...{snippet}...")
+    return "\n".join(lines)
+
+
+def _findings_from(data: Any) -> Optional[List[Dict[str, Any]]]:
+    """Reads {"findings": [...]} (or a bare list) from a parsed reply; None if unusable."""
+    if isinstance(data, dict):
+        data = data.get("findings")
+    if not isinstance(data, list):
+        return None
+    return [item for item in data if isinstance(item, dict)]
+
+
+def normalize_verdict(value: Any) -> Optional[str]:
+    """Maps "🔴 Violation", "not_found" etc. to one of VERDICTS; None when unrecognized."""
+    verdict = " ".join(_NON_LETTER.sub(" ", str(value or "").upper().replace("_", " ")).split())
+    if verdict == "NOTFOUND":
+        verdict = "NOT FOUND"
+    return verdict if verdict in VERDICTS else None
+
+
+def _not_found_finding(law_name: str, basis: str) -> Dict[str, Any]:
+    return {
+        "law_name": law_name,
+        "verdict": "NOT FOUND",
+        "contract_text": "",
+        "explanation": "Law not mentioned in contract.",
+        "recommendation": "",
+        "basis": basis,
+    }
+
+
+def _is_unamended(status: Any) -> bool:
+    return " ".join(str(status or "").lower().rstrip(".").split()) == NO_AMENDMENTS.lower()
+
+
+def _search_names(compliance_files: Dict[str, List[Any]]) -> Dict[str, List[str]]:
+    """{filename: law names plus their other spellings}, for the locator."""
+    return {
+        filename: list(dict.fromkeys(
+            spelling for law_name in law_names for spelling in (law_name, *law_name_spellings(law_name))
+        ))
+        for filename, law_names in law_names_by_file(compliance_files).items()
+    }
+
+
+def law_mentions(
+    law_name: str,
+    hits: Dict[str, List[Tuple[int, str]]]
+) -> Tuple[List[Tuple[int, str]], List[Tuple[int, str]]]:
+    """
+    Collects a law's locator hits from a file's {spelling: hits}.
+
+    Returns:
+        (mentions of the name itself, those plus the mentions of its other spellings).
+    """
+    exact = hits.get(law_name, [])
+    mentions = list(exact)
+    for spelling in law_name_spellings(law_name):
+        mentions.extend(mention for mention in hits.get(spelling, []) if mention not in mentions)
+    return exact, mentions
+
+
+def classify_by_rules(
+    law: Dict[str, Any],
+    exact: List[Tuple[int, str]],
+    mentions: List[Tuple[int, str]]
+) -> Optional[Dict[str, Any]]:
+    """
+    Decides a law without the model when the locator results settle it:
+
+    - no mention in the document under any spelling: NOT FOUND;
+    - "No recent amendments" and mentioned by name: COMPLIANT, citing the first
+      mention and the pages it occurs on.
+
+    A law found only under another spelling ("ESI Act", an ambiguous "IT Act") is left
+    to the model.
+
+    Args:
+        exact: Mentions of the law's name.
+        mentions: Mentions under any of its spellings (see law_mentions).
+
+    Returns:
+        The finding, or None when the law needs the model.
+    """
+    law_name = law["law_name"]
+    if not mentions:
+        return _not_found_finding(law_name, "rules")
+    if not exact or not _is_unamended(law.get("status")):
+        return None
+    pages = sorted({page for page, _ in exact})
+    return {
+        "law_name": law_name,
+        "verdict": "COMPLIANT",
+        "contract_text": f"...{exact[0][1]}...",
+        "explanation": (
+            "Contract provisions align with current requirements. No recent amendments were "
+            f"identified, and the contract refers to the law {len(exact)} time(s) "
+            f"(page {', '.join(str(page) for page in pages)})."
+        ),
+        "recommendation": "",
+        "basis": "rules",
+    }
+
+
+def fallback_finding(law_name: str, mentions: Optional[List[Tuple[int, str]]], reason: str) -> Dict[str, Any]:
+    """
+    The verdict used when the model gives none: NOT FOUND when the locator searched the
+    document and found no mention, otherwise a WARNING for manual review.
+    """
+    if mentions is not None and not mentions:
+        return _not_found_finding(law_name, "fallback")
+    snippet = mentions[0][1] if mentions else ""
+    return {
+        "law_name": law_name,
+        "verdict": "WARNING",
+        "contract_text": f"...{snippet}..." if snippet else "",
+        "explanation": f"{reason} The contract text must be reviewed manually against the latest changes.",
+        "recommendation": "Review the clauses referring to this law manually.",
+        "basis": "fallback",
+    }
+
+
+def match_findings(
+    laws: List[Dict[str, Any]],
+    proposed: List[Dict[str, Any]],
+    hits: Dict[str, List[Tuple[int, str]]]
+) -> List[Dict[str, Any]]:
+    """
+    Pairs the model's findings with the file's laws, by exact name first and canonical
+    key second. A key match also needs the years to agree, so a "Companies Act, 2013"
+    finding never settles "Companies Act, 1956"; a name without a year matches only
+    when no other law of the file shares its key. Laws without a usable finding get a
+    fallback verdict.
+
+    Returns:
+        One finding per law, in the order of `laws`.
+    """
+    by_name: Dict[str, Dict[str, Any]] = {}
+    by_key: Dict[str, List[Tuple[Optional[str], Dict[str, Any]]]] = {}
+    for item in proposed:
+        name = str(item.get("law_name", ""))
+        if normalize_verdict(item.get("verdict")) is None:
+            continue
+        by_name.setdefault(name, item)
+        by_key.setdefault(canonical_law_key(name), []).append((law_year(name), item))
+
+    laws_per_key = Counter(canonical_law_key(law["law_name"]) for law in laws)
+
+    def by_canonical_key(law_name: str) -> Optional[Dict[str, Any]]:
+        key, year = canonical_law_key(law_name), law_year(law_name)
+        candidates = by_key.get(key, [])
+        for item_year, item in candidates:
+            if item_year == year:
+                return item
+        if laws_per_key[key] == 1:
+            for item_year, item in candidates:
+                if item_year is None or year is None:
+                    return item
+        return None
+
+    findings = []
+    for law in laws:
+        law_name = law["law_name"]
+        item = by_name.get(law_name) or by_canonical_key(law_name)
+        if item is None:
+            findings.append(fallback_finding(law_name, hits.get(law_name, []), "The automated audit returned no verdict for this law."))
+            continue
+        verdict = normalize_verdict(item["verdict"])
+        findings.append({
+            "law_name": law_name,
+            "verdict": verdict,
+            "contract_text": str(item.get("contract_text") or "").strip(),
+            "explanation": str(item.get("explanation") or "").strip(),
+            "recommendation": str(item.get("recommendation") or "").strip() if verdict in ("VIOLATION", "WARNING") else "",
+            "basis": "llm",
+        })
+    return findings
+
+
+async def _audit_file(
+    filename: str,
+    entities: List[str],
+    laws: List[Dict[str, Any]],
+    hits: Dict[str, List[Tuple[int, str]]],
+    semaphore: asyncio.Semaphore
+) -> List[Dict[str, Any]]:
+    """Map step: one LLM call for one file; falls back per law on any failure."""
+    def fallback(reason: str) -> List[Dict[str, Any]]:
+        return [fallback_finding(law["law_name"], hits.get(law["law_name"], []), reason) for law in laws]
+
+    reply = await complete_json(AUDIT_PROMPT, _file_prompt(filename, entities, laws, hits), semaphore, AUDIT_TIMEOUT)
+    proposed = None if reply.error else _findings_from(reply.data)
+    if proposed is None:
+        error = reply.error or "returned an unusable reply"
+        print(f"Audit {error} for {filename}" + (f": {reply.detail}" if reply.detail else ""))
+        return fallback(f"The automated audit {error}.")
+    return match_findings(laws, proposed, hits)
+
+
+def _prompt_version() -> str:
+    """Everything besides the file and law that shapes a model verdict."""
+    return f"{AUDIT_PROMPT_VERSION}:{AUDIT_SNIPPETS_PER_LAW}:{SNIPPET_TOKEN_BUDGET}:{os.getenv('GEMINI_MODEL')}"
+
+
+def _document_key(filename: str) -> Optional[str]:
+    """Text cache key of a document (content hash plus extractor version), if it can be found."""
+    path = resolve_document_path(filename)
+    return cache_key(path) if path else None
+
+
+async def _cached_inputs(filename: str, entities: List[str], laws: List[Dict[str, Any]]) -> Dict[str, AuditInputs]:
+    """{law_name: input hashes} for the audit cache; empty when caching is off or impossible."""
+    if not AUDIT_CACHE:
+        return {}
+    try:
+        document = await run_in_thread(_document_key, filename)
+    except OSError as e:
+        print(f"Audit cache skipped for {filename}: {e}")
+        return {}
+    if not document:
+        return {}
+    prompt_version = _prompt_version()
+    return {law["law_name"]: AuditInputs.of(document, entities, law, prompt_version) for law in laws}
+
+
+async def audit_files(
+    playbook_files: Dict[str, List[str]],
+    compliance_files: Dict[str, List[Any]],
+    law_hits: Dict[str, Any]
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Audits every file concurrently: laws the rules settle are decided locally, cached
+    verdicts with unchanged inputs are reused, and each file with laws left gets one
+    model call for those.
+
+    Args:
+        playbook_files: {filename: legal_entities}.
+        compliance_files: {filename: compliance entries}.
+        law_hits: {filename: {spelling: [(page, snippet)]}} from locate_laws_across_files
+            over the laws' spellings, or an error message for a file that could not be
+            searched.
+
+    Returns:
+        {filename: findings}, in the order of `compliance_files`.
+    """
+    semaphore = asyncio.Semaphore(max(1, AUDIT_CONCURRENCY))
+
+    async def audit(filename: str) -> List[Dict[str, Any]]:
+        laws = _audit_laws(compliance_files[filename])
+        if not laws:
+            return []
+        hits = law_hits.get(filename)
+        if isinstance(hits, str):
+            # Nothing for the model to compare without the document text
+            return [fallback_finding(law["law_name"], None, f"The document could not be searched ({hits}).") for law in laws]
+        hits = hits or {}
+
+        decided = {}
+        mentions = {}
+        for law in laws:
+            exact, mentions[law["law_name"]] = law_mentions(law["law_name"], hits)
+            finding = classify_by_rules(law, exact, mentions[law["law_name"]])
+            if finding is not None:
+                decided[law["law_name"]] = finding
+        ambiguous = [law for law in laws if law["law_name"] not in decided]
+        if not ambiguous:
+            return [decided[law["law_name"]] for law in laws]
+
+        entities = playbook_files.get(filename, [])
+        inputs = await _cached_inputs(filename, entities, ambiguous)
+        cached, stale = await run_in_thread(audit_cache.get_many, filename, inputs)
+        if stale:
+            changed = sorted({name for names in stale.values() for name in names})
+            print(f"Re-auditing {len(stale)} laws in {filename} (changed: {', '.join(changed)})")
+        for law_name, finding in cached.items():
+            decided[law_name] = dict(finding, basis="cache")
+
+        pending = [law for law in ambiguous if law["law_name"] not in cached]
+        if pending:
+            fresh = await _audit_file(filename, entities, pending, mentions, semaphore)
+            for finding in fresh:
+                decided[finding["law_name"]] = finding
+            await run_in_thread(audit_cache.put_many, filename, [
+                (inputs[finding["law_name"]], finding)
+                for finding in fresh
+                if finding["basis"] == "llm" and finding["law_name"] in inputs
+            ])
+        return [decided[law["law_name"]] for law in laws]
+
+    results = await asyncio.gather(*(audit(filename) for filename in compliance_files))
+    return dict(zip(compliance_files, results))
+
+
+def _quote(text: str) -> str:
+    text = text.strip()
+    if len(text) >= 2 and text[0] == text[-1] == '"':
+        return text
+    return f'"{text}"'
+
+
+def _render_finding(finding: Dict[str, Any], law: Dict[str, Any]) -> List[str]:
+    verdict = finding["verdict"]
+    status = law.get("status") or "Unknown"
+    lines = [f"#### {_VERDICT_ICONS[verdict]} {verdict}: {finding['law_name']}"]
+    lines.append(f"**Law Description**: {law.get('description') or 'Not available'}")
+    lines.append(f"**Status**: {status}")
+    if law.get("latest_change") and status != NO_AMENDMENTS:
+        lines.append(f"**Latest Change (2024-2025)**: {law['latest_change']}")
+    if finding["contract_text"]:
+        lines.append(f"**Contract Text**: {_quote(finding['contract_text'])}")
+    elif verdict == "NOT FOUND":
+        lines.append("**Contract Text**: Not found in document.")
+    else:
+        lines.append("**Contract Text**: Not available.")
+    label = "Issue" if verdict in ("VIOLATION", "WARNING") else "Assessment"
+    lines.append(f"**{label}**: {finding['explanation'] or 'No details provided.'}")
+    if verdict in ("VIOLATION", "WARNING") and law.get("source"):
+        lines.append(f"**Source**: {law['source']}")
+    return lines
+
+
+def render_report(compliance_files: Dict[str, List[Any]], findings: Dict[str, List[Dict[str, Any]]]) -> str:
+    """
+    Assembles risk_audit_report.md from per-file findings: executive summary, one
+    section per file with findings ordered by severity, then recommendations.
+    """
+    all_findings = [f for file_findings in findings.values() for f in file_findings]
+    counts = {verdict: sum(1 for f in all_findings if f["verdict"] == verdict) for verdict in VERDICTS}
+
+    lines = [
+        "# Legal Risk Audit Report",
+        "",
+        "## Executive Summary",
+        f"- Total Files Audited: {len(findings)}",
+        f"- Total Laws Checked: {len(all_findings)}",
+        f"- Violations Found: {counts['VIOLATION']}",
+        f"- Warnings: {counts['WARNING']}",
+        "",
+        "---",
+        "",
+        "## Detailed Findings by File",
+    ]
+    for filename, file_findings in findings.items():
+        laws = {law["law_name"]: law for law in _audit_laws(compliance_files.get(filename, []))}
+        lines += ["", f"### File: {filename}"]
+        if not file_findings:
+            lines += ["", "No laws were researched for this file."]
+        for finding in sorted(file_findings, key=lambda f: VERDICTS.index(f["verdict"])):
+            lines.append("")
+            lines += _render_finding(finding, laws.get(finding["law_name"], {}))
+        lines += ["", "---"]
+
+    recommendations = [
+        f"**{finding['law_name']} ({filename})**: {finding['recommendation']}"
+        for verdict in ("VIOLATION", "WARNING")
+        for filename, file_findings in findings.items()
+        for finding in file_findings
+        if finding["verdict"] == verdict and finding["recommendation"]
+    ]
+    if not counts["VIOLATION"] and not counts["WARNING"]:
+        recommendations.append("**No Immediate Action**: No violations or warnings were found in the audited files.")
+    recommendations.append(
+        "**Regular Compliance Checks**: Re-run the audit whenever new legal compliance updates "
+        "are researched, to identify and mitigate risks early."
+    )
+    lines += ["", "## Recommendations"]
+    lines += [f"{i}.  {item}" for i, item in enumerate(recommendations, 1)]
+    return "\n".join(lines) + "\n"
+
+
+def summarize_audit(findings: Dict[str, List[Dict[str, Any]]]) -> str:
+    all_findings = [f for file_findings in findings.values() for f in file_findings]
+    counts = ", ".join(
+        f"{sum(1 for f in all_findings if f['verdict'] == verdict)} {verdict.lower()}"
+        for verdict in VERDICTS
+    )
+    by_rules = sum(1 for f in all_findings if f.get("basis") == "rules")
+    from_cache = sum(1 for f in all_findings if f.get("basis") == "cache")
+    return (
+        f"Audited {len(all_findings)} laws across {len(findings)} files ({counts}); "
+        f"{by_rules} decided by rules, {from_cache} reused from the audit cache."
+    )
+
+
+async def run_audit(state: Any) -> Tuple[str, Dict[str, Any]]:
+    """
+    Loads the audit inputs, locates every law in its file, audits the files in parallel
+    and writes the report.
+
+    Returns:
+        (message for the user, state delta).
+
+    Raises:
+        ValueError: When the playbook or compliance updates are missing or malformed.
+    """
+    playbook_files, compliance_files = load_audit_inputs(state)
+    law_hits = await locate_laws_across_files(_search_names(compliance_files))
+    findings = await audit_files(playbook_files, compliance_files, law_hits)
+
+    message = summarize_audit(findings)
+    try:
+        with open(AUDIT_REPORT_FILE, "w") as f:
+            f.write(render_report(compliance_files, findings))
+        message = f"Risk audit complete. Report saved to {AUDIT_REPORT_FILE}. {message}"
+    except Exception as e:
+        message = f"Error saving report: {str(e)}. {message}"
+
+    state_delta = {
+        "auditor:playbook_files": playbook_files,
+        "auditor:compliance_files": compliance_files,
+        "auditor:law_contexts": {
+            filename: {
+                law_name: [{"page": page, "snippet": snippet} for page, snippet in law_mentions(law_name, hits)[1]]
+                for law_name in law_names_by_file(compliance_files).get(filename, [])
+            }
+            for filename, hits in law_hits.items()
+            if isinstance(hits, dict)
+        },
+        "auditor:findings": findings,
+    }
+    return message, state_delta
+
+
+class ParallelAuditAgent(BaseAgent):
+    """RiskAuditor that audits each file in its own parallel LLM call and assembles the report by rules."""
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        try:
+            message, state_delta = await run_audit(ctx.session.state)
+        except ValueError as e:
+            message, state_delta = f"Error: {e}", {}
+        print(message)
+
+        yield Event(
+            author=self.name,
+            invocation_id=ctx.invocation_id,
+            content=types.Content(role="model", parts=[types.Part(text=message)]),
+            actions=EventActions(state_delta=state_delta)
+        )
@@ -1,86 +1,120 @@
-from typing import List
+from typing import Dict, List, Optional, Tuple, Union
+import asyncio
 import json
 import os
-import PyPDF2
 from google.adk.tools.tool_context import ToolContext
 
-async def fetch_audit_context(tool_context: ToolContext) -> str:
+from ...utils.budget import fair_shares
+from ...utils.executors import run_in_thread
+from ...utils.law_locator import locate_laws_in_file
+from ...utils.sentence_index import SNIPPET_TOKEN_BUDGET
+
+# Size budget of the corpus-wide context block, in characters (override via environment)
+AUDIT_CONTEXT_MAX_CHARS = int(os.getenv("AUDIT_CONTEXT_MAX_CHARS", "60000"))
+# Snippets shown per law in the corpus-wide block; the hit count is always reported
+AUDIT_CONTEXT_SNIPPETS_PER_LAW = int(os.getenv("AUDIT_CONTEXT_SNIPPETS_PER_LAW", "2"))
+
+def resolve_document_path(filename: str) -> Optional[str]:
     """
-    Loads the dynamic_playbook.json and compliance_updates.json to prepare for audit.
-    Returns a human-readable summary of both datasets organized by filename.
+    Finds a document by filename in 'DB', 'input_pdfs' or the current directory.
+    """
+    potential_paths = [
+        os.path.join("DB", filename),
+        os.path.join("input_pdfs", filename),
+        filename
+    ]
+    for p in potential_paths:
+        if os.path.exists(p):
+            return p
+    return None
+
+def load_audit_inputs(state) -> Tuple[Dict[str, List[str]], Dict[str, List[dict]]]:
     """
+    Reads the playbook (session state, else dynamic_playbook.json) and compliance_updates.json.
     
+    Returns:
+        ({filename: legal_entities}, {filename: laws}), files in file order.
+    
+    Raises:
+        ValueError: With a user-facing message when an input is missing or malformed.
+    """
     # 1. Load Dynamic Playbook (Contract Clauses)
-    playbook_data = tool_context.state.get("clausehunter:playbook")
+    playbook_data = state.get("clausehunter:playbook")
     if not playbook_data:
         try:
             with open("dynamic_playbook.json", "r") as f:
                 playbook_data = json.load(f)
         except FileNotFoundError:
-            return "Error: 'dynamic_playbook.json' not found. Run ClauseHunter first."
+            raise ValueError("'dynamic_playbook.json' not found. Run ClauseHunter first.")
         except Exception as e:
-            return f"Error reading playbook: {str(e)}"
+            raise ValueError(f"Error reading playbook: {str(e)}")
     
     if not playbook_data:
-        return "Error: Playbook is empty."
+        raise ValueError("Playbook is empty.")
     
     # 2. Load Compliance Updates (Legal Research Results)
     try:
         with open("compliance_updates.json", "r") as f:
             compliance_data = json.load(f)
     except FileNotFoundError:
-        return "Error: 'compliance_updates.json' not found. Run Researcher first."
+        raise ValueError("'compliance_updates.json' not found. Run Researcher first.")
     except Exception as e:
-        return f"Error reading compliance updates: {str(e)}"
+        raise ValueError(f"Error reading compliance updates: {str(e)}")
     
     if not compliance_data:
-        return "Error: Compliance updates file is empty."
+        raise ValueError("Compliance updates file is empty.")
+    
+    # Playbook structure: {"playbook": [{"filename": "...", "legal_entities": [...]}]}
+    if not (isinstance(playbook_data, dict) and "playbook" in playbook_data):
+        raise ValueError("Unexpected playbook format. Expected new structure with 'playbook' key.")
+    playbook_files = {}
+    for entry in playbook_data.get("playbook", []):
+        if isinstance(entry, dict):
+            playbook_files[entry.get("filename", "Unknown")] = entry.get("legal_entities", [])
+    
+    # Compliance structure: [{"filename": "...", "laws": [{"law_name": "...", ...}]}]
+    if not isinstance(compliance_data, list):
+        raise ValueError("Unexpected compliance format. Expected array of file entries.")
+    compliance_files = {}
+    for entry in compliance_data:
+        if isinstance(entry, dict):
+            compliance_files[entry.get("filename", "Unknown")] = entry.get("laws", [])
+    
+    return playbook_files, compliance_files
+
+async def fetch_audit_context(tool_context: ToolContext) -> str:
+    """
+    Loads the dynamic_playbook.json and compliance_updates.json to prepare for audit.
+    Returns a human-readable summary of both datasets organized by filename.
+    """
+    try:
+        playbook_files, compliance_files = load_audit_inputs(tool_context.state)
+    except ValueError as e:
+        return f"Error: {e}"
     
     # Build human-readable summary
     summary = "## Audit Context Loaded\n\n"
     
-    # Parse Playbook (New Structure: {"playbook": [{"filename": "...", "legal_entities": [...]}]})
     summary += "### Contract Playbook (What's in the documents)\n\n"
-    playbook_files = {}
+    for filename, entities in playbook_files.items():
+        summary += f"**{filename}**: {len(entities)} legal entities\n"
+        if entities:
+            summary += f"  - {', '.join(entities[:5])}"
+            if len(entities) > 5:
+                summary += f" ... (and {len(entities) - 5} more)"
+            summary += "\n"
+        summary += "\n"
     
-    if isinstance(playbook_data, dict) and "playbook" in playbook_data:
-        for entry in playbook_data.get("playbook", []):
-            if isinstance(entry, dict):
-                filename = entry.get("filename", "Unknown")
-                entities = entry.get("legal_entities", [])
-                playbook_files[filename] = entities
-                
-                summary += f"**{filename}**: {len(entities)} legal entities\n"
-                if entities:
-                    summary += f"  - {', '.join(entities[:5])}"
-                    if len(entities) > 5:
-                        summary += f" ... (and {len(entities) - 5} more)"
-                    summary += "\n"
-                summary += "\n"
-    else:
-        return "Error: Unexpected playbook format. Expected new structure with 'playbook' key."
-    
-    # Parse Compliance Updates (New Structure: [{"filename": "...", "laws": [{"law_name": "...", ...}]}])
     summary += "### Compliance Updates (Legal research findings)\n\n"
-    compliance_files = {}
-    
-    if isinstance(compliance_data, list):
-        for entry in compliance_data:
-            if isinstance(entry, dict):
-                filename = entry.get("filename", "Unknown")
-                laws = entry.get("laws", [])
-                compliance_files[filename] = laws
-                
-                summary += f"**{filename}**: {len(laws)} laws researched\n"
-                for law in laws[:3]:  # Show first 3
-                    law_name = law.get("law_name", "Unknown")
-                    status = law.get("status", "Unknown")
-                    summary += f"  - {law_name}: {status}\n"
-                if len(laws) > 3:
-                    summary += f"  ... (and {len(laws) - 3} more)\n"
-                summary += "\n"
-    else:
-        return "Error: Unexpected compliance format. Expected array of file entries."
+    for filename, laws in compliance_files.items():
+        summary += f"**{filename}**: {len(laws)} laws researched\n"
+        for law in laws[:3]:  # Show first 3
+            law_name = law.get("law_name", "Unknown")
+            status = law.get("status", "Unknown")
+            summary += f"  - {law_name}: {status}\n"
+        if len(laws) > 3:
+            summary += f"  ... (and {len(laws) - 3} more)\n"
+        summary += "\n"
     
     # Store in session state for later use
     tool_context.state["auditor:playbook_files"] = playbook_files
@@ -103,41 +137,20 @@ async def fetch_law_context_from_document(tool_context: ToolContext, law_name: s
     Returns:
         Human-readable string with context snippets where the law is mentioned.
     """
-    # Construct path: Check 'DB', 'input_pdfs', and current dir
-    potential_paths = [
-        os.path.join("DB", filename),
-        os.path.join("input_pdfs", filename),
-        filename
-    ]
-    
-    file_path = None
-    for p in potential_paths:
-        if os.path.exists(p):
-            file_path = p
-            break
-            
+    file_path = resolve_document_path(filename)
     if not file_path:
         return f"Error: File '{filename}' not found in DB, input_pdfs, or current directory."
             
-    extracted_context = []
-    
     try:
-        reader = PyPDF2.PdfReader(file_path)
-        for i, page in enumerate(reader.pages):
-            text = page.extract_text()
-            if not text: 
-                continue
-                
-            # Simple keyword search (Case Insensitive)
-            if law_name.lower() in text.lower():
-                # Extract the specific paragraph (Naive splitting by newline or period)
-                # For better context, we get the surrounding characters
-                start_idx = text.lower().find(law_name.lower())
-                # Grab 200 chars before and after
-                start = max(0, start_idx - 200)
-                end = min(len(text), start_idx + 300)
-                snippet = text[start:end].replace("\n", " ")
-                extracted_context.append(f"**Page {i+1}**: ...{snippet}...")
+        # Indexing, matching and the first snippet (which builds the sentence index) all
+        # run off the event loop
+        hits = await run_in_thread(locate_laws_in_file, file_path, [law_name], 2 * SNIPPET_TOKEN_BUDGET)
+        
+        # Case-insensitive match; each occurrence with its enclosing sentences
+        extracted_context = [
+            f"**Page {page}**: ...{snippet}..."
+            for page, snippet in hits.get(law_name, [])
+        ]
                 
         if not extracted_context:
             return f"Law '{law_name}' not found in the text of '{filename}'."
@@ -179,57 +192,31 @@ async def fetch_all_laws_from_file(tool_context: ToolContext, filename: str, law
     Returns:
         Human-readable string with context for ALL laws found in the document.
     """
-    # Construct path: Check 'DB', 'input_pdfs', and current dir
-    potential_paths = [
-        os.path.join("DB", filename),
-        os.path.join("input_pdfs", filename),
-        filename
-    ]
-    
-    file_path = None
-    for p in potential_paths:
-        if os.path.exists(p):
-            file_path = p
-            break
-            
+    file_path = resolve_document_path(filename)
     if not file_path:
         return f"Error: File '{filename}' not found in DB, input_pdfs, or current directory."
     
-    # Read entire PDF once
+    # One automaton over all law names, one pass over each (once lower-cased) page,
+    # with the snippets built on the thread pool as well
     try:
-        reader = PyPDF2.PdfReader(file_path)
-        page_texts = []
-        
-        for i, page in enumerate(reader.pages):
-            text = page.extract_text()
-            if text:
-                page_texts.append((i+1, text))
-        
-        if not page_texts:
+        try:
+            hits = await run_in_thread(locate_laws_in_file, file_path, law_names)
+        except ValueError:
             return f"Error: Could not extract text from '{filename}'."
         
-        # Search for each law
+        law_contexts = {
+            law_name: [f"  - **Page {page}**: ...{snippet}..." for page, snippet in matches]
+            for law_name, matches in hits.items()
+        }
+        
         results = []
         results.append(f"## Batch Law Context Search in '{filename}'\n\n")
         results.append(f"Searching for {len(law_names)} laws...\n\n")
         
         for law_name in law_names:
-            law_found = False
-            law_contexts = []
-            
-            for page_num, text in page_texts:
-                if law_name.lower() in text.lower():
-                    law_found = True
-                    # Extract context
-                    start_idx = text.lower().find(law_name.lower())
-                    start = max(0, start_idx - 150)
-                    end = min(len(text), start_idx + 250)
-                    snippet = text[start:end].replace("\n", " ")
-                    law_contexts.append(f"  - **Page {page_num}**: ...{snippet}...")
-            
-            if law_found:
+            if law_contexts.get(law_name):
                 results.append(f"### ✅ {law_name}\n")
-                results.append("\n".join(law_contexts))
+                results.append("\n".join(law_contexts[law_name]))
                 results.append("\n\n")
             else:
                 results.append(f"### ❌ {law_name}\n")
@@ -239,3 +226,104 @@ async def fetch_all_laws_from_file(tool_context: ToolContext, filename: str, law
         
     except Exception as e:
         return f"Error reading PDF: {str(e)}"
+
+def _fit_to_budget(blocks: List[str], budget: int) -> List[str]:
+    """
+    Shares a character budget fairly between blocks (see utils.budget.fair_shares):
+    blocks smaller than their share are kept whole, and the rest are cut.
+    """
+    limits = fair_shares([len(block) for block in blocks], budget)
+    marker = "\n... (truncated to fit context budget)\n\n"
+    fitted = []
+    for i, block in enumerate(blocks):
+        if len(block) <= limits[i]:
+            fitted.append(block)
+        else:
+            fitted.append(block[:max(0, limits[i] - len(marker))] + marker)
+    return fitted
+
+def law_names_by_file(compliance_files: Dict[str, List[dict]]) -> Dict[str, List[str]]:
+    """{filename: law names} for every file with at least one researched law."""
+    requests = {}
+    for filename, laws in compliance_files.items():
+        law_names = [law.get("law_name") for law in laws if isinstance(law, dict) and law.get("law_name")]
+        if law_names:
+            requests[filename] = law_names
+    return requests
+
+async def locate_laws_across_files(
+    requests: Dict[str, List[str]]
+) -> Dict[str, Union[Dict[str, List[Tuple[int, str]]], str]]:
+    """
+    Searches every file for its law names concurrently on the shared thread pool, so
+    every lookup goes through this process's DocumentIndex cache and repeated searches
+    of a file reuse its index.
+    
+    Args:
+        requests: {filename: law names}.
+    
+    Returns:
+        {filename: {law_name: [(page, snippet)]}} in request order; an error message
+        instead of the hits for a file that could not be found or read.
+    """
+    async def search(filename: str, law_names: List[str]):
+        file_path = resolve_document_path(filename)
+        if not file_path:
+            return f"File '{filename}' not found in DB, input_pdfs, or current directory."
+        try:
+            return await run_in_thread(locate_laws_in_file, file_path, law_names)
+        except Exception as e:
+            return f"Error reading PDF: {str(e)}"
+    
+    found = await asyncio.gather(*(search(f, names) for f, names in requests.items()))
+    return dict(zip(requests, found))
+
+async def fetch_laws_across_files(tool_context: ToolContext) -> str:
+    """
+    CORPUS VERSION: Searches every file for all of its researched laws in one call.
+    Reads the {filename: laws} map loaded by fetch_audit_context and searches all files
+    concurrently (see locate_laws_across_files). Returns one compact context block for
+    the whole corpus, kept within a size budget.
+    
+    Returns:
+        Human-readable context for every law in every file, grouped by file.
+    """
+    compliance_files = tool_context.state.get("auditor:compliance_files")
+    if not compliance_files:
+        return "Error: No compliance data loaded. Call fetch_audit_context() first."
+    
+    requests = law_names_by_file(compliance_files)
+    found = await locate_laws_across_files(requests)
+    
+    law_contexts: Dict[str, Dict[str, List[dict]]] = {}
+    blocks = []
+    for (filename, law_names), result in zip(requests.items(), found.values()):
+        block = [f"### File: {filename}\n"]
+        if isinstance(result, str):
+            block.append(f"Error: {result}\n\n")
+            blocks.append("".join(block))
+            continue
+        
+        law_contexts[filename] = {
+            law_name: [{"page": page, "snippet": snippet} for page, snippet in hits]
+            for law_name, hits in result.items()
+        }
+        for law_name in law_names:
+            hits = result.get(law_name, [])
+            if not hits:
+                block.append(f"❌ {law_name}: Not found in document.\n")
+                continue
+            block.append(f"✅ {law_name} ({len(hits)} mentions)\n")
+            for page, snippet in hits[:AUDIT_CONTEXT_SNIPPETS_PER_LAW]:
+                block.append(f"  - **Page {page}**: ...{snippet}...\n")
+        block.append("\n")
+        blocks.append("".join(block))
+    
+    # Full results stay in state; the returned block is budgeted for the prompt
+    tool_context.state["auditor:law_contexts"] = law_contexts
+    
+    header = (
+        f"## Corpus Law Context Search\n\n"
+        f"Searched {sum(len(v) for v in requests.values())} laws across {len(requests)} files.\n\n"
+    )
+    return header + "".join(_fit_to_budget(blocks, AUDIT_CONTEXT_MAX_CHARS - len(header)))
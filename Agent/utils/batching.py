@@ -0,0 +1,129 @@
+"""
+Dynamic micro-batching for model inference.
+
+Concurrent callers submit their inputs to a shared MicroBatcher; a single worker thread
+drains the queue into batches of up to `max_batch_size` items, waiting at most
+`max_wait_ms` for a batch to fill, runs the model once per batch and hands each caller
+back the results for its own inputs, in order.
+"""
+import asyncio
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, List, Optional, Sequence
+
+
+class _Request:
+    """One caller's submission: collects results until every item is done."""
+
+    def __init__(self, size: int):
+        self.future: Future = Future()
+        self.results: List[Any] = [None] * size
+        self.remaining = size
+        self.lock = threading.Lock()
+
+    def set_result(self, index: int, result: Any) -> None:
+        with self.lock:
+            if self.future.done():
+                return
+            self.results[index] = result
+            self.remaining -= 1
+            done = self.remaining == 0
+        if done:
+            self.future.set_result(self.results)
+
+    def set_exception(self, error: BaseException) -> None:
+        with self.lock:
+            if self.future.done():
+                return
+        self.future.set_exception(error)
+
+
+class MicroBatcher:
+    """Combines inputs from concurrent callers into model batches."""
+
+    def __init__(
+        self,
+        predict_fn: Callable[[List[Any]], List[Any]],
+        max_batch_size: int = 8,
+        max_wait_ms: float = 10.0,
+        name: str = "batcher"
+    ):
+        """
+        Args:
+            predict_fn: Runs the model on a list of inputs, returning one result per input.
+            max_batch_size: Largest batch passed to predict_fn.
+            max_wait_ms: How long the worker waits for more inputs once a batch has started.
+            name: Used in the worker thread name and log messages.
+        """
+        self.predict_fn = predict_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_ms = max_wait_ms
+        self.name = name
+        # Items are (input, request, index)
+        self._queue: "queue.Queue" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def _ensure_worker(self) -> None:
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name=f"{self.name}-worker", daemon=True)
+                self._worker.start()
+
+    def submit(self, inputs: Sequence[Any]) -> Future:
+        """
+        Queues inputs for inference.
+
+        Returns:
+            A Future resolving to the list of results for `inputs`, in order. If the batch
+            holding any of the inputs fails, the Future raises that batch's exception.
+        """
+        request = _Request(len(inputs))
+        if not inputs:
+            request.future.set_result([])
+            return request.future
+        self._ensure_worker()
+        for index, item in enumerate(inputs):
+            self._queue.put((item, request, index))
+        return request.future
+
+    async def predict(self, inputs: Sequence[Any]) -> List[Any]:
+        """
+        Async wrapper around submit() for use from tools running on the event loop.
+        """
+        return await asyncio.wrap_future(self.submit(inputs))
+
+    def _collect_batch(self) -> list:
+        """Blocks for the first item, then gathers more until the batch is full or the wait expires."""
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait_ms / 1000
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - time.monotonic()
+            try:
+                if timeout <= 0:
+                    batch.append(self._queue.get_nowait())
+                else:
+                    batch.append(self._queue.get(timeout=timeout))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect_batch()
+            # Skip inputs whose request already failed in an earlier batch
+            batch = [entry for entry in batch if not entry[1].future.done()]
+            if not batch:
+                continue
+            try:
+                results = self.predict_fn([item for item, _, _ in batch])
+                if len(results) != len(batch):
+                    raise RuntimeError(f"{self.name}: model returned {len(results)} results for {len(batch)} inputs")
+            except Exception as e:
+                for _, request, _ in batch:
+                    request.set_exception(e)
+                continue
+            for (_, request, index), result in zip(batch, results):
+                request.set_result(index, result)
@@ -0,0 +1,40 @@
+"""
+Fair sharing of a size budget between parts that compete for it.
+
+Prompt context is assembled from several parts (laws, files) that each want some
+amount of a fixed budget, in tokens or characters. Both the research compaction and
+the auditor's corpus-wide context split it the same way, by water-filling: parts that
+want less than an equal share get everything they asked for, and what they leave over
+is split evenly among the rest.
+"""
+from typing import List
+
+
+def fair_shares(demands: List[int], budget: int) -> List[int]:
+    """
+    Splits a budget between demands by water-filling.
+
+    Args:
+        demands: Size each part would take in full.
+        budget: Total size allowed.
+
+    Returns:
+        Share per part, in the order of `demands`: the demand itself when everything
+        fits or the demand is below the equal share, otherwise the equal share of
+        what the smaller demands left.
+    """
+    shares = list(demands)
+    if sum(demands) <= budget:
+        return shares
+    remaining = budget
+    pending = sorted(range(len(demands)), key=lambda i: demands[i])
+    while pending:
+        share = remaining // len(pending)
+        i = pending[0]
+        if demands[i] > share:
+            for j in pending:
+                shares[j] = share
+            break
+        remaining -= demands[i]
+        pending.pop(0)
+    return shares
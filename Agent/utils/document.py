@@ -0,0 +1,175 @@
+"""
+Streaming document model.
+
+A Document yields a PDF's pages (or fixed-size overlapping text windows) lazily, from
+the text cache when available and straight from PyPDF2 otherwise, so extractors never
+need to hold the whole document as one string.
+"""
+import os
+import re
+from typing import Iterator, Optional, Tuple
+
+import PyPDF2
+
+from .sentences import count_words, sentence_spans, split_by_words
+from .text_cache import cache_key, cache_pages_through, iter_cached_pages
+
+# Default sliding-window size and overlap, in characters
+DEFAULT_WINDOW_CHARS = 4000
+DEFAULT_WINDOW_OVERLAP = 400
+
+# A run-on "sentence" longer than this is flushed rather than buffered across pages
+_MAX_PENDING_CHARS = 20000
+
+_BLANK_LINE_END = re.compile(r"\n\s*\n\s*$")
+
+
+class Document:
+    """Lazy, page-streaming view over a PDF file."""
+
+    def __init__(self, pdf_path: str):
+        self.path = pdf_path
+        self.filename = os.path.basename(pdf_path)
+        self._key: Optional[str] = None
+
+    @property
+    def key(self) -> str:
+        """Text cache key (content hash + extractor version)."""
+        if self._key is None:
+            self._key = cache_key(self.path)
+        return self._key
+
+    def _extract_pages(self) -> Iterator[str]:
+        reader = PyPDF2.PdfReader(self.path)
+        for page in reader.pages:
+            yield page.extract_text() or ""
+
+    def pages(self) -> Iterator[Tuple[int, str]]:
+        """
+        Yields (page_number, text) pairs, 1-based, one page at a time.
+        A cache miss extracts with PyPDF2 and writes through to the cache.
+        """
+        cached = iter_cached_pages(self.key)
+        source = cached if cached is not None else cache_pages_through(self.key, self._extract_pages())
+        for page_number, text in enumerate(source, 1):
+            yield page_number, text
+
+    def windows(self, size: int = DEFAULT_WINDOW_CHARS, overlap: int = DEFAULT_WINDOW_OVERLAP) -> Iterator[Tuple[int, str]]:
+        """
+        Yields (offset, text) windows of at most `size` characters over the document
+        text (pages joined by newlines), each overlapping the previous by `overlap`.
+        Offsets are positions in the full document text. Memory use is bounded by
+        the window size plus one page.
+        """
+        if overlap >= size:
+            raise ValueError("Window overlap must be smaller than the window size.")
+
+        step = size - overlap
+        buffer = ""
+        buffer_start = 0
+        emitted = False
+
+        for _, page_text in self.pages():
+            buffer += page_text + "\n"
+            while len(buffer) >= size:
+                yield buffer_start, buffer[:size]
+                emitted = True
+                buffer = buffer[step:]
+                buffer_start += step
+
+        # Tail: skip it when it only repeats the overlap of the last window
+        if buffer.strip() and (not emitted or len(buffer) > overlap):
+            yield buffer_start, buffer
+
+    def sentences(self) -> Iterator[Tuple[int, str]]:
+        """
+        Yields (offset, sentence) pairs over the document text, streaming page by page.
+        Sentences may span pages; consecutive sentences are contiguous in the text.
+        """
+        pending = ""
+        pending_start = 0
+        for _, page_text in self.pages():
+            pending += page_text + "\n"
+            spans = sentence_spans(pending)
+            # The last sentence may continue on the next page
+            for start, end in spans[:-1]:
+                yield pending_start + start, pending[start:end]
+            cut = spans[-1][0] if spans else 0
+            if len(pending) - cut > _MAX_PENDING_CHARS:
+                cut = len(pending)
+                yield pending_start + spans[-1][0], pending[spans[-1][0]:]
+            pending = pending[cut:]
+            pending_start += cut
+        if pending:
+            yield pending_start, pending
+
+    def sentence_windows(self, max_words: int = 250, overlap_sentences: int = 1) -> Iterator[Tuple[int, str]]:
+        """
+        Yields (offset, text) windows made of whole sentences, each holding at most
+        `max_words` words and repeating the last `overlap_sentences` sentences of the
+        previous window. Sentences longer than a window are split on word boundaries.
+        Suited to models with a token limit, such as GLiNER.
+        """
+        # Entries are (offset, text, word_count); entries are contiguous in the document
+        window = []
+        words = 0
+        fresh = False
+
+        for offset, sentence in self.sentences():
+            sentence_words = count_words(sentence)
+            if sentence_words == 0:
+                # Pure whitespace: attach to the previous sentence to keep the window contiguous
+                if window:
+                    prev_offset, prev_text, prev_words = window[-1]
+                    window[-1] = (prev_offset, prev_text + sentence, prev_words)
+                continue
+
+            if sentence_words > max_words:
+                pieces = [(offset + a, sentence[a:b]) for a, b in split_by_words(sentence, max_words)]
+            else:
+                pieces = [(offset, sentence)]
+
+            for piece_offset, piece in pieces:
+                piece_words = count_words(piece)
+                if window and words + piece_words > max_words:
+                    yield window[0][0], "".join(text for _, text, _ in window)
+                    carry = window[-overlap_sentences:] if overlap_sentences > 0 else []
+                    while carry and sum(w for _, _, w in carry) + piece_words > max_words:
+                        carry = carry[1:]
+                    window = list(carry)
+                    words = sum(w for _, _, w in window)
+                    fresh = False
+                window.append((piece_offset, piece, piece_words))
+                words += piece_words
+                fresh = True
+
+        if window and fresh:
+            yield window[0][0], "".join(text for _, text, _ in window)
+
+    def paragraphs(self, max_chars: int = 2000) -> Iterator[Tuple[int, str]]:
+        """
+        Yields (offset, text) chunks of whole sentences that end at a paragraph break
+        (blank line) or before growing past `max_chars`. A single sentence longer than
+        `max_chars` becomes its own chunk. Suited to spaCy's nlp.pipe.
+        """
+        chunk = ""
+        chunk_start = 0
+        for offset, sentence in self.sentences():
+            if chunk and len(chunk) + len(sentence) > max_chars:
+                yield chunk_start, chunk
+                chunk = ""
+            if not chunk:
+                chunk_start = offset
+            chunk += sentence
+            if _BLANK_LINE_END.search(sentence):
+                yield chunk_start, chunk
+                chunk = ""
+        if chunk.strip():
+            yield chunk_start, chunk
+
+    def text(self) -> str:
+        """
+        Returns the full document text. Prefer pages() or windows() for large files;
+        this materializes everything in memory.
+        """
+        return "".join(page_text + "\n" for _, page_text in self.pages())
@@ -0,0 +1,80 @@
+"""
+Shared executors for offloading blocking work from the event loop.
+
+Extractor tools are `async def` but do CPU-heavy or blocking work. Running that work
+directly holds the event loop, so ParallelAgent branches end up running one after
+the other. Tools hand their work to these pools instead:
+
+- the process pool, for pure-Python CPU work that holds the GIL (LexNLP regexes,
+  PyPDF2 text extraction);
+- the thread pool, for blocking I/O and for torch/spaCy inference. Those release the
+  GIL and must share the process-wide model registry and batcher.
+"""
+import asyncio
+import atexit
+import functools
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+# Worker processes for CPU-bound work (0 = one per CPU core)
+CPU_WORKERS = int(os.getenv("DOCUSCOUT_CPU_WORKERS", os.getenv("DOCUSCOUT_EXTRACT_WORKERS", "0"))) or os.cpu_count() or 1
+# Threads for blocking I/O and GIL-releasing model inference
+IO_WORKERS = int(os.getenv("DOCUSCOUT_IO_WORKERS", "8"))
+
+_lock = threading.Lock()
+_process_pool: Optional[ProcessPoolExecutor] = None
+_thread_pool: Optional[ThreadPoolExecutor] = None
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """
+    Returns the shared process pool, creating it (or replacing a broken one) on demand.
+    Workers use 'spawn', which keeps them independent of model threads running in the parent.
+    """
+    global _process_pool
+    with _lock:
+        if _process_pool is None or getattr(_process_pool, "_broken", False):
+            _process_pool = ProcessPoolExecutor(
+                max_workers=CPU_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _process_pool
+
+
+def get_thread_pool() -> ThreadPoolExecutor:
+    """
+    Returns the shared thread pool, creating it on demand.
+    """
+    global _thread_pool
+    with _lock:
+        if _thread_pool is None:
+            _thread_pool = ThreadPoolExecutor(max_workers=IO_WORKERS, thread_name_prefix="docuscout-io")
+        return _thread_pool
+
+
+async def run_in_process(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    Runs a picklable, module-level function in the shared process pool.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_process_pool(), functools.partial(func, *args, **kwargs))
+
+
+async def run_in_thread(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    Runs a blocking function in the shared thread pool.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_thread_pool(), functools.partial(func, *args, **kwargs))
+
+
+@atexit.register
+def _shutdown() -> None:
+    with _lock:
+        if _process_pool is not None:
+            _process_pool.shutdown(wait=False, cancel_futures=True)
+        if _thread_pool is not None:
+            _thread_pool.shutdown(wait=False, cancel_futures=True)
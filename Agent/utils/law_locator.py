@@ -0,0 +1,230 @@
+"""
+Multi-pattern law name search over documents.
+
+A DocumentIndex holds a document's pages and their normalized, lower-cased text (see
+utils.normalize), built once and kept in a small LRU so repeated lookups against the
+same file do not re-read or re-normalize it. A LawLocator compiles any number of law
+names into one Aho-Corasick automaton and finds every occurrence of every name in a
+single pass over each page, including names broken across lines, with page numbers
+and offsets mapped back to the original text.
+"""
+import os
+import threading
+from collections import OrderedDict, deque
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from .document import Document
+from .normalize import NormalizedText, normalize_text, normalize_with_offsets
+from .sentence_index import SNIPPET_TOKEN_BUDGET, SentenceIndex, load_sentence_index, sentence_snippet
+
+# Number of document indexes kept in memory (override via environment)
+LAW_INDEX_CACHE_DOCS = int(os.getenv("DOCUSCOUT_LAW_INDEX_DOCS", "8"))
+
+
+class LawMatch(NamedTuple):
+    """One occurrence of a law name: 1-based page and [start, end) offsets in that page's original text."""
+    law_name: str
+    page: int
+    start: int
+    end: int
+
+
+def _lower_preserving_offsets(text: str) -> str:
+    """
+    Lower-cases text without changing its length, so offsets into the result are valid
+    in the original. The few characters whose lower-case form is longer stay as they are.
+    """
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    return "".join(c.lower() if len(c.lower()) == 1 else c for c in text)
+
+
+class DocumentIndex:
+    """A document's pages plus their normalized, lower-cased text, for repeated search."""
+
+    def __init__(self, pages: Iterable[Tuple[int, str]], key: Optional[str] = None):
+        """
+        Args:
+            pages: (page_number, text) pairs.
+            key: Text cache key of the document, used to cache its sentence index.
+        """
+        self.key = key
+        self.pages: List[Tuple[int, str]] = [(number, text) for number, text in pages if text]
+        self.normalized: List[NormalizedText] = [normalize_with_offsets(text) for _, text in self.pages]
+        self.lowered: List[str] = [_lower_preserving_offsets(norm.text) for norm in self.normalized]
+        self._sentences: Optional[SentenceIndex] = None
+
+    @property
+    def sentences(self) -> SentenceIndex:
+        """Per-page sentence spans, loaded from (or built into) the text cache on first use."""
+        if self._sentences is None:
+            self._sentences = load_sentence_index(
+                self.key, [(page, norm) for (page, _), norm in zip(self.pages, self.normalized)]
+            )
+        return self._sentences
+
+    @property
+    def has_text(self) -> bool:
+        return bool(self.pages)
+
+    def page_text(self, page: int) -> str:
+        for number, text in self.pages:
+            if number == page:
+                return text
+        return ""
+
+    def snippet(self, match: LawMatch, max_tokens: int = SNIPPET_TOKEN_BUDGET) -> str:
+        """
+        Returns the whole sentences around a match, widened with neighbouring sentences
+        up to `max_tokens` (see utils.sentence_index), as normalized text.
+        """
+        return sentence_snippet(
+            self.page_text(match.page),
+            self.sentences.get(match.page, []),
+            match.start,
+            match.end,
+            max_tokens
+        )
+
+
+_index_cache: "OrderedDict[str, DocumentIndex]" = OrderedDict()
+_index_lock = threading.Lock()
+
+
+def get_document_index(pdf_path: str) -> DocumentIndex:
+    """
+    Returns the search index for a PDF, building it from the text cache on first use.
+    Indexes are keyed by content hash, so a changed file is re-indexed.
+    """
+    document = Document(pdf_path)
+    key = document.key
+    with _index_lock:
+        if key in _index_cache:
+            _index_cache.move_to_end(key)
+            return _index_cache[key]
+
+    index = DocumentIndex(document.pages(), key=key)
+
+    with _index_lock:
+        _index_cache[key] = index
+        _index_cache.move_to_end(key)
+        while len(_index_cache) > LAW_INDEX_CACHE_DOCS:
+            _index_cache.popitem(last=False)
+    return index
+
+
+class LawLocator:
+    """Case-insensitive Aho-Corasick automaton over a set of law names."""
+
+    def __init__(self, law_names: Iterable[str]):
+        # Preserve order, drop duplicates and blanks
+        self.law_names: List[str] = list(dict.fromkeys(name for name in law_names if name and name.strip()))
+
+        # Distinct lower-cased patterns; several law names may share one
+        self._patterns: List[str] = []
+        self._pattern_laws: List[List[str]] = []
+        pattern_ids: Dict[str, int] = {}
+        for name in self.law_names:
+            pattern = _lower_preserving_offsets(normalize_text(name))
+            if not pattern:
+                continue
+            if pattern not in pattern_ids:
+                pattern_ids[pattern] = len(self._patterns)
+                self._patterns.append(pattern)
+                self._pattern_laws.append([])
+            self._pattern_laws[pattern_ids[pattern]].append(name)
+
+        self._build()
+
+    def _build(self) -> None:
+        # Trie: per-state transitions, failure link and the pattern ids ending there
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+
+        for pid, pattern in enumerate(self._patterns):
+            state = 0
+            for char in pattern:
+                nxt = self._goto[state].get(char)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][char] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                state = nxt
+            self._out[state].append(pid)
+
+        # Breadth-first: failure links point to the longest proper suffix in the trie
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(char, 0)
+                self._out[nxt].extend(self._out[self._fail[nxt]])
+
+    def find(self, lowered_text: str) -> Iterator[Tuple[int, int, int]]:
+        """
+        Yields (start, end, pattern_id) for every occurrence of every pattern in
+        already lower-cased text. Matches must start and end on word boundaries.
+        """
+        goto, fail, out, patterns = self._goto, self._fail, self._out, self._patterns
+        state = 0
+        for i, char in enumerate(lowered_text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for pid in out[state]:
+                end = i + 1
+                start = end - len(patterns[pid])
+                if _is_word_boundary(lowered_text, start, end):
+                    yield start, end, pid
+
+    def locate(self, index: DocumentIndex) -> Dict[str, List[LawMatch]]:
+        """
+        Finds every occurrence of every law name in a document, in one pass per page.
+
+        Returns:
+            Law name -> matches in document order (empty list when not found), for
+            every law name the locator was built with.
+        """
+        matches: Dict[str, List[LawMatch]] = {name: [] for name in self.law_names}
+        if not self._patterns:
+            return matches
+        for (page, _), normalized, lowered in zip(index.pages, index.normalized, index.lowered):
+            for start, end, pid in self.find(lowered):
+                original_start, original_end = normalized.to_original(start, end)
+                for name in self._pattern_laws[pid]:
+                    matches[name].append(LawMatch(name, page, original_start, original_end))
+        for name in matches:
+            matches[name].sort(key=lambda m: (m.page, m.start))
+        return matches
+
+
+def _is_word_boundary(text: str, start: int, end: int) -> bool:
+    """A match may not start or end inside a word ("ESI Act" must not match "ESI Acts")."""
+    if start > 0 and text[start].isalnum() and text[start - 1].isalnum():
+        return False
+    if end < len(text) and text[end - 1].isalnum() and text[end].isalnum():
+        return False
+    return True
+
+
+def locate_laws_in_file(pdf_path: str, law_names: List[str], max_tokens: int = SNIPPET_TOKEN_BUDGET) -> Dict[str, List[Tuple[int, str]]]:
+    """
+    Finds every law name in a PDF and returns (page, snippet) pairs per law.
+    Returns plain data and is safe to run on the shared thread pool; the document index
+    comes from the in-process LRU, so repeated searches of a file do not rebuild it.
+    """
+    index = get_document_index(pdf_path)
+    if not index.has_text:
+        raise ValueError(f"Could not extract text from '{os.path.basename(pdf_path)}'.")
+    return {
+        law_name: [(match.page, index.snippet(match, max_tokens)) for match in matches]
+        for law_name, matches in LawLocator(law_names).locate(index).items()
+    }
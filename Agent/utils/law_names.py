@@ -0,0 +1,254 @@
+"""
+Canonicalization of law names.
+
+Extraction and the LLM produce many spellings of one statute: "Minimum Wages Act",
+"the Minimum Wages Act, 1948", "MW Act". canonical_law_key folds case and punctuation,
+drops a leading "the" and the year, and expands common abbreviations, so all of these
+map to "minimum wages act". group_law_names then merges near-identical keys
+("industrial dispute act" / "industrial disputes act") by Jaro-Winkler similarity,
+while keeping laws of the same name but different years apart ("Companies Act, 1956"
+and "Companies Act, 2013"). Abbreviations that stand for more than one statute ("IT
+Act") are only expanded when the same batch of names spells one of them out.
+"""
+import os
+import re
+from typing import Dict, List, NamedTuple, Optional
+
+import jellyfish
+
+from .normalize import normalize_text
+
+# Minimum Jaro-Winkler similarity for two canonical keys to be merged (override via environment)
+LAW_NAME_SIMILARITY = float(os.getenv("DOCUSCOUT_LAW_NAME_SIMILARITY", "0.95"))
+# Keys shorter than this are only merged on an exact match ("esi act" vs "epf act")
+_MIN_FUZZY_LENGTH = 10
+
+# Folded abbreviation -> folded full name
+_ABBREVIATIONS = {
+    "ipc": "indian penal code",
+    "crpc": "code of criminal procedure",
+    "cpc": "code of civil procedure",
+    "bns": "bharatiya nyaya sanhita",
+    "bnss": "bharatiya nagarik suraksha sanhita",
+    "ni act": "negotiable instruments act",
+    "mw act": "minimum wages act",
+    "pw act": "payment of wages act",
+    "epf act": "employees provident funds and miscellaneous provisions act",
+    "esi act": "employees state insurance act",
+    "posh act": "sexual harassment of women at workplace prevention prohibition and redressal act",
+    "clra": "contract labour regulation and abolition act",
+    "clra act": "contract labour regulation and abolition act",
+    "fema": "foreign exchange management act",
+    "pmla": "prevention of money laundering act",
+    "rera": "real estate regulation and development act",
+    "ibc": "insolvency and bankruptcy code",
+    "dpdp act": "digital personal data protection act",
+    "dpdpa": "digital personal data protection act",
+    "gst act": "central goods and services tax act",
+    "cgst act": "central goods and services tax act",
+    "sebi act": "securities and exchange board of india act",
+    "rbi act": "reserve bank of india act",
+    "gdpr": "general data protection regulation",
+}
+
+# Folded abbreviation -> statutes it is used for. "IT Act" is the Income-tax Act, 1961 as
+# often as the Information Technology Act, 2000, so these are never expanded blindly
+# (see group_law_names)
+_AMBIGUOUS_ABBREVIATIONS = {
+    "it act": ("information technology act", "income tax act"),
+    "pf act": ("employees provident funds and miscellaneous provisions act", "provident funds act"),
+    "id act": ("industrial disputes act", "industrial development act"),
+    "bsa": ("bharatiya sakshya adhiniyam", "bank secrecy act"),
+    "ccpa": ("california consumer privacy act", "central consumer protection authority"),
+}
+
+# Last word of a key; keys are only fuzzily merged when it agrees ("... act" vs "... rules")
+_INSTRUMENT_TYPES = {
+    "act", "acts", "code", "rules", "regulation", "regulations",
+    "ordinance", "order", "bill", "directive", "sanhita", "adhiniyam",
+}
+
+_YEAR = re.compile(r"\b(?:of\s+)?((?:18|19|20)\d{2})\b")
+_YEAR_IN_NAME = re.compile(r"[,\s]*\b(?:of\s+)?(?:18|19|20)\d{2}\b")
+_NUMBER = re.compile(r"\d+")
+_LEADING_THE = re.compile(r"^the\s+")
+_SMALL_WORDS = {"of", "and", "the", "for", "in", "on", "at", "to"}
+
+
+class LawNameGroup(NamedTuple):
+    """Law name variants that refer to one statute."""
+    key: str               # canonical key; drives searching and caching
+    name: str              # display name sent to search
+    variants: List[str]    # original spellings, in input order
+
+
+def fold_law_name(name: str) -> str:
+    """
+    Folds a law name: normalized text, lower case, dots dropped ("Cr.P.C." -> "crpc"),
+    "&" spelled out, other punctuation to spaces, leading "the" and years removed.
+    """
+    folded = normalize_text(name).lower().replace("&", " and ").replace(".", "")
+    folded = re.sub(r"[^\w\s]", " ", folded)
+    folded = _YEAR.sub(" ", folded)
+    folded = " ".join(folded.split())
+    return _LEADING_THE.sub("", folded)
+
+
+def law_year(name: str) -> Optional[str]:
+    """Returns the year in a law name ("Minimum Wages Act, 1948" -> "1948"), if any."""
+    match = _YEAR.search(normalize_text(name))
+    return match.group(1) if match else None
+
+
+def canonical_law_key(name: str) -> str:
+    """
+    Returns the canonical key of a law name: folded, with known abbreviations expanded.
+    Ambiguous abbreviations ("IT Act") are left folded; see resolve_abbreviations.
+    """
+    folded = fold_law_name(name)
+    return _ABBREVIATIONS.get(folded, folded)
+
+
+def law_name_spellings(name: str) -> List[str]:
+    """
+    Other ways a document may write a law name, for searching: without its year
+    ("Minimum Wages Act"), without punctuation ("employees state insurance act"), as
+    its abbreviation ("esi act") and, for an abbreviation, spelled out. An ambiguous
+    abbreviation yields every statute it may stand for, so a hit on one of these is
+    only a hint. `name` itself is not included.
+    """
+    folded = fold_law_name(name)
+    key = canonical_law_key(name)
+    spellings = [" ".join(_YEAR_IN_NAME.sub(" ", normalize_text(name)).split()).strip(" ,"), folded, key]
+    spellings += [abbreviation for abbreviation, full in _ABBREVIATIONS.items() if full == key]
+    spellings += [abbreviation for abbreviation, candidates in _AMBIGUOUS_ABBREVIATIONS.items() if key in candidates]
+    spellings += _AMBIGUOUS_ABBREVIATIONS.get(folded, ())
+
+    seen = {normalize_text(name).lower()}
+    distinct = []
+    for spelling in spellings:
+        if spelling and spelling.lower() not in seen:
+            seen.add(spelling.lower())
+            distinct.append(spelling)
+    return distinct
+
+
+def resolve_abbreviations(keys: List[str]) -> Dict[str, str]:
+    """
+    Maps each ambiguous abbreviation key ("it act") among `keys` to the statute it stands
+    for, when exactly one of its candidates is also among `keys`. Abbreviations with no
+    or several candidates spelled out are left alone.
+    """
+    spelled_out = set(keys)
+    resolved = {}
+    for key in spelled_out:
+        present = [c for c in _AMBIGUOUS_ABBREVIATIONS.get(key, ()) if c in spelled_out]
+        if len(present) == 1:
+            resolved[key] = present[0]
+    return resolved
+
+
+def _instrument_type(key: str) -> str:
+    last = key.rsplit(" ", 1)[-1]
+    return last if last in _INSTRUMENT_TYPES else ""
+
+
+def _similar(a: str, b: str, threshold: float) -> bool:
+    if a == b:
+        return True
+    if min(len(a), len(b)) < _MIN_FUZZY_LENGTH or _instrument_type(a) != _instrument_type(b):
+        return False
+    # "section 17" and "section 18" are different provisions however similar they look
+    if _NUMBER.findall(a) != _NUMBER.findall(b):
+        return False
+    return jellyfish.jaro_winkler_similarity(a, b) >= threshold
+
+
+def _display_name(key: str) -> str:
+    words = key.split()
+    return " ".join(
+        word if i and word in _SMALL_WORDS else word[:1].upper() + word[1:]
+        for i, word in enumerate(words)
+    )
+
+
+def group_law_names(names: List[str], threshold: float = LAW_NAME_SIMILARITY) -> List[LawNameGroup]:
+    """
+    Groups law name variants that refer to the same statute.
+
+    Names are clustered greedily in input order: each canonical key joins the first
+    cluster whose first key is similar enough, otherwise it starts a new one. An
+    ambiguous abbreviation ("IT Act") joins a statute only when the names spell exactly
+    one of its candidates out; otherwise it stays a group of its own. A
+    cluster's key is the smallest of its members' keys. A cluster whose variants carry
+    different years is split per year; variants without a year stay with the first
+    year seen.
+
+    Args:
+        names: Law names as extracted (duplicates and blanks allowed).
+        threshold: Minimum Jaro-Winkler similarity to merge two keys.
+
+    Returns:
+        One LawNameGroup per statute, in order of first appearance.
+    """
+    clusters: List[List[str]] = []
+    cluster_keys: List[List[str]] = []
+    representatives: List[str] = []
+    cluster_of_key: Dict[str, int] = {}
+
+    unique = list(dict.fromkeys(n for n in names if n and n.strip()))
+    keys = [canonical_law_key(name) for name in unique]
+    resolved = resolve_abbreviations(keys)
+
+    for name, key in zip(unique, keys):
+        key = resolved.get(key, key)
+        if not key:
+            continue
+        index = cluster_of_key.get(key)
+        if index is None:
+            index = next((i for i, rep in enumerate(representatives) if _similar(key, rep, threshold)), None)
+            if index is None:
+                index = len(clusters)
+                clusters.append([])
+                cluster_keys.append([])
+                representatives.append(key)
+            cluster_of_key[key] = index
+            cluster_keys[index].append(key)
+        clusters[index].append(name)
+
+    groups: List[LawNameGroup] = []
+    for keys, variants in zip(cluster_keys, clusters):
+        # Smallest member key, so the cache key does not depend on input order
+        representative = min(keys)
+        by_year: Dict[Optional[str], List[str]] = {}
+        for variant in variants:
+            by_year.setdefault(law_year(variant), []).append(variant)
+        years = [year for year in by_year if year is not None]
+
+        if len(years) <= 1:
+            groups.append(LawNameGroup(representative, _pick_display_name(representative, variants), variants))
+            continue
+
+        undated = by_year.pop(None, [])
+        for i, year in enumerate(years):
+            members = by_year[year] + (undated if i == 0 else [])
+            members.sort(key=variants.index)
+            key = f"{representative} {year}"
+            groups.append(LawNameGroup(key, _pick_display_name(key, members), members))
+    return groups
+
+
+def _pick_display_name(key: str, variants: List[str]) -> str:
+    """
+    Prefers the first variant spelled out in full (not an abbreviation) and, among
+    those, one that carries its year; otherwise title-cases the key.
+    """
+    spelled_out = [
+        v for v in variants
+        if fold_law_name(v) not in _ABBREVIATIONS and fold_law_name(v) not in _AMBIGUOUS_ABBREVIATIONS
+    ]
+    if not spelled_out:
+        # An unresolved ambiguous abbreviation keeps its own spelling ("IT Act", not "It Act")
+        return normalize_text(variants[0]) if key in _AMBIGUOUS_ABBREVIATIONS else _display_name(key)
+    dated = [v for v in spelled_out if law_year(v)]
+    return normalize_text((dated or spelled_out)[0])
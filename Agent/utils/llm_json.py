@@ -0,0 +1,85 @@
+"""
+Bounded, concurrent LLM calls that answer in JSON.
+
+Map steps that send one prompt per file (playbook curation, risk audit) share the same
+mechanics: the call goes through litellm with the proxy settings from the environment,
+at most a fixed number are in flight (a semaphore shared by the caller's batch), each is
+bounded by a timeout, and the reply is read as JSON even when the model wraps it in a
+code fence. complete_json never raises for a failed call; it reports what went wrong so
+the caller can fall back to its own deterministic result.
+"""
+import asyncio
+import json
+import os
+import re
+from typing import Any, NamedTuple, Optional
+
+import litellm
+
+_CODE_FENCE = re.compile(r"^```(?:json)?\s*|\s*```$")
+
+
+class JsonReply(NamedTuple):
+    """
+    Outcome of one call: the parsed reply, or why there is none.
+
+    `error` is "" on success, otherwise "timed out", "failed" or "returned an unusable
+    reply"; `detail` carries the exception message of a failed call.
+    """
+    data: Any
+    error: str = ""
+    detail: str = ""
+
+
+def parse_json_reply(content: str) -> Optional[Any]:
+    """Parses a model reply as JSON, ignoring a surrounding code fence; None if it is not JSON."""
+    try:
+        return json.loads(_CODE_FENCE.sub("", (content or "").strip()))
+    except (json.JSONDecodeError, TypeError):
+        return None
+
+
+async def complete_json(
+    system_prompt: str,
+    user_prompt: str,
+    semaphore: asyncio.Semaphore,
+    timeout: float
+) -> JsonReply:
+    """
+    Runs one JSON-mode chat completion once a slot of `semaphore` is free.
+
+    Args:
+        system_prompt: Instructions, including the expected JSON shape.
+        user_prompt: The per-item input.
+        semaphore: Caps the calls in flight across the caller's batch.
+        timeout: Seconds allowed for the call once it has a slot.
+
+    Returns:
+        JsonReply(data) on success; JsonReply(None, error, detail) when the call timed
+        out, failed or returned something that is not JSON.
+    """
+    async with semaphore:
+        try:
+            response = await asyncio.wait_for(
+                litellm.acompletion(
+                    model=os.getenv("GEMINI_MODEL"),
+                    api_base=os.getenv("LITELLM_PROXY_API_BASE"),
+                    api_key=os.getenv("LITELLM_PROXY_GEMINI_API_KEY"),
+                    temperature=0,
+                    response_format={"type": "json_object"},
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": user_prompt},
+                    ]
+                ),
+                timeout
+            )
+        except asyncio.TimeoutError:
+            return JsonReply(None, "timed out")
+        except Exception as e:
+            return JsonReply(None, "failed", str(e))
+
+    data = parse_json_reply(response.choices[0].message.content or "")
+    if data is None:
+        return JsonReply(None, "returned an unusable reply")
+    return JsonReply(data)
@@ -0,0 +1,196 @@
+"""
+Ingestion manifest and extractor result cache, so each stage only reprocesses new or
+changed PDFs.
+
+The manifest (.docuscout_cache/manifest.json) holds per-file content hash, size and
+File Search document id:
+
+    {
+        "files": {
+            "Contract.pdf": {
+                "sha256": "...",
+                "size": 12345,
+                "file_search": {"store": "fileSearchStores/...", "document": "...", "sha256": "..."}
+            }
+        }
+    }
+
+Updates are serialized by a file lock, so concurrent ingestions in other processes do
+not overwrite each other.
+
+Extractor results are kept out of the manifest, one JSON file per content hash and
+stage (.docuscout_cache/results/<sha256>.<stage>.json), each written atomically on its
+own. Storing one file's result therefore costs one small write, independent of the
+corpus, and parallel extractors never contend. A changed file has a new hash and
+simply stops matching instead of needing explicit invalidation.
+"""
+import json
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from importlib import metadata
+from typing import Any, Dict, Iterator, Optional
+
+from filelock import FileLock
+
+from .text_cache import CACHE_DIR, file_sha256
+
+MANIFEST_PATH = os.path.join(CACHE_DIR, "manifest.json")
+RESULTS_DIR = os.path.join(CACHE_DIR, "results")
+
+# Threads of this process, then other processes (extractor workers, API ingestion)
+_manifest_lock = threading.RLock()
+_manifest_file_lock = FileLock(f"{MANIFEST_PATH}.lock")
+
+
+def package_version(package: str) -> str:
+    """
+    Returns the installed version of a package, or "unknown".
+    """
+    try:
+        return metadata.version(package)
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def _load() -> Dict[str, Any]:
+    try:
+        with open(MANIFEST_PATH, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return {"files": {}}
+    except (OSError, ValueError) as e:
+        print(f"Ignoring unreadable manifest {MANIFEST_PATH}: {e}")
+        return {"files": {}}
+    manifest.setdefault("files", {})
+    return manifest
+
+
+def _write_json(path: str, data: Any, indent: Optional[int] = 4) -> None:
+    """Writes JSON atomically: readers see the old or the new file, never a partial one."""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=indent, default=str)
+        os.replace(tmp_path, path)
+    except Exception:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def load_manifest() -> Dict[str, Any]:
+    """
+    Returns a snapshot of the manifest.
+    """
+    with _manifest_lock:
+        return _load()
+
+
+@contextmanager
+def update_manifest() -> Iterator[Dict[str, Any]]:
+    """
+    Context manager for a read-modify-write of the manifest. Changes are written
+    atomically when the block exits without an exception. Holds the manifest file lock,
+    so read-modify-writes from other processes cannot interleave.
+    """
+    os.makedirs(os.path.dirname(MANIFEST_PATH) or ".", exist_ok=True)
+    with _manifest_lock, _manifest_file_lock:
+        manifest = _load()
+        yield manifest
+        _write_json(MANIFEST_PATH, manifest)
+
+
+def _file_entry(manifest: Dict[str, Any], pdf_path: str) -> Dict[str, Any]:
+    """
+    Returns the (created-on-demand) entry for a file, refreshed with its current hash and size.
+    """
+    entry = manifest["files"].setdefault(os.path.basename(pdf_path), {})
+    entry["sha256"] = file_sha256(pdf_path)
+    entry["size"] = os.path.getsize(pdf_path)
+    return entry
+
+
+def _result_path(sha256: str, stage: str) -> str:
+    return os.path.join(RESULTS_DIR, f"{sha256}.{stage}.json")
+
+
+def get_cached_result(pdf_path: str, stage: str, version: str) -> Optional[Any]:
+    """
+    Returns the cached result of an extractor for a file, if it was computed from the
+    same file content with the same extractor version.
+
+    Args:
+        pdf_path: Path to the PDF file.
+        stage: Extractor name (e.g. "gliner", "lexnlp").
+        version: Extractor version string the caller would produce results with.
+
+    Returns:
+        The cached result, or None if missing or stale.
+    """
+    path = _result_path(file_sha256(pdf_path), stage)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            record = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        print(f"Ignoring unreadable {stage} result for {os.path.basename(pdf_path)}: {e}")
+        return None
+    if not isinstance(record, dict) or record.get("version") != version:
+        return None
+    return record.get("data")
+
+
+def store_result(pdf_path: str, stage: str, version: str, data: Any) -> None:
+    """
+    Caches an extractor result for a file's current content. Only this file's result
+    is written; other files and stages are untouched.
+    """
+    sha256 = file_sha256(pdf_path)
+    _write_json(_result_path(sha256, stage), {
+        "version": version,
+        "sha256": sha256,
+        "data": data
+    }, indent=None)
+
+
+def get_store_document(pdf_path: str, store_name: str) -> Optional[Dict[str, Any]]:
+    """
+    Returns the File Search record ({"store", "document", "sha256"}) for a file in the
+    given store, or None if it was never uploaded there.
+    """
+    entry = load_manifest()["files"].get(os.path.basename(pdf_path))
+    if not entry:
+        return None
+    record = entry.get("file_search")
+    if not record or record.get("store") != store_name:
+        return None
+    return record
+
+
+def set_store_document(pdf_path: str, store_name: str, document_name: Optional[str]) -> None:
+    """
+    Records that a file's current content was uploaded to a File Search store.
+    """
+    with update_manifest() as manifest:
+        entry = _file_entry(manifest, pdf_path)
+        entry["file_search"] = {
+            "store": store_name,
+            "document": document_name,
+            "sha256": entry["sha256"]
+        }
+
+
+def forget_files(filenames) -> None:
+    """
+    Drops manifest entries for files that are no longer in the DB folder.
+    """
+    with update_manifest() as manifest:
+        for filename in filenames:
+            manifest["files"].pop(filename, None)
@@ -0,0 +1,156 @@
+"""
+Process-wide registry of loaded NER models.
+
+Models are loaded lazily on first use and then shared by every tool call in the
+process. Concurrent first requests for the same model wait on a single in-flight load
+instead of loading it twice, and the least-recently-used models are evicted once the
+estimated RAM of all loaded models exceeds the configured budget.
+"""
+import gc
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# Total RAM the registry may keep loaded models in (override via environment)
+MODEL_RAM_BUDGET_MB = float(os.getenv("DOCUSCOUT_MODEL_RAM_MB", "6144"))
+# Used when a model's size cannot be estimated
+DEFAULT_MODEL_SIZE_MB = 500.0
+
+_MB = 1024 * 1024
+
+
+def _torch_size_bytes(module: Any) -> int:
+    return sum(p.numel() * p.element_size() for p in module.parameters())
+
+
+def estimate_model_size_mb(model: Any) -> float:
+    """
+    Estimates the RAM held by a model's weights.
+    Understands PyTorch modules (GLiNER) and spaCy pipelines, including
+    transformer components wrapped by thinc. Models whose weights live outside
+    torch (e.g. on ONNX Runtime) get the default size.
+    """
+    try:
+        if callable(getattr(model, "parameters", None)):
+            size = _torch_size_bytes(model)
+            if size:
+                return size / _MB
+
+        if hasattr(model, "pipeline"):
+            total = 0
+            for _, component in model.pipeline:
+                thinc_model = getattr(component, "model", None)
+                if thinc_model is None or not hasattr(thinc_model, "walk"):
+                    continue
+                for node in thinc_model.walk():
+                    for param_name in node.param_names:
+                        if node.has_param(param_name):
+                            total += node.get_param(param_name).nbytes
+                    for shim in node.shims:
+                        inner = getattr(shim, "_model", None)
+                        if callable(getattr(inner, "parameters", None)):
+                            total += _torch_size_bytes(inner)
+            if total:
+                return total / _MB
+    except Exception as e:
+        print(f"Could not estimate model size: {e}")
+
+    return DEFAULT_MODEL_SIZE_MB
+
+
+class ModelRegistry:
+    """Loads each model once per process and keeps them under a RAM budget (LRU)."""
+
+    def __init__(self, budget_mb: float = MODEL_RAM_BUDGET_MB):
+        self.budget_mb = budget_mb
+        # name -> (model, size_mb), least recently used first
+        self._models: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self._loading: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str, loader: Callable[[], Any], size_mb: Optional[float] = None) -> Any:
+        """
+        Returns a loaded model, loading it with `loader` on first use.
+
+        Args:
+            name: Registry key for the model.
+            loader: Zero-argument callable that loads and returns the model.
+            size_mb: Known RAM footprint; estimated from the model when omitted.
+
+        Returns:
+            The loaded model. If the load fails, the loader's exception is raised to
+            every caller waiting on it, and the next call retries.
+        """
+        with self._lock:
+            if name in self._models:
+                self._models.move_to_end(name)
+                return self._models[name][0]
+            future = self._loading.get(name)
+            is_owner = future is None
+            if is_owner:
+                future = Future()
+                self._loading[name] = future
+
+        if not is_owner:
+            print(f"Waiting for in-flight load of model '{name}'...")
+            return future.result()
+
+        try:
+            model = loader()
+        except BaseException as e:
+            with self._lock:
+                self._loading.pop(name, None)
+            future.set_exception(e)
+            raise
+
+        if size_mb is None:
+            size_mb = estimate_model_size_mb(model)
+
+        with self._lock:
+            self._models[name] = (model, size_mb)
+            self._loading.pop(name, None)
+            evicted = self._evict_over_budget(keep=name)
+
+        future.set_result(model)
+        print(f"Model '{name}' loaded (~{size_mb:.0f} MB)")
+        if evicted:
+            print(f"Evicted models to stay within {self.budget_mb:.0f} MB: {', '.join(evicted)}")
+            gc.collect()
+        return model
+
+    def _evict_over_budget(self, keep: str) -> list:
+        """Drops least-recently-used models (never `keep`) until under budget. Caller holds the lock."""
+        evicted = []
+        total = sum(size for _, size in self._models.values())
+        for name in list(self._models):
+            if total <= self.budget_mb:
+                break
+            if name == keep:
+                continue
+            _, size = self._models.pop(name)
+            total -= size
+            evicted.append(name)
+        return evicted
+
+    def evict(self, name: str) -> bool:
+        """
+        Unloads a model. Returns True if it was loaded.
+        """
+        with self._lock:
+            removed = self._models.pop(name, None) is not None
+        if removed:
+            gc.collect()
+        return removed
+
+    def loaded(self) -> Dict[str, float]:
+        """
+        Returns the loaded models and their estimated sizes in MB, least recently used first.
+        """
+        with self._lock:
+            return {name: size for name, (_, size) in self._models.items()}
+
+
+# Global instance
+model_registry = ModelRegistry()
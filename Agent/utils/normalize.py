@@ -0,0 +1,97 @@
+"""
+Normalization of PyPDF2 text for matching.
+
+PDF extraction leaves broken line wraps, hyphenated words, runs of spaces and newlines
+inside names ("Section\\n \\n7"), typographic quotes and assorted dashes. The normalized
+layer collapses whitespace, joins words hyphenated across lines, and unifies quotes and
+dashes. It also keeps an offset map, so a match in the normalized text can be traced
+back to the original characters.
+"""
+import re
+from typing import List, NamedTuple, Tuple
+
+# Bump when the rules change so cached results built on normalized text are recomputed
+NORMALIZATION_VERSION = "1"
+
+_CHAR_MAP = {
+    "‘": "'", "’": "'", "‚": "'", "‛": "'", "′": "'", "`": "'",
+    "“": '"', "”": '"', "„": '"', "‟": '"', "″": '"',
+    "«": '"', "»": '"',
+    "‐": "-", "‑": "-", "‒": "-", "–": "-", "—": "-",
+    "―": "-", "−": "-", "﹘": "-", "﹣": "-", "－": "-",
+    "ﬀ": "ff", "ﬁ": "fi", "ﬂ": "fl", "ﬃ": "ffi", "ﬄ": "ffl",
+    "\u00ad": "",
+}
+
+# A word broken by a hyphen at a line end ("employ-\nment" -> "employment"); when the
+# next line starts upper case it is a real compound, so only the break is removed
+# ("Anti-\nMoney" -> "Anti-Money")
+_HYPHEN_BREAK = r"(?<=[A-Za-z])[-\u00ad\u2010\u2011][ \t]*\n\s*(?=[a-z])"
+_COMPOUND_BREAK = r"(?<=[A-Za-z])[-\u2010\u2011][ \t]*\n\s*(?=[A-Z])"
+_TOKEN = re.compile(
+    rf"(?P<hyphen>{_HYPHEN_BREAK})|(?P<compound>{_COMPOUND_BREAK})"
+    rf"|(?P<space>\s+)|(?P<char>[{re.escape(''.join(_CHAR_MAP))}])"
+)
+
+
+class NormalizedText(NamedTuple):
+    """
+    Normalized text plus, for each of its characters, the index of the original
+    character it came from.
+    """
+    text: str
+    offsets: List[int]
+
+    def to_original(self, start: int, end: int) -> Tuple[int, int]:
+        """
+        Maps a [start, end) span of the normalized text to the original text.
+        """
+        if start >= end:
+            original = self.offsets[start] if start < len(self.offsets) else (self.offsets[-1] + 1 if self.offsets else 0)
+            return original, original
+        return self.offsets[start], self.offsets[end - 1] + 1
+
+
+def normalize_with_offsets(text: str) -> NormalizedText:
+    """
+    Normalizes PDF text: collapses whitespace runs to one space, joins words hyphenated
+    across lines, unifies quotes and dashes, and expands ligatures.
+
+    Args:
+        text: Original text.
+
+    Returns:
+        NormalizedText whose offsets map every normalized character to its original index.
+    """
+    pieces: List[str] = []
+    offsets: List[int] = []
+    pos = 0
+    for match in _TOKEN.finditer(text):
+        start = match.start()
+        if start > pos:
+            pieces.append(text[pos:start])
+            offsets.extend(range(pos, start))
+        kind = match.lastgroup
+        if kind == "space":
+            pieces.append(" ")
+            offsets.append(start)
+        elif kind == "compound":
+            pieces.append("-")
+            offsets.append(start)
+        elif kind == "char":
+            replacement = _CHAR_MAP[match.group()]
+            pieces.append(replacement)
+            offsets.extend([start] * len(replacement))
+        # "hyphen": the break is dropped entirely
+        pos = match.end()
+    if pos < len(text):
+        pieces.append(text[pos:])
+        offsets.extend(range(pos, len(text)))
+    return NormalizedText("".join(pieces), offsets)
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalizes text (see normalize_with_offsets) and trims it, for names and queries.
+    """
+    return normalize_with_offsets(text).text.strip()
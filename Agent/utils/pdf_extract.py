@@ -0,0 +1,128 @@
+"""
+Parallel PDF text extraction across the DB folder.
+
+Files (and page ranges of very large files) are spread across the shared process pool,
+reassembled in page order and written to the shared text cache. Files that are already
+cached are served without touching the pool.
+"""
+import os
+from typing import Dict, List, Optional, Tuple, Union
+
+import PyPDF2
+
+from .executors import CPU_WORKERS, get_process_pool
+from .text_cache import cache_key, has_cached_pages, read_cached_pages, write_cached_pages
+
+# Number of worker processes; extraction runs in-process when this is 1
+EXTRACT_WORKERS = CPU_WORKERS
+# Files longer than this are split into page ranges of this size
+EXTRACT_PAGES_PER_TASK = int(os.getenv("DOCUSCOUT_EXTRACT_PAGES_PER_TASK", "50"))
+
+
+def _extract_page_range(pdf_path: str, start: int, end: int) -> List[str]:
+    """
+    Worker entry point: extracts pages [start, end) of a PDF.
+    """
+    reader = PyPDF2.PdfReader(pdf_path)
+    return [reader.pages[i].extract_text() or "" for i in range(start, end)]
+
+
+def _count_pages(pdf_path: str) -> int:
+    return len(PyPDF2.PdfReader(pdf_path).pages)
+
+
+def extract_pdfs(
+    pdf_paths: List[str],
+    max_workers: Optional[int] = None,
+    return_pages: bool = True
+) -> List[Union[List[str], Exception, None]]:
+    """
+    Extracts page texts for many PDFs in parallel, reading through the text cache.
+
+    Args:
+        pdf_paths: PDF files to extract.
+        max_workers: Worker process count; 1 extracts in the calling process. Defaults
+            to the shared process pool (DOCUSCOUT_CPU_WORKERS).
+        return_pages: When False, only warm the cache and return None for each file
+            that succeeded; callers then stream pages through Document.
+
+    Returns:
+        One entry per input path, in the same order: the list of page texts (or None
+        when return_pages is False), or the exception raised while reading that file.
+    """
+    results: List[Union[List[str], Exception, None]] = [None] * len(pdf_paths)
+    keys: Dict[int, str] = {}
+    # (file index, first page, end page)
+    tasks: List[Tuple[int, int, int]] = []
+
+    for idx, pdf_path in enumerate(pdf_paths):
+        try:
+            key = cache_key(pdf_path)
+            if not return_pages and has_cached_pages(key):
+                continue
+            cached = read_cached_pages(key) if return_pages else None
+            if cached is not None:
+                results[idx] = cached
+                continue
+            page_count = _count_pages(pdf_path)
+        except Exception as e:
+            results[idx] = e
+            continue
+
+        keys[idx] = key
+        results[idx] = [""] * page_count
+        for start in range(0, page_count, EXTRACT_PAGES_PER_TASK):
+            tasks.append((idx, start, min(page_count, start + EXTRACT_PAGES_PER_TASK)))
+
+    if not tasks:
+        return results
+
+    # Tasks are grouped by file, so a file is complete once its last range is in
+    last_task = {idx: i for i, (idx, _, _) in enumerate(tasks)}
+
+    def _store(i: int, idx: int, start: int, end: int, pages) -> None:
+        if isinstance(results[idx], Exception):
+            return
+        if isinstance(pages, Exception):
+            results[idx] = pages
+            return
+        results[idx][start:end] = pages
+        if last_task[idx] == i:
+            _finish_file(idx)
+
+    def _finish_file(idx: int) -> None:
+        try:
+            write_cached_pages(keys[idx], results[idx])
+        except Exception as e:
+            print(f"Error writing text cache for {os.path.basename(pdf_paths[idx])}: {e}")
+        if not return_pages:
+            # Release the text as soon as it is cached
+            results[idx] = None
+
+    workers = min(max_workers or EXTRACT_WORKERS, len(tasks))
+    print(f"Extracting text from {len(keys)} PDFs ({len(tasks)} page ranges, {workers} workers)...")
+
+    if workers <= 1:
+        for i, (idx, start, end) in enumerate(tasks):
+            if isinstance(results[idx], Exception):
+                continue
+            try:
+                pages = _extract_page_range(pdf_paths[idx], start, end)
+            except Exception as e:
+                pages = e
+            _store(i, idx, start, end, pages)
+    else:
+        # Shared with the other extractors, so concurrent callers do not oversubscribe the CPU
+        pool = get_process_pool()
+        futures = [
+            pool.submit(_extract_page_range, pdf_paths[idx], start, end)
+            for idx, start, end in tasks
+        ]
+        for i, ((idx, start, end), future) in enumerate(zip(tasks, futures)):
+            try:
+                pages = future.result()
+            except Exception as e:
+                pages = e
+            _store(i, idx, start, end, pages)
+
+    return results
@@ -0,0 +1,89 @@
+"""
+Keyword prefilter for the neural extractors.
+
+Most of a commercial contract never mentions a statute. Before a text window goes to
+GLiNER or the OpenNyAI transformer, a single compiled regex checks it for a legal
+reference cue ("Act", "Section", "Article", "Rule", "Regulation", "Code", "§", ...).
+Windows without a cue are skipped. Each window already carries its surrounding sentences
+as context, so a kept window holds the whole reference.
+"""
+import os
+import re
+from typing import Callable, Iterable, Iterator, TypeVar
+
+# Set DOCUSCOUT_PREFILTER=0 to send every window to the models
+PREFILTER_ENABLED = os.getenv("DOCUSCOUT_PREFILTER", "1").lower() not in ("0", "false", "no")
+# Bump when the cue list changes so cached extractor results are recomputed
+PREFILTER_VERSION = "1"
+
+# "Act" is matched case-sensitively ("to act in good faith" is not a cue); the other cues
+# in any case. Abbreviations are matched with their trailing period.
+_CUE_PATTERN = re.compile(
+    r"\b(?:Acts?|ACTS?)\b"
+    r"|\b(?i:sections?|articles?|rules?|regulations?|codes?|ordinances?|statutes?|"
+    r"amendments?|bye-?laws?|directives?|notifications?)\b"
+    r"|\b(?i:secs?|arts?|regs?)\.|\bu/s\b|§"
+)
+
+T = TypeVar("T")
+
+
+def has_cue(text: str) -> bool:
+    """True if the text contains a legal reference cue."""
+    return _CUE_PATTERN.search(text) is not None
+
+
+class PrefilterStats:
+    """Counts how many windows and characters the prefilter kept and skipped."""
+
+    def __init__(self):
+        self.windows_total = 0
+        self.windows_kept = 0
+        self.chars_total = 0
+        self.chars_kept = 0
+
+    def record(self, text: str, kept: bool) -> None:
+        self.windows_total += 1
+        self.chars_total += len(text)
+        if kept:
+            self.windows_kept += 1
+            self.chars_kept += len(text)
+
+    @property
+    def skipped_ratio(self) -> float:
+        """Fraction of characters that were not sent to the model."""
+        if not self.chars_total:
+            return 0.0
+        return 1 - self.chars_kept / self.chars_total
+
+    def summary(self) -> str:
+        if not PREFILTER_ENABLED:
+            return "prefilter disabled"
+        return (
+            f"prefilter kept {self.windows_kept}/{self.windows_total} windows, "
+            f"skipped {self.skipped_ratio:.0%} of text"
+        )
+
+
+def filter_windows(
+    windows: Iterable[T],
+    stats: PrefilterStats,
+    text_of: Callable[[T], str] = lambda window: window[-1]
+) -> Iterator[T]:
+    """
+    Yields only the windows that contain a legal reference cue.
+
+    Args:
+        windows: Windows to filter, e.g. (offset, text) tuples.
+        stats: Updated with kept/skipped counts.
+        text_of: Extracts the text from a window; defaults to its last element.
+
+    Returns:
+        The candidate windows, in order. All windows pass when PREFILTER_ENABLED is off.
+    """
+    for window in windows:
+        text = text_of(window)
+        kept = not PREFILTER_ENABLED or has_cue(text)
+        stats.record(text, kept)
+        if kept:
+            yield window
@@ -0,0 +1,114 @@
+"""
+Per-page sentence index for context snippets.
+
+Sentence boundaries are found once per document on the normalized page text and
+stored as spans in the original page text. They sit next to the page text in the
+text cache, keyed by the text cache key and the normalization version. Snippets are
+then whole sentences around a match rather than fixed character windows. They grow
+by neighbouring sentences while they stay within a token budget.
+"""
+import os
+from bisect import bisect_right
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .normalize import NORMALIZATION_VERSION, NormalizedText, normalize_text
+from .sentences import sentence_spans
+from .text_cache import read_sidecar, write_sidecar
+
+# Default snippet size, in (estimated) tokens (override via environment)
+SNIPPET_TOKEN_BUDGET = int(os.getenv("DOCUSCOUT_SNIPPET_TOKENS", "120"))
+# Rough characters-per-token ratio for English legal text
+_CHARS_PER_TOKEN = 4
+
+_SIDECAR_NAME = f"sentences.n{NORMALIZATION_VERSION}"
+
+# page number -> sentence spans in the original page text
+SentenceIndex = Dict[int, List[Tuple[int, int]]]
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count (about 4 characters per token)."""
+    return (len(text) + _CHARS_PER_TOKEN - 1) // _CHARS_PER_TOKEN
+
+
+def page_sentence_spans(normalized: NormalizedText) -> List[Tuple[int, int]]:
+    """
+    Splits a page into sentences on its normalized text (where broken line wraps are
+    already joined) and maps the spans back to the original page text.
+    """
+    spans = []
+    for start, end in sentence_spans(normalized.text):
+        if normalized.text[start:end].strip():
+            spans.append(normalized.to_original(start, end))
+    return spans
+
+
+def load_sentence_index(key: Optional[str], pages: Sequence[Tuple[int, NormalizedText]]) -> SentenceIndex:
+    """
+    Returns the sentence index of a document, from the text cache when available.
+
+    Args:
+        key: Text cache key of the document; None skips the cache.
+        pages: (page_number, normalized page text) pairs.
+    """
+    if key is not None:
+        cached = read_sidecar(key, _SIDECAR_NAME)
+        if cached is not None:
+            return {int(page): [tuple(span) for span in spans] for page, spans in cached.items()}
+
+    index = {page: page_sentence_spans(normalized) for page, normalized in pages}
+    if key is not None:
+        try:
+            write_sidecar(key, _SIDECAR_NAME, {str(page): spans for page, spans in index.items()})
+        except Exception as e:
+            print(f"Error writing sentence index {key[:12]}: {e}")
+    return index
+
+
+def sentence_snippet(
+    page_text: str,
+    spans: List[Tuple[int, int]],
+    start: int,
+    end: int,
+    max_tokens: int = SNIPPET_TOKEN_BUDGET
+) -> str:
+    """
+    Returns the whole sentence(s) enclosing [start, end), widened with neighbouring
+    sentences (alternating before and after) while within `max_tokens`. If the
+    enclosing sentence alone exceeds the budget, a window of that size centred on
+    the match is returned instead.
+
+    Returns:
+        Normalized snippet text.
+    """
+    max_chars = max_tokens * _CHARS_PER_TOKEN
+    starts = [s for s, _ in spans]
+    first = max(0, bisect_right(starts, start) - 1)
+    last = max(first, bisect_right(starts, max(start, end - 1)) - 1)
+
+    if not spans or spans[first][0] > start or spans[last][1] < end:
+        lo, hi = start, end
+    else:
+        lo, hi = spans[first][0], spans[last][1]
+
+    if hi - lo > max_chars:
+        # Enclosing sentence too long: centre a budget-sized window on the match
+        pad = max(0, (max_chars - (end - start)) // 2)
+        lo = max(0, start - pad)
+        hi = min(len(page_text), end + pad)
+        return normalize_text(page_text[lo:hi])
+
+    before, after = first - 1, last + 1
+    while before >= 0 or after < len(spans):
+        grew = False
+        if before >= 0 and hi - spans[before][0] <= max_chars:
+            lo = spans[before][0]
+            before -= 1
+            grew = True
+        if after < len(spans) and spans[after][1] - lo <= max_chars:
+            hi = spans[after][1]
+            after += 1
+            grew = True
+        if not grew:
+            break
+    return normalize_text(page_text[lo:hi])
@@ -0,0 +1,82 @@
+"""
+Lightweight, regex-based sentence segmentation tuned for contract text.
+
+Spans partition the input: each sentence runs up to the start of the next one, so its
+trailing whitespace belongs to it and concatenating consecutive spans reproduces the
+original text exactly (offsets stay valid).
+"""
+import re
+from typing import List, Tuple
+
+# End punctuation (optionally closed by quotes/brackets) followed by whitespace and an
+# upper-case letter, digit or opening quote/bracket; or a blank line.
+_BOUNDARY = re.compile(r"""(?P<punct>(?<=[.!?])["')\]]*\s+(?=[A-Z0-9"'(\[]))|(?P<blank>\n\s*\n)""")
+_BLANK_LINE = re.compile(r"\n\s*\n")
+_LAST_TOKEN = re.compile(r"([A-Za-z][A-Za-z.]*)$")
+
+# Tokens that end with a period without ending the sentence (compared lower-case)
+ABBREVIATIONS = {
+    "sec", "secs", "no", "nos", "art", "arts", "cl", "para", "paras", "sch", "ch",
+    "vs", "v", "mr", "mrs", "ms", "dr", "inc", "ltd", "pvt", "co", "corp", "llc",
+    "u.s", "u.k", "etc", "e.g", "i.e", "viz", "st", "rs", "approx", "ref", "fig",
+}
+
+_WORD = re.compile(r"\S+")
+
+
+def sentence_spans(text: str) -> List[Tuple[int, int]]:
+    """
+    Splits text into sentences.
+
+    Args:
+        text: Text to segment.
+
+    Returns:
+        (start, end) character spans partitioning the text, in order.
+    """
+    spans = []
+    start = 0
+    for match in _BOUNDARY.finditer(text):
+        boundary = match.start()
+        is_period = match.group("punct") is not None and text[boundary - 1] == "."
+        if is_period and not _BLANK_LINE.search(match.group(0)):
+            # Ignore periods that close an abbreviation or an initial
+            token = _LAST_TOKEN.search(text[max(start, boundary - 12):boundary])
+            if token:
+                word = token.group(1).lower().rstrip(".")
+                if word in ABBREVIATIONS or len(word) == 1:
+                    continue
+        end = match.end()
+        if end <= start:
+            continue
+        spans.append((start, end))
+        start = end
+    if start < len(text):
+        spans.append((start, len(text)))
+    return spans
+
+
+def count_words(text: str) -> int:
+    """Counts whitespace-separated words."""
+    return len(_WORD.findall(text))
+
+
+def split_by_words(text: str, max_words: int) -> List[Tuple[int, int]]:
+    """
+    Splits text into consecutive spans of at most `max_words` words. Used for run-on
+    "sentences" (tables, lists without punctuation) that exceed a window on their own.
+
+    Returns:
+        (start, end) spans partitioning the text.
+    """
+    words = list(_WORD.finditer(text))
+    if len(words) <= max_words:
+        return [(0, len(text))]
+    spans = []
+    start = 0
+    for i in range(max_words, len(words), max_words):
+        end = words[i].start()
+        spans.append((start, end))
+        start = end
+    spans.append((start, len(text)))
+    return spans
@@ -0,0 +1,280 @@
+"""
+Content-addressed cache of extracted PDF page text.
+
+Every tool that needs the text of a contract (GLiNER, LexNLP, OpenNyAI, RiskAuditor)
+reads it through this module, so each PDF is parsed by PyPDF2 at most once per
+content version. Entries are keyed by the SHA-256 of the PDF bytes plus the extractor
+version, stored as one JSON line per page, and evicted least-recently-used once the
+cache grows past its size budget. Data derived from the text (such as the sentence
+index) is stored next to it as sidecar files and evicted together with its entry.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+import PyPDF2
+
+# Cache location and size budget (override via environment)
+CACHE_DIR = os.getenv("DOCUSCOUT_CACHE_DIR", ".docuscout_cache")
+TEXT_CACHE_DIR = os.path.join(CACHE_DIR, "pages")
+TEXT_CACHE_MAX_MB = float(os.getenv("DOCUSCOUT_TEXT_CACHE_MB", "512"))
+
+# Bump the trailing number whenever the extraction logic changes
+EXTRACTOR_VERSION = f"pypdf2-{PyPDF2.__version__}/1"
+
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+# (path, size, mtime_ns) -> sha256, so repeated lookups don't re-hash unchanged files
+_sha_memo: Dict[Tuple[str, int, int], str] = {}
+_eviction_lock = threading.Lock()
+
+
+def file_sha256(pdf_path: str) -> str:
+    """
+    Returns the SHA-256 hex digest of a file's bytes.
+
+    Args:
+        pdf_path: Path to the file.
+
+    Returns:
+        Hex digest string.
+    """
+    stat = os.stat(pdf_path)
+    memo_key = (os.path.abspath(pdf_path), stat.st_size, stat.st_mtime_ns)
+    if memo_key in _sha_memo:
+        return _sha_memo[memo_key]
+
+    digest = hashlib.sha256()
+    with open(pdf_path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+
+    sha = digest.hexdigest()
+    _sha_memo[memo_key] = sha
+    return sha
+
+
+def cache_key(pdf_path: str) -> str:
+    """
+    Builds the cache key for a PDF from its content hash and the extractor version.
+    """
+    sha = file_sha256(pdf_path)
+    return hashlib.sha256(f"{sha}:{EXTRACTOR_VERSION}".encode("utf-8")).hexdigest()
+
+
+def _entry_path(key: str) -> str:
+    return os.path.join(TEXT_CACHE_DIR, f"{key}.jsonl")
+
+
+def read_cached_pages(key: str) -> Optional[List[str]]:
+    """
+    Reads the cached page texts for a key, or None on a cache miss.
+    """
+    path = _entry_path(key)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            pages = [json.loads(line) for line in f]
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        # Corrupt or half-written entry: drop it and treat as a miss
+        print(f"Discarding unreadable text cache entry {key[:12]}: {e}")
+        _remove_quietly(path)
+        return None
+
+    # Refresh mtime so LRU eviction sees this entry as recently used
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+    return pages
+
+
+def has_cached_pages(key: str) -> bool:
+    """
+    Checks whether page texts for a key are cached, without reading them.
+    """
+    return os.path.exists(_entry_path(key))
+
+
+def iter_cached_pages(key: str) -> Optional[Iterator[str]]:
+    """
+    Streams cached page texts one at a time, or returns None on a cache miss.
+    Only the current page is held in memory.
+
+    The entry is opened before returning, so an eviction by another process while the
+    pages are being read cannot make a hit fail halfway: the open handle stays readable.
+    """
+    path = _entry_path(key)
+    try:
+        f = open(path, "r", encoding="utf-8")
+    except FileNotFoundError:
+        return None
+    # Refresh mtime so LRU eviction sees this entry as recently used
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+    return _iter_entry(f)
+
+
+def _iter_entry(f: TextIO) -> Iterator[str]:
+    with f:
+        for line in f:
+            yield json.loads(line)
+
+
+def cache_pages_through(key: str, pages: Iterable[str]) -> Iterator[str]:
+    """
+    Yields pages unchanged while writing them to the cache. The entry only becomes
+    visible once the whole iterable has been consumed; a partially consumed stream
+    leaves the cache untouched.
+    """
+    os.makedirs(TEXT_CACHE_DIR, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=TEXT_CACHE_DIR, suffix=".tmp")
+    completed = False
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            for page in pages:
+                f.write(json.dumps(page))
+                f.write("\n")
+                yield page
+        os.replace(tmp_path, _entry_path(key))
+        completed = True
+    finally:
+        if not completed:
+            _remove_quietly(tmp_path)
+
+    _evict_to_budget()
+
+
+def write_cached_pages(key: str, pages: List[str]) -> None:
+    """
+    Atomically writes page texts for a key and enforces the cache size budget.
+    """
+    for _ in cache_pages_through(key, pages):
+        pass
+
+
+def _sidecar_path(key: str, name: str) -> str:
+    return os.path.join(TEXT_CACHE_DIR, f"{key}.{name}.json")
+
+
+def read_sidecar(key: str, name: str) -> Optional[Any]:
+    """
+    Reads data derived from a cached entry (e.g. its sentence index), or None if missing.
+    """
+    path = _sidecar_path(key, name)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        print(f"Discarding unreadable text cache sidecar {key[:12]}.{name}: {e}")
+        _remove_quietly(path)
+        return None
+
+
+def write_sidecar(key: str, name: str, data: Any) -> None:
+    """
+    Atomically stores data derived from a cached entry; it is evicted with the entry.
+    """
+    os.makedirs(TEXT_CACHE_DIR, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=TEXT_CACHE_DIR, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, _sidecar_path(key, name))
+    except Exception:
+        _remove_quietly(tmp_path)
+        raise
+
+
+def _remove_quietly(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _evict_to_budget() -> None:
+    """
+    Deletes least-recently-used entries (with their sidecars) until the cache fits in
+    TEXT_CACHE_MAX_MB. Recency is taken from the page entry.
+    """
+    budget = int(TEXT_CACHE_MAX_MB * 1024 * 1024)
+    with _eviction_lock:
+        # key -> [mtime of the page entry, total size, paths]
+        entries: Dict[str, list] = {}
+        total = 0
+        try:
+            names = os.listdir(TEXT_CACHE_DIR)
+        except FileNotFoundError:
+            return
+        for name in names:
+            if name.endswith(".tmp"):
+                continue
+            path = os.path.join(TEXT_CACHE_DIR, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entry = entries.setdefault(name.split(".", 1)[0], [0.0, 0, []])
+            if name.endswith(".jsonl"):
+                entry[0] = stat.st_mtime
+            entry[1] += stat.st_size
+            entry[2].append(path)
+            total += stat.st_size
+
+        if total <= budget:
+            return
+
+        # Oldest first; orphaned sidecars (mtime 0) go before anything else
+        for _, size, paths in sorted(entries.values(), key=lambda e: e[0]):
+            if total <= budget:
+                break
+            for path in paths:
+                _remove_quietly(path)
+            total -= size
+
+
+def extract_page_texts(pdf_path: str) -> List[str]:
+    """
+    Extracts the text of every page with PyPDF2, bypassing the cache.
+
+    Args:
+        pdf_path: Path to the PDF file.
+
+    Returns:
+        List of page texts (empty string for pages without extractable text).
+    """
+    reader = PyPDF2.PdfReader(pdf_path)
+    return [page.extract_text() or "" for page in reader.pages]
+
+
+def load_page_texts(pdf_path: str) -> List[str]:
+    """
+    Returns the page texts of a PDF, reading through the on-disk cache.
+
+    Args:
+        pdf_path: Path to the PDF file.
+
+    Returns:
+        List of page texts, one entry per page.
+    """
+    key = cache_key(pdf_path)
+    pages = read_cached_pages(key)
+    if pages is not None:
+        return pages
+
+    pages = extract_page_texts(pdf_path)
+    try:
+        write_cached_pages(key, pages)
+    except Exception as e:
+        # Caching is an optimization; never fail extraction because of it
+        print(f"Error writing text cache for {os.path.basename(pdf_path)}: {e}")
+    return pages
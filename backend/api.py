@@ -6,9 +6,12 @@ from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import Optional, List
 import os
-import shutil
+import hashlib
+import tempfile
 from pathlib import Path
 
+from Agent.utils.text_cache import file_sha256
+
 from .agent_handler import agent_handler
 
 app = FastAPI(title="DocuScout API", version="1.0.0")
@@ -29,6 +32,37 @@ PROJECT_ROOT = BACKEND_DIR.parent
 DB_FOLDER = PROJECT_ROOT / "DB"
 DB_FOLDER.mkdir(exist_ok=True)
 
+
+def _save_upload_if_changed(upload: UploadFile, destination: Path) -> bool:
+    """
+    Writes an uploaded file to destination unless an identical file is already there.
+    The upload is staged in a temp file in the same folder, so an unchanged file keeps
+    its mtime and downstream caches keyed on it stay valid.
+    
+    Returns:
+        True if the file was new or changed and has been written, False if unchanged.
+    """
+    fd, tmp_name = tempfile.mkstemp(dir=destination.parent, suffix=".upload")
+    tmp_path = Path(tmp_name)
+    try:
+        digest = hashlib.sha256()
+        with os.fdopen(fd, "wb") as buffer:
+            for chunk in iter(lambda: upload.file.read(1024 * 1024), b""):
+                digest.update(chunk)
+                buffer.write(chunk)
+        
+        if destination.exists() and file_sha256(str(destination)) == digest.hexdigest():
+            tmp_path.unlink()
+            return False
+        
+        os.replace(tmp_path, destination)
+        return True
+    except Exception:
+        if tmp_path.exists():
+            tmp_path.unlink()
+        raise
+
+
 # Request/Response models
 class ChatRequest(BaseModel):
     message: str
@@ -46,6 +80,7 @@ class IngestResponse(BaseModel):
     error: Optional[str] = None
     session_id: Optional[str] = None
     files_uploaded: int = 0
+    files_unchanged: int = 0
 
 class PredictWarningsResponse(BaseModel):
     success: bool
@@ -75,7 +110,7 @@ async def ingest_documents(
     
     This endpoint:
     1. Receives PDF files from frontend
-    2. Saves them to DB folder
+    2. Saves new or changed files to DB folder and removes files not in this upload
     3. Calls Orchestrator agent via ADK client to ingest files
     4. Returns global session_id (same session used for all requests)
     
@@ -86,19 +121,10 @@ async def ingest_documents(
             raise HTTPException(status_code=400, detail="No files provided")
         
         
-        # Clean the DB folder before saving new files
-        # Only delete files, keep the folder itself
-        print(f"[API] Cleaning DB folder: {DB_FOLDER}")
-        for item in DB_FOLDER.iterdir():
-            if item.is_file():
-                try:
-                    item.unlink()
-                    print(f"[API] Deleted old file: {item.name}")
-                except Exception as e:
-                    print(f"[API] Error deleting {item.name}: {e}")
-
-        # Save files to DB folder
+        # Save files to DB folder, leaving byte-identical files untouched so
+        # downstream stages can skip them (see the ingestion manifest)
         saved_files = []
+        unchanged_files = []
         for file in files:
             # Validate file type
             if not file.filename.lower().endswith('.pdf'):
@@ -106,15 +132,26 @@ async def ingest_documents(
             
             # Save file to DB folder
             file_path = DB_FOLDER / file.filename
-            with open(file_path, "wb") as buffer:
-                shutil.copyfileobj(file.file, buffer)
+            if _save_upload_if_changed(file, file_path):
+                print(f"[API] Saved file: {file.filename}")
+            else:
+                unchanged_files.append(file.filename)
+                print(f"[API] Unchanged file: {file.filename}")
             saved_files.append(file.filename)
-            print(f"[API] Saved file: {file.filename}")
         
         if not saved_files:
             raise HTTPException(status_code=400, detail="No valid PDF files provided")
         
-        print(f"[API] Saved {len(saved_files)} files to DB folder")
+        # Remove files from previous uploads that are not part of this batch
+        for item in DB_FOLDER.iterdir():
+            if item.is_file() and item.name not in saved_files:
+                try:
+                    item.unlink()
+                    print(f"[API] Deleted old file: {item.name}")
+                except Exception as e:
+                    print(f"[API] Error deleting {item.name}: {e}")
+        
+        print(f"[API] Saved {len(saved_files)} files to DB folder ({len(unchanged_files)} unchanged)")
         print(f"[API] Starting ingestion via Orchestrator agent...")
         print(f"[API] Using global session_id (shared across all requests)")
         
@@ -129,7 +166,8 @@ async def ingest_documents(
             message=result.get("message", "Ingestion completed"),
             error=result.get("error"),
             session_id=result.get("session_id"),
-            files_uploaded=len(saved_files)
+            files_uploaded=len(saved_files),
+            files_unchanged=len(unchanged_files)
         )
     except HTTPException:
         raise
@@ -0,0 +1,103 @@
+import asyncio
+import sqlite3
+
+import pytest
+
+from Agent.Subagents.RiskAuditor import parallel_audit
+from Agent.Subagents.RiskAuditor.audit_cache import AuditCache, AuditInputs
+from Agent.utils.llm_json import JsonReply
+
+LAW = {"law_name": "Minimum Wages Act", "status": "Amended in 2024", "latest_change": "New wage floor"}
+
+
+def finding(law_name="Minimum Wages Act", verdict="WARNING"):
+    return {"law_name": law_name, "verdict": verdict, "explanation": "Rates to review.", "basis": "llm"}
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return AuditCache(str(tmp_path / "audit_cache.sqlite"))
+
+
+def inputs(document="doc-1", entities=("Minimum Wages Act",), law=LAW, prompt="1:3:model"):
+    return AuditInputs.of(document, entities, law, prompt)
+
+
+def test_inputs_ignore_entity_order():
+    assert inputs(entities=["a", "b"]) == inputs(entities=["b", "a"])
+
+
+def test_round_trip(cache):
+    cache.put_many("a.pdf", [(inputs(), finding())])
+    hits, stale = cache.get_many("a.pdf", {"Minimum Wages Act": inputs()})
+    assert hits == {"Minimum Wages Act": finding()}
+    assert stale == {}
+
+    assert cache.get_many("b.pdf", {"Minimum Wages Act": inputs()}) == ({}, {})
+    assert cache.get_many("a.pdf", {}) == ({}, {})
+
+
+@pytest.mark.parametrize("changed, field", [
+    ({"document": "doc-2"}, "document"),
+    ({"entities": ["Minimum Wages Act", "Factories Act"]}, "entities"),
+    ({"law": dict(LAW, latest_change="Another change")}, "law"),
+    ({"prompt": "2:3:model"}, "prompt"),
+])
+def test_changed_input_invalidates(cache, changed, field):
+    cache.put_many("a.pdf", [(inputs(), finding())])
+    hits, stale = cache.get_many("a.pdf", {"Minimum Wages Act": inputs(**changed)})
+    assert hits == {}
+    assert stale == {"Minimum Wages Act": [field]}
+
+
+def test_reaudit_replaces_row(cache):
+    cache.put_many("a.pdf", [(inputs(), finding())])
+    cache.put_many("a.pdf", [(inputs(document="doc-2"), finding(verdict="VIOLATION"))])
+    hits, _ = cache.get_many("a.pdf", {"Minimum Wages Act": inputs(document="doc-2")})
+    assert hits["Minimum Wages Act"]["verdict"] == "VIOLATION"
+    with sqlite3.connect(cache.path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM audit_cache").fetchone() == (1,)
+
+
+def test_unavailable_cache_is_a_miss(tmp_path):
+    cache = AuditCache(str(tmp_path / "missing" / "dir" / "audit_cache.sqlite"))
+    (tmp_path / "missing").write_text("not a directory")
+    assert cache.get_many("a.pdf", {"Minimum Wages Act": inputs()}) == ({}, {})
+    cache.put_many("a.pdf", [(inputs(), finding())])
+
+
+def test_audit_reuses_verdicts_until_document_changes(tmp_path, monkeypatch):
+    calls = []
+
+    async def complete_json(system_prompt, user_prompt, semaphore, timeout):
+        calls.append(user_prompt)
+        return JsonReply({"findings": [{"law_name": "Minimum Wages Act", "verdict": "WARNING", "explanation": "Review."}]})
+
+    document = {"key": "doc-1"}
+    monkeypatch.setattr(parallel_audit, "complete_json", complete_json)
+    monkeypatch.setattr(parallel_audit, "AUDIT_CACHE", True)
+    monkeypatch.setattr(parallel_audit, "audit_cache", AuditCache(str(tmp_path / "audit_cache.sqlite")))
+    monkeypatch.setattr(parallel_audit, "_document_key", lambda filename: document["key"])
+
+    compliance = {"a.pdf": [LAW]}
+    hits = {"a.pdf": {"Minimum Wages Act": [(1, "the Minimum Wages Act")]}}
+
+    def run():
+        return asyncio.run(parallel_audit.audit_files({"a.pdf": []}, compliance, hits))["a.pdf"][0]["basis"]
+
+    assert run() == "llm"
+    assert run() == "cache"
+    assert len(calls) == 1
+
+    document["key"] = "doc-2"
+    assert run() == "llm"
+    assert len(calls) == 2
+
+
+def test_prompt_version_tracks_evidence_settings(monkeypatch):
+    version = parallel_audit._prompt_version()
+    monkeypatch.setattr(parallel_audit, "SNIPPET_TOKEN_BUDGET", parallel_audit.SNIPPET_TOKEN_BUDGET * 2)
+    assert parallel_audit._prompt_version() != version
+    monkeypatch.undo()
+    monkeypatch.setattr(parallel_audit, "AUDIT_SNIPPETS_PER_LAW", parallel_audit.AUDIT_SNIPPETS_PER_LAW + 1)
+    assert parallel_audit._prompt_version() != version
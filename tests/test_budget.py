@@ -0,0 +1,34 @@
+import random
+
+from Agent.Subagents.RiskAuditor.tools import _fit_to_budget
+from Agent.utils.budget import fair_shares
+
+
+def test_fair_shares():
+    assert fair_shares([10, 20], 100) == [10, 20]
+    assert fair_shares([10, 100, 100], 110) == [10, 50, 50]
+    assert fair_shares([60, 60], 100) == [50, 50]
+    assert fair_shares([100, 10], 50) == [40, 10]
+    assert fair_shares([], 100) == []
+
+
+def test_fair_shares_never_exceed_budget_or_demand():
+    rng = random.Random(3)
+    for _ in range(500):
+        demands = [rng.randint(0, 500) for _ in range(rng.randint(1, 8))]
+        budget = rng.randint(0, 2000)
+        shares = fair_shares(demands, budget)
+        if sum(demands) <= budget:
+            assert shares == demands
+        else:
+            assert sum(shares) <= budget
+        assert all(0 <= share <= demand for share, demand in zip(shares, demands))
+
+
+def test_fit_to_budget_cuts_only_large_blocks():
+    blocks = ["a" * 10, "b" * 500, "c" * 500]
+    fitted = _fit_to_budget(blocks, 400)
+    assert fitted[0] == blocks[0]
+    assert all(len(block) <= 195 for block in fitted[1:])
+    assert all(block.endswith("(truncated to fit context budget)\n\n") for block in fitted[1:])
+    assert _fit_to_budget(blocks, 2000) == blocks
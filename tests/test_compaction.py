@@ -0,0 +1,100 @@
+import random
+
+from Agent.Subagents.Researcher.compaction import (
+    _MIN_SNIPPET_TOKENS,
+    _result_tokens,
+    compact_results,
+)
+
+FILLER = (
+    "notification gazette ministry labour employment wages schedule employer employee "
+    "inspector penalty register return contractor establishment appropriate government"
+).split()
+
+
+def snippet(rng, words):
+    return " ".join(rng.choice(FILLER) for _ in range(words))
+
+
+def random_corpus(rng):
+    laws = ["Minimum Wages Act", "Payment of Wages Act", "Factories Act", "Companies Act"]
+    shared = [snippet(rng, rng.randint(50, 300)) for _ in range(3)]
+    corpus = []
+    for law in rng.sample(laws, rng.randint(1, len(laws))):
+        results = []
+        for rank in range(rng.randint(0, 5)):
+            content = rng.choice(shared) if rng.random() < 0.4 else snippet(rng, rng.randint(10, 400))
+            results.append({
+                "title": f"{law} update {rank}",
+                "url": f"https://example.org/{law.replace(' ', '-')}/{rank}",
+                "content": f"{law} amended {content}",
+            })
+        corpus.append((law, results))
+    return corpus
+
+
+def test_within_budget_untouched():
+    corpus = [("Minimum Wages Act", [{"title": "t", "url": "u", "content": "Minimum Wages Act revised rates"}])]
+    compacted, stats = compact_results(corpus, token_budget=10_000)
+    assert compacted == corpus
+    assert stats.dropped == 0
+
+
+def test_budget_invariants():
+    rng = random.Random(11)
+    for _ in range(150):
+        corpus = random_corpus(rng)
+        budget = rng.randint(100, 3000)
+        compacted, stats = compact_results(corpus, token_budget=budget)
+
+        assert [law for law, _ in compacted] == [law for law, _ in corpus]
+        total = sum(_result_tokens(result) for _, results in compacted for result in results)
+        assert total <= budget
+        assert stats.tokens_after == total
+
+        # A reference always points to a law that kept a copy of its text
+        bodies = {result["url"]: result["content"].split(" amended ", 1)[1] for _, results in corpus for result in results}
+        held = {law: {bodies[r["url"]] for r in results if r["content"]} for law, results in compacted}
+        for _, results in compacted:
+            for result in results:
+                if "duplicate_of" in result:
+                    assert not result["content"]
+                    assert bodies[result["url"]] in held[result["duplicate_of"]]
+
+
+def test_duplicates_become_references():
+    text = "Minimum Wages Act " + " ".join(FILLER * 4)
+    corpus = [
+        ("Minimum Wages Act", [{"title": "a", "url": "https://a", "content": text}]),
+        ("Payment of Wages Act", [{"title": "b", "url": "https://b", "content": text}]),
+    ]
+    compacted, stats = compact_results(corpus, token_budget=10_000)
+    assert stats.duplicates == 1
+    assert compacted[0][1][0]["content"] == text
+    assert compacted[1][1][0] == {"title": "b", "url": "https://b", "content": "", "duplicate_of": "Minimum Wages Act"}
+
+
+def test_reference_promoted_when_keeper_cut():
+    shared = "Minimum Wages Act and Payment of Wages Act " + " ".join(FILLER * 3)
+    corpus = [
+        ("Minimum Wages Act", [
+            {"title": "Minimum Wages Act", "url": "https://big", "content": "Minimum Wages Act amended " + " ".join(FILLER * 40)},
+            {"title": "Minimum Wages Act", "url": "https://a", "content": shared},
+        ]),
+        ("Payment of Wages Act", [
+            {"title": "b", "url": "https://b", "content": shared},
+            {"title": "c", "url": "https://c", "content": " ".join(FILLER[::-1] * 40)},
+        ]),
+    ]
+    # Each law's share leaves no room for the keeper "a" after "big", while the
+    # Payment of Wages Act share has room for a trimmed copy once "c" does not fit
+    reference = _result_tokens({"title": "b", "url": "https://b", "content": ""})
+    share = reference + _MIN_SNIPPET_TOKENS + 8
+    compacted, stats = compact_results(corpus, token_budget=2 * share)
+
+    assert [result["url"] for result in compacted[0][1]] == ["https://big"]
+    (promoted,) = compacted[1][1]
+    assert promoted["url"] == "https://b"
+    assert promoted["content"] and shared.startswith(promoted["content"].removesuffix(" ..."))
+    assert "duplicate_of" not in promoted
+    assert stats.tokens_after <= 2 * share
@@ -0,0 +1,77 @@
+import asyncio
+import json
+
+from Agent.Subagents.ClauseHunter import curation
+from Agent.Subagents.ClauseHunter.curation import curate_playbook, reconcile
+from Agent.utils.llm_json import JsonReply
+
+
+def test_reconcile_drops_invented_names():
+    assert reconcile(["Companies Act", "Frank Act"], ["Companies Act", "Dodd-Frank Act"]) == ["Companies Act"]
+
+
+def test_reconcile_keeps_document_spelling():
+    candidates = ["the Minimum Wages Act, 1948", "ESI Act", "Acme Ltd"]
+    assert reconcile(candidates, ["Minimum Wages Act", "Employees' State Insurance Act"]) == [
+        "ESI Act",
+        "the Minimum Wages Act, 1948",
+    ]
+
+
+def playbook(*files):
+    return {"playbook": [{"filename": name, "legal_entities": entities} for name, entities in files]}
+
+
+def stub_replies(monkeypatch, replies, delays=None):
+    """Answers each file's call with replies[filename], finishing after delays[filename] seconds."""
+    calls = []
+
+    async def complete_json(system_prompt, user_prompt, semaphore, timeout):
+        filename = user_prompt.split("\n", 1)[0].removeprefix("File: ")
+        calls.append(filename)
+        async with semaphore:
+            await asyncio.sleep((delays or {}).get(filename, 0))
+        return replies[filename]
+
+    monkeypatch.setattr(curation, "complete_json", complete_json)
+    return calls
+
+
+def test_failed_or_unusable_reply_keeps_rule_based_list(monkeypatch):
+    calls = stub_replies(monkeypatch, {
+        "a.pdf": JsonReply(None, "timed out"),
+        "b.pdf": JsonReply(None, "failed", "proxy down"),
+        "c.pdf": JsonReply({"unexpected": True}),
+        "d.pdf": JsonReply({"legal_entities": ["Factories Act"]}),
+    })
+    curated = asyncio.run(curate_playbook(playbook(
+        ("a.pdf", ["Companies Act", "Frank Act"]),
+        ("b.pdf", ["Minimum Wages Act"]),
+        ("c.pdf", ["ESI Act"]),
+        ("d.pdf", ["Factories Act", "Acme Ltd"]),
+        ("e.pdf", []),
+    )))
+    assert curated == playbook(
+        ("a.pdf", ["Companies Act", "Frank Act"]),
+        ("b.pdf", ["Minimum Wages Act"]),
+        ("c.pdf", ["ESI Act"]),
+        ("d.pdf", ["Factories Act"]),
+        ("e.pdf", []),
+    )
+    # Files without candidates make no call
+    assert sorted(calls) == ["a.pdf", "b.pdf", "c.pdf", "d.pdf"]
+
+
+def test_output_does_not_depend_on_completion_order(monkeypatch):
+    files = [(f"{i}.pdf", ["Companies Act", "Minimum Wages Act", "Frank Act"]) for i in range(6)]
+    replies = {
+        name: JsonReply({"legal_entities": ["Minimum Wages Act", "Companies Act"]})
+        for name, _ in files
+    }
+    results = []
+    for delays in ({name: 0.01 * i for i, (name, _) in enumerate(files)},
+                   {name: 0.01 * (len(files) - i) for i, (name, _) in enumerate(files)}):
+        stub_replies(monkeypatch, replies, delays)
+        results.append(json.dumps(asyncio.run(curate_playbook(playbook(*files)))))
+    assert results[0] == results[1]
+    assert json.loads(results[0]) == playbook(*[(name, ["Companies Act", "Minimum Wages Act"]) for name, _ in files])
@@ -0,0 +1,59 @@
+import random
+
+from Agent.utils.law_locator import DocumentIndex, LawLocator, LawMatch, _lower_preserving_offsets
+from Agent.utils.normalize import normalize_text
+
+WORDS = ["the", "Companies", "Act", "act,", "2013", "Minimum", "Wages", "ESI", "Acts", "of", "-", "\n", "  "]
+NAMES = ["Companies Act", "Act", "Companies Act, 2013", "Minimum Wages Act", "ESI Act", "act of", "Wages"]
+
+
+def brute_force(index, law_names):
+    """Every occurrence of every name by plain substring search, on word boundaries."""
+    matches = {name: [] for name in law_names}
+    for (page, _), normalized, lowered in zip(index.pages, index.normalized, index.lowered):
+        for name in law_names:
+            pattern = _lower_preserving_offsets(normalize_text(name))
+            start = lowered.find(pattern)
+            while start != -1:
+                end = start + len(pattern)
+                before = lowered[start - 1] if start else " "
+                after = lowered[end] if end < len(lowered) else " "
+                if not (before.isalnum() and pattern[0].isalnum()) and not (after.isalnum() and pattern[-1].isalnum()):
+                    matches[name].append(LawMatch(name, page, *normalized.to_original(start, end)))
+                start = lowered.find(pattern, start + 1)
+    for name in matches:
+        matches[name].sort(key=lambda m: (m.page, m.start))
+    return matches
+
+
+def test_matches_brute_force_on_random_pages():
+    rng = random.Random(7)
+    for _ in range(200):
+        pages = [
+            (number, " ".join(rng.choice(WORDS) for _ in range(rng.randint(0, 40))))
+            for number in range(1, 4)
+        ]
+        index = DocumentIndex(pages)
+        names = rng.sample(NAMES, rng.randint(1, len(NAMES)))
+        assert LawLocator(names).locate(index) == brute_force(index, names)
+
+
+def test_match_offsets_point_into_original_text():
+    text = "Subject to the\n  COMPANIES\nAct, 2013 and the Minimum Wages Act."
+    index = DocumentIndex([(1, text)])
+    found = LawLocator(["Companies Act", "Minimum Wages Act"]).locate(index)
+    (companies,) = found["Companies Act"]
+    assert text[companies.start:companies.end] == "COMPANIES\nAct"
+    (wages,) = found["Minimum Wages Act"]
+    assert text[wages.start:wages.end] == "Minimum Wages Act"
+
+
+def test_whole_words_only():
+    index = DocumentIndex([(1, "The ESI Acts and ESI Act1 differ from the ESI Act.")])
+    (match,) = LawLocator(["ESI Act"]).locate(index)["ESI Act"]
+    assert match.start == index.pages[0][1].rindex("ESI Act")
+
+
+def test_every_name_is_reported():
+    index = DocumentIndex([(1, "Nothing relevant here."), (2, "")])
+    assert LawLocator(["Companies Act", "", "Companies Act"]).locate(index) == {"Companies Act": []}
@@ -0,0 +1,70 @@
+from Agent.utils.law_names import canonical_law_key, group_law_names, law_name_spellings, law_year
+
+
+def keys(groups):
+    return [group.key for group in groups]
+
+
+def test_canonical_key_folds_spellings():
+    assert canonical_law_key("The Minimum Wages Act, 1948") == "minimum wages act"
+    assert canonical_law_key("MW Act") == "minimum wages act"
+    assert canonical_law_key("Cr.P.C.") == "code of criminal procedure"
+    assert law_year("Minimum Wages Act, 1948") == "1948"
+    assert law_year("Minimum Wages Act") is None
+
+
+def test_variants_merge():
+    groups = group_law_names([
+        "Minimum Wages Act", "the Minimum Wages Act, 1948", "MW Act",
+        "Industrial Dispute Act", "Industrial Disputes Act",
+    ])
+    assert keys(groups) == ["minimum wages act", "industrial dispute act"]
+    assert groups[0].name == "the Minimum Wages Act, 1948"
+    assert groups[0].variants == ["Minimum Wages Act", "the Minimum Wages Act, 1948", "MW Act"]
+
+
+def test_different_years_are_split():
+    groups = group_law_names(["Companies Act", "Companies Act, 1956", "Companies Act, 2013"])
+    assert keys(groups) == ["companies act 1956", "companies act 2013"]
+    # A variant without a year stays with the first year seen
+    assert groups[0].variants == ["Companies Act", "Companies Act, 1956"]
+    assert groups[1].variants == ["Companies Act, 2013"]
+
+
+def test_numbers_guard_fuzzy_merges():
+    groups = group_law_names(["Section 17 of the Factories Act", "Section 18 of the Factories Act"])
+    assert len(groups) == 2
+
+
+def test_short_keys_and_instrument_types_do_not_merge():
+    assert len(group_law_names(["ESI Act", "EPF Act"])) == 2
+    assert len(group_law_names(["Companies Act", "Companies Rules"])) == 2
+
+
+def test_ambiguous_abbreviation_resolved_by_spelled_out_name():
+    groups = group_law_names(["IT Act", "Information Technology Act, 2000"])
+    assert len(groups) == 1
+    assert groups[0].name == "Information Technology Act, 2000"
+
+
+def test_ambiguous_abbreviation_kept_apart():
+    groups = group_law_names(["IT Act"])
+    assert keys(groups) == ["it act"]
+    assert groups[0].name == "IT Act"
+
+    groups = group_law_names(["IT Act", "Information Technology Act", "Income Tax Act"])
+    assert keys(groups) == ["it act", "information technology act", "income tax act"]
+
+
+def test_key_does_not_depend_on_order():
+    names = ["Industrial Disputes Act", "Industrial Dispute Act"]
+    assert keys(group_law_names(names)) == keys(group_law_names(names[::-1]))
+
+
+def test_spellings_searched_for_a_law():
+    assert law_name_spellings("Minimum Wages Act, 1948") == ["Minimum Wages Act", "mw act"]
+    assert law_name_spellings("Employees' State Insurance Act") == ["employees state insurance act", "esi act"]
+    assert law_name_spellings("ESI Act") == ["employees state insurance act"]
+    assert law_name_spellings("Information Technology Act, 2000") == ["Information Technology Act", "it act"]
+    assert law_name_spellings("IT Act") == ["information technology act", "income tax act"]
+    assert law_name_spellings("Factories Act") == []
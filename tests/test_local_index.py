@@ -0,0 +1,59 @@
+import os
+
+import pytest
+
+from Agent.Subagents.Researcher import local_index
+
+WAGES = "Minimum Wages Act, 1948\n\nThe appropriate Government shall fix the minimum rates of wages payable to employees."
+FACTORIES = "Factories Act, 1948\n\nEvery factory shall be kept clean and free from effluvia arising from any drain."
+
+
+@pytest.fixture
+def statute_dir(tmp_path, monkeypatch):
+    directory = tmp_path / "statutes"
+    directory.mkdir()
+    (directory / "minimum_wages.txt").write_text(WAGES)
+    monkeypatch.setattr(local_index, "STATUTE_DIR", str(directory))
+    monkeypatch.setattr(local_index, "STATUTE_INDEX_PATH", str(tmp_path / "statute_index.joblib"))
+    monkeypatch.setattr(local_index, "_index", None)
+    monkeypatch.setattr(local_index, "_index_fingerprint", None)
+    return directory
+
+
+def urls(response):
+    return [result["url"] for result in response["results"]]
+
+
+def test_search_by_law_name(statute_dir):
+    (statute_dir / "factories.txt").write_text(FACTORIES)
+    index = local_index.get_statute_index()
+    assert urls(index.search("Minimum Wages Act")) == ["local://minimum_wages.txt#1"]
+    assert index.search("Unknown Widgets Act") == {"query": "Unknown Widgets Act", "results": []}
+
+
+def test_index_reused_while_folder_unchanged(statute_dir):
+    assert local_index.get_statute_index() is local_index.get_statute_index()
+
+
+def test_new_statutes_picked_up_without_restart(statute_dir):
+    index = local_index.get_statute_index()
+    assert urls(index.search("Factories Act")) == []
+
+    (statute_dir / "factories.txt").write_text(FACTORIES)
+    reloaded = local_index.get_statute_index()
+    assert reloaded is not index
+    assert urls(reloaded.search("Factories Act")) == ["local://factories.txt#1"]
+
+
+def test_persisted_index_rebuilt_on_change(statute_dir):
+    local_index.load_statute_index(local_index.STATUTE_DIR, local_index.STATUTE_INDEX_PATH)
+    saved = os.path.getmtime(local_index.STATUTE_INDEX_PATH)
+    os.utime(local_index.STATUTE_INDEX_PATH, (saved - 10, saved - 10))
+
+    local_index.load_statute_index(local_index.STATUTE_DIR, local_index.STATUTE_INDEX_PATH)
+    assert os.path.getmtime(local_index.STATUTE_INDEX_PATH) == saved - 10
+
+    (statute_dir / "factories.txt").write_text(FACTORIES)
+    index = local_index.load_statute_index(local_index.STATUTE_DIR, local_index.STATUTE_INDEX_PATH)
+    assert os.path.getmtime(local_index.STATUTE_INDEX_PATH) > saved - 10
+    assert len({p["url"].split("#")[0] for p in index.passages}) == 2
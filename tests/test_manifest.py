@@ -0,0 +1,75 @@
+import os
+
+import pytest
+from filelock import FileLock
+
+from Agent.utils import manifest
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(manifest, "MANIFEST_PATH", str(tmp_path / "manifest.json"))
+    monkeypatch.setattr(manifest, "RESULTS_DIR", str(tmp_path / "results"))
+    monkeypatch.setattr(manifest, "_manifest_file_lock", FileLock(str(tmp_path / "manifest.json.lock")))
+    return tmp_path
+
+
+@pytest.fixture
+def pdf(tmp_path):
+    path = tmp_path / "Contract.pdf"
+    path.write_bytes(b"%PDF-1.4 original")
+    return path
+
+
+def test_result_round_trip(cache_dir, pdf):
+    manifest.store_result(str(pdf), "gliner", "v1", {"entities": ["Companies Act"]})
+    assert manifest.get_cached_result(str(pdf), "gliner", "v1") == {"entities": ["Companies Act"]}
+    assert manifest.get_cached_result(str(pdf), "lexnlp", "v1") is None
+
+
+def test_result_invalidated_by_version(cache_dir, pdf):
+    manifest.store_result(str(pdf), "gliner", "v1", ["a"])
+    assert manifest.get_cached_result(str(pdf), "gliner", "v2") is None
+
+
+def test_result_invalidated_by_content(cache_dir, pdf):
+    manifest.store_result(str(pdf), "gliner", "v1", ["a"])
+    pdf.write_bytes(b"%PDF-1.4 edited contract")
+    assert manifest.get_cached_result(str(pdf), "gliner", "v1") is None
+
+
+def test_results_do_not_touch_manifest(cache_dir, tmp_path):
+    for i in range(3):
+        path = tmp_path / f"file{i}.pdf"
+        path.write_bytes(f"%PDF-1.4 {i}".encode())
+        manifest.store_result(str(path), "gliner", "v1", [i])
+    assert not os.path.exists(manifest.MANIFEST_PATH)
+    assert len(os.listdir(manifest.RESULTS_DIR)) == 3
+
+
+def test_unreadable_result_is_a_miss(cache_dir, pdf):
+    manifest.store_result(str(pdf), "gliner", "v1", ["a"])
+    path = manifest._result_path(manifest.file_sha256(str(pdf)), "gliner")
+    with open(path, "w") as f:
+        f.write("{not json")
+    assert manifest.get_cached_result(str(pdf), "gliner", "v1") is None
+
+
+def test_store_document_tracks_content(cache_dir, pdf):
+    manifest.set_store_document(str(pdf), "fileSearchStores/a", "documents/1")
+    record = manifest.get_store_document(str(pdf), "fileSearchStores/a")
+    assert record == {
+        "store": "fileSearchStores/a",
+        "document": "documents/1",
+        "sha256": manifest.file_sha256(str(pdf)),
+    }
+    assert manifest.get_store_document(str(pdf), "fileSearchStores/b") is None
+
+    pdf.write_bytes(b"%PDF-1.4 edited contract")
+    assert record["sha256"] != manifest.file_sha256(str(pdf))
+
+
+def test_forget_files(cache_dir, pdf):
+    manifest.set_store_document(str(pdf), "fileSearchStores/a", "documents/1")
+    manifest.forget_files(["Contract.pdf"])
+    assert manifest.load_manifest()["files"] == {}
@@ -0,0 +1,61 @@
+import random
+
+from Agent.utils.normalize import normalize_text, normalize_with_offsets
+
+
+def test_normalization_rules():
+    assert normalize_with_offsets("Section\n \n7").text == "Section 7"
+    assert normalize_with_offsets("employ-\nment").text == "employment"
+    assert normalize_with_offsets("Anti-\nMoney").text == "Anti-Money"
+    assert normalize_with_offsets("“Dodd–Frank” ﬁnal").text == '"Dodd-Frank" final'
+    assert normalize_text("  Companies   Act \n") == "Companies Act"
+
+
+def test_offsets_cover_every_character():
+    norm = normalize_with_offsets("a  “b”\n-c ﬁ")
+    assert len(norm.offsets) == len(norm.text)
+    assert norm.offsets == sorted(norm.offsets)
+
+
+def test_to_original_maps_spans_back():
+    text = "The  Minimum\nWages Act, ‘1948’ and the employ-\nment rules"
+    norm = normalize_with_offsets(text)
+
+    start = norm.text.index("Minimum Wages Act")
+    begin, end = norm.to_original(start, start + len("Minimum Wages Act"))
+    assert text[begin:end] == "Minimum\nWages Act"
+
+    start = norm.text.index("'1948'")
+    begin, end = norm.to_original(start, start + 6)
+    assert text[begin:end] == "‘1948’"
+
+    start = norm.text.index("employment")
+    begin, end = norm.to_original(start, start + len("employment"))
+    assert text[begin:end] == "employ-\nment"
+
+
+def test_to_original_of_ligature_and_empty_spans():
+    text = "ﬁne print"
+    norm = normalize_with_offsets(text)
+    assert norm.to_original(0, 1) == (0, 1)
+    assert norm.to_original(0, 2) == (0, 1)
+    assert norm.to_original(3, 3) == (2, 2)
+    assert norm.to_original(len(norm.text), len(norm.text)) == (len(text), len(text))
+    assert normalize_with_offsets("").to_original(0, 0) == (0, 0)
+
+
+def test_to_original_keeps_letters_and_digits():
+    rng = random.Random(13)
+    alphabet = ["a", "B", " ", "\n", "\t", "-", "–", "‘", "”", "\u00ad", "7"]
+
+    def alnum(s):
+        return "".join(c for c in s if c.isalnum())
+
+    for _ in range(300):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 30)))
+        norm = normalize_with_offsets(text)
+        for start in range(len(norm.text)):
+            for end in range(start + 1, len(norm.text) + 1):
+                begin, stop = norm.to_original(start, end)
+                assert 0 <= begin < stop <= len(text)
+                assert alnum(text[begin:stop]) == alnum(norm.text[start:end])
@@ -0,0 +1,178 @@
+import asyncio
+
+from Agent.Subagents.RiskAuditor import parallel_audit
+from Agent.Subagents.RiskAuditor.parallel_audit import (
+    _search_names,
+    audit_files,
+    classify_by_rules,
+    law_mentions,
+    match_findings,
+    normalize_verdict,
+)
+from Agent.utils.llm_json import JsonReply
+
+
+def finding(law_name, verdict="WARNING", **fields):
+    return {"law_name": law_name, "verdict": verdict, "explanation": f"about {law_name}", **fields}
+
+
+def laws(*names):
+    return [{"law_name": name} for name in names]
+
+
+def matched(results):
+    return [(f["law_name"], f["basis"], f["explanation"]) for f in results]
+
+
+def test_normalize_verdict():
+    assert normalize_verdict("🔴 Violation") == "VIOLATION"
+    assert normalize_verdict("not_found") == "NOT FOUND"
+    assert normalize_verdict("NotFound") == "NOT FOUND"
+    assert normalize_verdict("compliant.") == "COMPLIANT"
+    assert normalize_verdict("maybe") is None
+    assert normalize_verdict(None) is None
+
+
+def test_match_by_name_and_canonical_key():
+    results = match_findings(
+        laws("Minimum Wages Act, 1948", "ESI Act"),
+        [finding("The Minimum Wages Act, 1948"), finding("Employees' State Insurance Act", "compliant")],
+        {}
+    )
+    assert matched(results) == [
+        ("Minimum Wages Act, 1948", "llm", "about The Minimum Wages Act, 1948"),
+        ("ESI Act", "llm", "about Employees' State Insurance Act"),
+    ]
+    assert results[1]["verdict"] == "COMPLIANT"
+
+
+def test_years_must_agree():
+    results = match_findings(laws("Companies Act, 1956"), [finding("Companies Act, 2013")], {})
+    assert matched(results)[0][:2] == ("Companies Act, 1956", "fallback")
+
+    results = match_findings(
+        laws("Companies Act, 1956", "Companies Act, 2013"),
+        [finding("The Companies Act 2013")],
+        {"Companies Act, 1956": [(1, "under the Companies Act")]}
+    )
+    assert [f["basis"] for f in results] == ["fallback", "llm"]
+    assert results[0]["verdict"] == "WARNING"
+
+
+def test_name_without_year_matches_only_one_law():
+    results = match_findings(laws("Companies Act, 2013"), [finding("Companies Act")], {})
+    assert matched(results)[0][1] == "llm"
+
+    results = match_findings(laws("Companies Act"), [finding("Companies Act, 2013")], {})
+    assert matched(results)[0][1] == "llm"
+
+    results = match_findings(laws("Companies Act, 1956", "Companies Act, 2013"), [finding("Companies Act")], {})
+    assert [f["basis"] for f in results] == ["fallback", "fallback"]
+
+
+def test_unusable_findings_fall_back():
+    results = match_findings(
+        laws("Minimum Wages Act", "Factories Act"),
+        [finding("Minimum Wages Act", "unclear"), finding("Payment of Wages Act")],
+        {"Minimum Wages Act": [(2, "wages shall be paid")], "Factories Act": []}
+    )
+    assert [(f["verdict"], f["basis"]) for f in results] == [("WARNING", "fallback"), ("NOT FOUND", "fallback")]
+    assert results[0]["contract_text"] == "...wages shall be paid..."
+
+
+def test_recommendation_only_for_risks():
+    results = match_findings(
+        laws("Minimum Wages Act", "Factories Act"),
+        [
+            finding("Minimum Wages Act", "VIOLATION", recommendation="Raise the rates."),
+            finding("Factories Act", "COMPLIANT", recommendation="Nothing to do."),
+        ],
+        {}
+    )
+    assert [f["recommendation"] for f in results] == ["Raise the rates.", ""]
+
+
+UNAMENDED = {"status": "No recent amendments"}
+AMENDED = {"status": "Amended in 2024", "latest_change": "New wage floor"}
+
+
+def test_rules_rule_not_found_only_without_any_spelling():
+    result = classify_by_rules({"law_name": "Minimum Wages Act, 1948", **UNAMENDED}, [], [])
+    assert (result["verdict"], result["basis"]) == ("NOT FOUND", "rules")
+
+    # Found only as "Minimum Wages Act": the model decides
+    mentions = [(3, "as per the Minimum Wages Act")]
+    assert classify_by_rules({"law_name": "Minimum Wages Act, 1948", **UNAMENDED}, [], mentions) is None
+
+
+def test_rules_compliant_when_unamended_and_named():
+    exact = [(2, "under the Factories Act"), (5, "the Factories Act applies"), (2, "Factories Act")]
+    result = classify_by_rules({"law_name": "Factories Act", **UNAMENDED}, exact, exact)
+    assert (result["verdict"], result["basis"]) == ("COMPLIANT", "rules")
+    assert result["contract_text"] == "...under the Factories Act..."
+    assert "3 time(s) (page 2, 5)" in result["explanation"]
+
+    assert classify_by_rules({"law_name": "Factories Act", **AMENDED}, exact, exact) is None
+
+
+def test_law_mentions_merge_spellings():
+    hits = {
+        "Employees' State Insurance Act, 1948": [(1, "the Employees' State Insurance Act, 1948")],
+        "Employees' State Insurance Act": [(1, "the Employees' State Insurance Act, 1948")],
+        "esi act": [(4, "contributions under the ESI Act")],
+    }
+    exact, mentions = law_mentions("Employees' State Insurance Act, 1948", hits)
+    assert exact == [(1, "the Employees' State Insurance Act, 1948")]
+    assert mentions == [(1, "the Employees' State Insurance Act, 1948"), (4, "contributions under the ESI Act")]
+
+
+def test_search_names_include_spellings():
+    names = _search_names({"a.pdf": [{"law_name": "Minimum Wages Act, 1948"}, {"law_name": "ESI Act"}], "b.pdf": []})
+    assert names == {"a.pdf": ["Minimum Wages Act, 1948", "Minimum Wages Act", "mw act", "ESI Act", "employees state insurance act"]}
+
+
+def test_only_undecided_laws_reach_the_model(monkeypatch):
+    prompts = []
+
+    async def complete_json(system_prompt, user_prompt, semaphore, timeout):
+        prompts.append(user_prompt)
+        return JsonReply({"findings": [
+            {"law_name": "Minimum Wages Act, 1948", "verdict": "VIOLATION", "explanation": "Rates below the floor.",
+             "recommendation": "Raise the rates."},
+            {"law_name": "ESI Act", "verdict": "COMPLIANT", "explanation": "Contributions covered."},
+        ]})
+
+    monkeypatch.setattr(parallel_audit, "complete_json", complete_json)
+    monkeypatch.setattr(parallel_audit, "AUDIT_CACHE", False)
+    compliance = {"a.pdf": [
+        {"law_name": "Minimum Wages Act, 1948", **AMENDED},
+        {"law_name": "Factories Act", **UNAMENDED},
+        {"law_name": "Companies Act, 2013", **UNAMENDED},
+        {"law_name": "ESI Act", **UNAMENDED},
+    ]}
+    hits = {"a.pdf": {
+        "Minimum Wages Act": [(1, "wages under the Minimum Wages Act")],
+        "Factories Act": [(2, "the Factories Act")],
+        "employees state insurance act": [(3, "the Employees State Insurance Act")],
+    }}
+    findings = asyncio.run(audit_files({"a.pdf": []}, compliance, hits))["a.pdf"]
+
+    assert [(f["law_name"], f["verdict"], f["basis"]) for f in findings] == [
+        ("Minimum Wages Act, 1948", "VIOLATION", "llm"),
+        ("Factories Act", "COMPLIANT", "rules"),
+        ("Companies Act, 2013", "NOT FOUND", "rules"),
+        ("ESI Act", "COMPLIANT", "llm"),
+    ]
+    (prompt,) = prompts
+    assert "### Minimum Wages Act, 1948" in prompt and "### ESI Act" in prompt
+    assert "Factories Act" not in prompt and "Companies Act" not in prompt
+    assert "Page 3: ...the Employees State Insurance Act..." in prompt
+
+
+def test_unsearchable_file_falls_back_without_a_call(monkeypatch):
+    async def complete_json(*args):
+        raise AssertionError("no call expected")
+
+    monkeypatch.setattr(parallel_audit, "complete_json", complete_json)
+    findings = asyncio.run(audit_files({}, {"a.pdf": [{"law_name": "Factories Act"}]}, {"a.pdf": "File not found"}))
+    assert [(f["verdict"], f["basis"]) for f in findings["a.pdf"]] == [("WARNING", "fallback")]
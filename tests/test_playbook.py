@@ -0,0 +1,107 @@
+import json
+
+from Agent.Subagents.ClauseHunter.playbook import (
+    build_playbook,
+    build_playbook_from_state,
+    collect_entities,
+    curate_entities,
+    normalize_entity,
+    summarize_playbook,
+    write_playbook,
+)
+
+
+def entity(text, label="act", score=None):
+    return {"text": text, "label": label, "score": score}
+
+
+def test_normalize_entity():
+    assert normalize_entity("Section\n \n7") == "Section 7"
+    assert normalize_entity("and Exchange Act") == "Exchange Act"
+    assert normalize_entity("under the Companies Act, 2013.") == "Companies Act, 2013"
+    assert normalize_entity("“Minimum Wages Act”;") == "Minimum Wages Act"
+    assert normalize_entity("Section 7 (Warranties") == "Section 7"
+    assert normalize_entity("Cr.P.C.") == "Cr.P.C."
+
+
+def test_normalize_entity_drops_fragments():
+    assert normalize_entity("the Act") == ""
+    assert normalize_entity("Sections") == ""
+    assert normalize_entity("12.") == ""
+    assert normalize_entity("of") == ""
+
+
+def test_collect_entities_labels_every_extractor():
+    entities = collect_entities(
+        {"a.pdf": [{"text": "Companies Act", "label": "Statute", "score": 0.9}, {"label": "act"}], "c.pdf": "error"},
+        {"a.pdf": {"acts": ["Minimum Wages Act", ""]}, "b.pdf": {"error": "no text"}},
+        {"b.pdf": {"statutes": ["Factories Act"], "provisions": ["Section 7"]}}
+    )
+    assert entities == {
+        "a.pdf": [entity("Companies Act", "statute", 0.9), entity("Minimum Wages Act")],
+        "b.pdf": [entity("Factories Act", "statute"), entity("Section 7", "provision")],
+        "c.pdf": [],
+    }
+    assert collect_entities(None, None, None) == {}
+
+
+def test_curate_entities_filters_labels_and_scores():
+    entities = [
+        entity("Companies Act", "statute", 0.9),
+        entity("Factories Act", "statute", 0.4),
+        entity("Acme Ltd", "organization", 0.99),
+        entity("Minimum Wages Act"),
+        entity("Section 7", ""),
+    ]
+    assert curate_entities(entities, min_score=0.5) == ["Companies Act", "Minimum Wages Act", "Section 7"]
+    # A zero threshold keeps every scored entity
+    assert curate_entities(entities, min_score=0) == ["Companies Act", "Factories Act", "Minimum Wages Act", "Section 7"]
+    assert curate_entities(entities, labels=["Organization"], min_score=0) == ["Acme Ltd", "Section 7"]
+
+
+def test_curate_entities_merges_variants_in_document_spelling():
+    entities = [
+        entity("the Minimum Wages Act, 1948"),
+        entity("Minimum Wages Act"),
+        entity("MW Act"),
+        entity("ESI Act"),
+        entity("Industrial Dispute Act"),
+        entity("Industrial Disputes Act"),
+        entity("Companies Act, 1956"),
+        entity("Companies Act, 2013"),
+        entity("ESI Act"),
+    ]
+    assert curate_entities(entities, min_score=0) == [
+        "Companies Act, 1956",
+        "Companies Act, 2013",
+        "ESI Act",
+        "Industrial Dispute Act",
+        "Minimum Wages Act, 1948",
+    ]
+
+
+def test_build_playbook_schema_and_order():
+    playbook = build_playbook(
+        {"b.pdf": [{"text": "Companies Act", "label": "statute", "score": 0.9}]},
+        {"a.pdf": {"acts": ["Minimum Wages Act", "the Act"]}},
+        {"c.pdf": {"statutes": [], "provisions": []}},
+        min_score=0
+    )
+    assert playbook == {
+        "playbook": [
+            {"filename": "a.pdf", "legal_entities": ["Minimum Wages Act"]},
+            {"filename": "b.pdf", "legal_entities": ["Companies Act"]},
+            {"filename": "c.pdf", "legal_entities": []},
+        ]
+    }
+    assert summarize_playbook(playbook) == "Dynamic Playbook built with 2 legal entities across 3 files."
+
+
+def test_build_playbook_from_state(tmp_path):
+    state = {"clausehunter:lexnlp": {"a.pdf": {"acts": ["Factories Act"]}}}
+    playbook = build_playbook_from_state(state)
+    assert playbook == {"playbook": [{"filename": "a.pdf", "legal_entities": ["Factories Act"]}]}
+
+    path = tmp_path / "dynamic_playbook.json"
+    write_playbook(playbook, str(path))
+    assert json.loads(path.read_text()) == playbook
@@ -0,0 +1,44 @@
+import pytest
+
+from Agent.Subagents.Researcher.search_cache import SearchCache, search_cache_key
+
+RESULTS = [{"title": "Minimum Wages Act", "url": "https://example.org", "content": "Revised rates"}]
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return SearchCache(str(tmp_path / "tavily_cache.sqlite"), ttl_hours=1)
+
+
+def test_key_ignores_domain_order_and_case():
+    a = search_cache_key("minimum wages act", "India", ["a.gov.in", "B.gov.in"], "{law}")
+    b = search_cache_key("minimum wages act", " india", ["b.gov.in", "a.gov.in"], "{law}")
+    assert a == b
+    assert a != search_cache_key("minimum wages act", "India", ["a.gov.in"], "{law}")
+    assert a != search_cache_key("minimum wages act", "India", ["a.gov.in", "b.gov.in"], "{law} amendment")
+
+
+def test_round_trip(cache):
+    assert cache.get("key") is None
+    cache.put("key", "Minimum Wages Act", "India", "query", RESULTS)
+    assert cache.get("key") == (RESULTS, True)
+
+
+def test_stale_entry_is_returned_as_not_fresh(tmp_path):
+    cache = SearchCache(str(tmp_path / "tavily_cache.sqlite"), ttl_hours=0)
+    cache.put("key", "Minimum Wages Act", "India", "query", RESULTS)
+    assert cache.get("key") == (RESULTS, False)
+
+
+def test_refresh_claimed_once(cache):
+    assert cache.claim_refresh("key")
+    assert not cache.claim_refresh("key")
+    cache.release_refresh("key")
+    assert cache.claim_refresh("key")
+
+
+def test_unavailable_cache_is_a_miss(tmp_path):
+    cache = SearchCache(str(tmp_path / "missing" / "dir" / "tavily_cache.sqlite"))
+    (tmp_path / "missing").write_text("not a directory")
+    assert cache.get("key") is None
+    cache.put("key", "Minimum Wages Act", "India", "query", RESULTS)
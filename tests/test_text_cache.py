@@ -0,0 +1,64 @@
+import os
+
+import pytest
+
+from Agent.utils import text_cache
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    directory = tmp_path / "pages"
+    monkeypatch.setattr(text_cache, "TEXT_CACHE_DIR", str(directory))
+    return directory
+
+
+def test_cache_key_changes_with_content(tmp_path):
+    pdf = tmp_path / "contract.pdf"
+    pdf.write_bytes(b"%PDF-1.4 first")
+    first = text_cache.cache_key(str(pdf))
+    assert text_cache.cache_key(str(pdf)) == first
+
+    pdf.write_bytes(b"%PDF-1.4 second version")
+    assert text_cache.cache_key(str(pdf)) != first
+
+
+def test_cache_key_is_independent_of_path(tmp_path):
+    a = tmp_path / "a.pdf"
+    b = tmp_path / "b.pdf"
+    a.write_bytes(b"%PDF-1.4 same")
+    b.write_bytes(b"%PDF-1.4 same")
+    assert text_cache.cache_key(str(a)) == text_cache.cache_key(str(b))
+
+
+def test_cache_key_changes_with_extractor_version(tmp_path, monkeypatch):
+    pdf = tmp_path / "contract.pdf"
+    pdf.write_bytes(b"%PDF-1.4")
+    before = text_cache.cache_key(str(pdf))
+    monkeypatch.setattr(text_cache, "EXTRACTOR_VERSION", text_cache.EXTRACTOR_VERSION + "-next")
+    assert text_cache.cache_key(str(pdf)) != before
+
+
+def test_pages_round_trip(cache_dir):
+    pages = ["first page", "", "third ‘page’"]
+    text_cache.write_cached_pages("key", pages)
+    assert text_cache.has_cached_pages("key")
+    assert text_cache.read_cached_pages("key") == pages
+    assert list(text_cache.iter_cached_pages("key")) == pages
+    assert text_cache.read_cached_pages("other") is None
+    assert text_cache.iter_cached_pages("other") is None
+
+
+def test_partially_consumed_stream_is_not_cached(cache_dir):
+    stream = text_cache.cache_pages_through("key", ["one", "two"])
+    assert next(stream) == "one"
+    stream.close()
+    assert not text_cache.has_cached_pages("key")
+    assert not [name for name in os.listdir(cache_dir) if name.endswith(".tmp")]
+
+
+def test_iter_cached_pages_survives_eviction(cache_dir):
+    text_cache.write_cached_pages("key", ["one", "two"])
+    pages = text_cache.iter_cached_pages("key")
+    # Another process evicts the entry before the first page is read
+    os.remove(text_cache._entry_path("key"))
+    assert list(pages) == ["one", "two"]